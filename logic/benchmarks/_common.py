@@ -0,0 +1,73 @@
+"""Helpers shared by the benchmarks.
+
+The benchmarks import this module as ``_common``, which works since running a
+benchmark as a script puts its directory at the front of the module search
+path.
+"""
+
+import random
+from time import perf_counter
+from typing import Callable, Tuple
+
+from logic.propositions.syntax import Formula
+
+#: The ratio of clauses to variable names of the formulas built by
+#: `random_formula`.
+CLAUSES_PER_VARIABLE = 1.5
+
+#: The distance between the indices of the variable names of each clause built
+#: by `random_formula`, so that the formulas have the local structure of, for
+#: example, networks.
+NEIGHBORHOOD = 4
+
+
+def measure(function: Callable[[], object]) -> float:
+    """Measures the time it takes to call the given function.
+
+    Parameters:
+        function: function to call.
+
+    Returns:
+        The number of seconds the call took.
+    """
+    return timed(function)[0]
+
+
+def timed(function: Callable[[], object]) -> Tuple[float, object]:
+    """Measures the time it takes to call the given function, keeping the value
+    it returns.
+
+    Parameters:
+        function: function to call.
+
+    Returns:
+        The number of seconds the call took, and the value it returned.
+    """
+    start = perf_counter()
+    value = function()
+    return perf_counter() - start, value
+
+
+def random_formula(n: int) -> Formula:
+    """Builds a random conjunction of clauses of three nearby literals.
+
+    Parameters:
+        n: number of variable names.
+
+    Returns:
+        A conjunction of `CLAUSES_PER_VARIABLE` times as many random clauses as
+        variable names, each of three literals over variable names whose
+        indices are at most `NEIGHBORHOOD` apart.
+    """
+    rng = random.Random(n)
+    clauses = []
+    for _ in range(int(CLAUSES_PER_VARIABLE * n)):
+        start = rng.randrange(n - NEIGHBORHOOD)
+        literals = []
+        for i in rng.sample(range(start, start + NEIGHBORHOOD + 1), 3):
+            literal = Formula("x" + str(i))
+            if rng.random() < 0.5:
+                literal = Formula("~", literal)
+            literals.append(literal)
+        clauses.append(Formula.combine("|", literals))
+    return Formula.combine("&", clauses)
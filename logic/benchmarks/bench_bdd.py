@@ -0,0 +1,64 @@
+"""Benchmark of checking tautologies with the truth-table sweep and with binary
+decision diagrams.
+
+Run from the package root with ``python benchmarks/bench_bdd.py``.
+"""
+
+from functools import partial
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import is_tautology
+from logic.propositions.bdd import BDDManager
+
+from _common import measure, timed
+
+#: Numbers of variable names of the benchmarked formulas.
+VARIABLES = (16, 20, 24, 28, 100, 300, 1000)
+
+#: The largest number of variable names of the formulas to check by the
+#: truth-table sweep, which takes time exponential in the number of them.
+TRUTH_TABLE_VARIABLES = 28
+
+
+def parity_identity(n: int) -> Formula:
+    """Builds a tautology that states that the parity of the given number of
+    variable names does not depend on the order in which they are added.
+
+    Parameters:
+        n: number of variable names.
+
+    Returns:
+        The equivalence of the parity of ``x0`` to ``x{n-1}`` with their
+        parity in reverse order.
+    """
+    names = [Formula("x" + str(i)) for i in range(n)]
+    return Formula(
+        "<->",
+        Formula.combine("+", names),
+        Formula.combine("+", reversed(names)),
+    )
+
+
+def main() -> None:
+    print("| variables | truth table (s) | bdd (s) | manager nodes |")
+    print("|-----------|-----------------|---------|---------------|")
+    for n in VARIABLES:
+        formula = parity_identity(n)
+        if n <= TRUTH_TABLE_VARIABLES:
+            truth_table_time = "{:.3f}".format(
+                measure(partial(is_tautology, formula))
+            )
+        else:
+            truth_table_time = "-"
+        manager = BDDManager()
+        bdd_time, diagram = timed(partial(manager.from_formula, formula))
+        assert diagram.is_tautology()
+        print(
+            "| {} | {} | {:.3f} | {} |".format(
+                n, truth_table_time, bdd_time, len(manager)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
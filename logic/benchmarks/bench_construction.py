@@ -0,0 +1,154 @@
+"""Benchmark of the construction rate and memory footprint of immutable
+objects, comparing the slot-based `frozen` decorator with the earlier one that
+tracked objects under construction in a shared set of ids.
+
+Run from the package root with ``python benchmarks/bench_construction.py``.
+"""
+
+import tracemalloc
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Optional, Set, Type, TypeVar
+
+from logic.utils.logic_utils import frozen
+from logic.propositions.syntax import Formula
+from logic.propositions.proofs import InferenceRule
+
+T = TypeVar("T")
+
+#: Number of objects constructed per measurement.
+COUNT = 200000
+
+
+def legacy_frozen(cls: Type[T]) -> Type[T]:
+    """The earlier implementation of `frozen`, which adds the id of every
+    object under construction to a shared set and checks that set upon every
+    assignment.
+
+    Parameters:
+        cls: class to modify.
+
+    Returns:
+        The given class, modified so that assignment to instance variable is
+        disallowed after construction.
+    """
+    original_init = cls.__init__
+    original_setattr = cls.__setattr__
+    mutable_ids: Set[int] = set()
+
+    @wraps(cls.__setattr__)
+    def setattr_wrapper(self, name, value):
+        if id(self) in mutable_ids:
+            original_setattr(self, name, value)
+        else:
+            raise Exception("Cannot assign to field '" + name + "'")
+
+    @wraps(cls.__init__)
+    def init_wrapper(self, *args, **kwargs):
+        mutable_ids.add(id(self))
+        original_init(self, *args, **kwargs)
+        mutable_ids.remove(id(self))
+
+    cls.__setattr__ = setattr_wrapper
+    cls.__init__ = init_wrapper
+    return cls
+
+
+@legacy_frozen
+class LegacyNode:
+    """A formula-like node made immutable by `legacy_frozen`."""
+
+    def __init__(
+        self,
+        root: str,
+        first: Optional["LegacyNode"] = None,
+        second: Optional["LegacyNode"] = None,
+    ):
+        self.root = root
+        self.first = first
+        self.second = second
+
+
+@frozen
+class SlottedNode:
+    """A formula-like node made immutable by `frozen` and ``__slots__``."""
+
+    __slots__ = ("root", "first", "second")
+
+    def __init__(
+        self,
+        root: str,
+        first: Optional["SlottedNode"] = None,
+        second: Optional["SlottedNode"] = None,
+    ):
+        object.__setattr__(self, "root", root)
+        object.__setattr__(self, "first", first)
+        object.__setattr__(self, "second", second)
+
+
+def chain(node: Callable[..., object]) -> object:
+    """Builds a left-deep chain of `COUNT` distinct nodes.
+
+    Parameters:
+        node: constructor of the nodes.
+
+    Returns:
+        The root of the chain.
+    """
+    current = node("p")
+    for i in range(1, COUNT):
+        current = node("&", current, node("x" + str(i)))
+    return current
+
+
+def rules() -> object:
+    """Builds `COUNT` inference rules.
+
+    Returns:
+        The built inference rules.
+    """
+    formulas = [Formula("x" + str(i)) for i in range(100)]
+    return [
+        InferenceRule(formulas[i % 100 : i % 100 + 1], formulas[i % 7])
+        for i in range(COUNT)
+    ]
+
+
+def measure(build: Callable[[], object], objects: int) -> str:
+    """Measures the construction rate and memory footprint of the objects
+    constructed by the given function.
+
+    Parameters:
+        build: function that constructs and returns the objects.
+        objects: number of objects that the given function constructs.
+
+    Returns:
+        A table row with the number of objects constructed per second and the
+        number of bytes allocated per object.
+    """
+    start = perf_counter()
+    result = build()
+    seconds = perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return "{:,.0f} | {:.0f}".format(objects / seconds, allocated / objects)
+
+
+def main() -> None:
+    print("| objects | constructed per second | bytes per object |")
+    print("|---------|------------------------|------------------|")
+    for name, build, objects in [
+        ("legacy frozen node", lambda: chain(LegacyNode), 2 * COUNT),
+        ("slotted frozen node", lambda: chain(SlottedNode), 2 * COUNT),
+        ("Formula", lambda: chain(Formula), 2 * COUNT),
+        ("InferenceRule", rules, COUNT),
+    ]:
+        print("|", name, "|", measure(build, objects), "|")
+
+
+if __name__ == "__main__":
+    main()
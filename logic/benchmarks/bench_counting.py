@@ -0,0 +1,44 @@
+"""Benchmark of counting the models of random formulas with each counter.
+
+Run from the package root with ``python benchmarks/bench_counting.py``.
+"""
+
+from functools import partial
+
+from logic.propositions.counting import count_models
+
+from _common import measure, random_formula, timed
+
+#: Numbers of variable names of the benchmarked formulas.
+VARIABLES = (16, 20, 24, 40, 60, 80)
+
+#: The largest number of variable names of the formulas to count the models
+#: of by truth tables, which takes time exponential in the number of them.
+TRUTH_TABLE_VARIABLES = 24
+
+
+def main() -> None:
+    print("| variables | models | truth table (s) | dpll (s) | bdd (s) |")
+    print("|-----------|--------|-----------------|----------|---------|")
+    for n in VARIABLES:
+        formula = random_formula(n)
+        if n <= TRUTH_TABLE_VARIABLES:
+            truth_table_time = "{:.3f}".format(
+                measure(partial(count_models, formula, method="truth_table"))
+            )
+        else:
+            truth_table_time = "-"
+        dpll_time, models = timed(partial(count_models, formula, method="dpll"))
+        bdd_time, bdd_models = timed(
+            partial(count_models, formula, method="bdd")
+        )
+        assert bdd_models == models
+        print(
+            "| {} | {} | {} | {:.3f} | {:.3f} |".format(
+                n, models, truth_table_time, dpll_time, bdd_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark of answering repeated conditioned counting queries on a compiled
+decision-DNNF circuit and by counting from scratch.
+
+Run from the package root with ``python benchmarks/bench_ddnnf.py``.
+"""
+
+import random
+from functools import partial
+from typing import Dict, List
+
+from logic.propositions.syntax import Formula
+from logic.propositions.counting import count_models
+from logic.propositions.ddnnf import compile_ddnnf
+
+from _common import random_formula, timed
+
+#: Numbers of variable names of the benchmarked formulas.
+VARIABLES = (20, 40, 60, 80)
+
+#: The number of queries per formula, each conditioned on a random partial
+#: model.
+QUERIES = 200
+
+#: The number of variable names that each query conditions on.
+CONDITIONED_VARIABLES = 3
+
+
+def random_conditions(formula: Formula) -> List[Dict[str, bool]]:
+    """Builds random partial models to condition the given formula on.
+
+    Parameters:
+        formula: formula to condition.
+
+    Returns:
+        `QUERIES` random partial models, each over `CONDITIONED_VARIABLES`
+        variable names of the given formula.
+    """
+    rng = random.Random(0)
+    variables = sorted(formula.variables())
+    return [
+        {
+            variable: rng.random() < 0.5
+            for variable in rng.sample(variables, CONDITIONED_VARIABLES)
+        }
+        for _ in range(QUERIES)
+    ]
+
+
+def conditioned(formula: Formula, condition: Dict[str, bool]) -> Formula:
+    """Conjoins the given formula with the literals of the given partial model.
+
+    Parameters:
+        formula: formula to condition.
+        condition: partial model to condition on.
+
+    Returns:
+        The conjunction of the given formula with the literals that are true
+        in the given partial model.
+    """
+    for variable, value in condition.items():
+        literal = Formula(variable)
+        if not value:
+            literal = Formula("~", literal)
+        formula = Formula("&", formula, literal)
+    return formula
+
+
+def main() -> None:
+    print(
+        "| variables | nodes | compile (s) | {} queries on circuit (s) "
+        "| {} queries by dpll (s) |".format(QUERIES, QUERIES)
+    )
+    print(
+        "|-----------|-------|-------------|------------------------"
+        "----|-------------------------|"
+    )
+    for n in VARIABLES:
+        formula = random_formula(n)
+        conditions = random_conditions(formula)
+        compile_time, circuit = timed(partial(compile_ddnnf, formula))
+        circuit_time, circuit_counts = timed(
+            lambda circuit=circuit, conditions=conditions: [
+                circuit.count_models(c) for c in conditions
+            ]
+        )
+        dpll_time, dpll_counts = timed(
+            lambda formula=formula, conditions=conditions: [
+                count_models(conditioned(formula, c), method="dpll")
+                for c in conditions
+            ]
+        )
+        assert circuit_counts == dpll_counts
+        print(
+            "| {} | {} | {:.3f} | {:.3f} | {:.3f} |".format(
+                n, len(circuit), compile_time, circuit_time, dpll_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark of writing and reading 3-coloring formulas in the DIMACS CNF
+format.
+
+Run from the package root with ``python benchmarks/bench_dimacs.py``.
+"""
+
+import os
+import tempfile
+from functools import partial
+
+from logic.propositions.cnf import tseitin
+from logic.propositions.dimacs import read_dimacs, write_dimacs
+from logic.propositions.reductions import graph3coloring_to_formula
+
+from _common import measure
+
+#: Numbers of vertices of the cycles whose 3-coloring formulas are written.
+VERTICES = (1000, 10000, 100000)
+
+
+def main() -> None:
+    print(
+        "| vertices | clauses | tseitin (s) | write_dimacs (s) |"
+        " read_dimacs (s) | file size (MB) |"
+    )
+    print(
+        "|----------|---------|-------------|------------------|"
+        "-----------------|----------------|"
+    )
+    path = os.path.join(tempfile.mkdtemp(), "coloring.cnf")
+    for n_vertices in VERTICES:
+        edges = frozenset(
+            (i, i % n_vertices + 1) for i in range(1, n_vertices + 1)
+        )
+        formula = graph3coloring_to_formula((n_vertices, edges))
+        database = tseitin(formula)
+        print(
+            "| {} | {} | {:.3f} | {:.3f} | {:.3f} | {:.1f} |".format(
+                n_vertices,
+                len(database),
+                measure(partial(tseitin, formula)),
+                measure(partial(write_dimacs, path, database)),
+                measure(partial(read_dimacs, path)),
+                os.path.getsize(path) / 2**20,
+            )
+        )
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    main()
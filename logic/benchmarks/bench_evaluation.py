@@ -0,0 +1,98 @@
+"""Benchmark of the throughput of evaluating a formula over all models of its
+variable names.
+
+Run from the package root with ``python benchmarks/bench_evaluation.py``.
+"""
+
+import random
+from functools import partial
+from typing import Callable, Sequence
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import (
+    all_models,
+    compile_formula,
+    evaluate,
+    truth_values,
+)
+
+from _common import measure
+
+#: Numbers of variable names of the benchmarked formulas.
+VARIABLES = (8, 12, 16)
+
+#: Number of binary operators in each benchmarked formula.
+OPERATORS = 200
+
+
+def random_formula(variables: Sequence[str]) -> Formula:
+    """Builds a random formula over the given variable names.
+
+    Parameters:
+        variables: variable names to use.
+
+    Returns:
+        A formula with `OPERATORS` binary operators.
+    """
+    rng = random.Random(len(variables))
+    formulas = [Formula(variable) for variable in variables]
+    for _ in range(OPERATORS):
+        first, second = rng.sample(formulas, 2)
+        operator = rng.choice(("&", "|", "->", "+", "<->", "-&", "-|"))
+        formulas.append(Formula(operator, first, Formula("~", second)))
+    return formulas[-1]
+
+
+def throughput(sweep: Callable[[], object], models: int) -> str:
+    """Measures the number of models evaluated per second by the given sweep.
+
+    Parameters:
+        sweep: function that evaluates a formula over all of its models.
+        models: number of models that the given function evaluates.
+
+    Returns:
+        The formatted number of models evaluated per second.
+    """
+    return "{:,.0f}".format(models / measure(sweep))
+
+
+def main() -> None:
+    print(
+        "| variables | evaluate, dicts | truth_values, bit models |"
+        " compiled, tuples | compiled, ints |"
+    )
+    print(
+        "|-----------|-----------------|--------------------------|"
+        "------------------|----------------|"
+    )
+    for n_variables in VARIABLES:
+        variables = ["x" + str(i) for i in range(n_variables)]
+        formula = random_formula(variables)
+        models = list(all_models(variables))
+        dicts = [dict(model) for model in models]
+        tuples = [tuple(model.values()) for model in models]
+        function = compile_formula(formula, variables)
+        print(
+            "| {} | {} | {} | {} | {} |".format(
+                n_variables,
+                throughput(
+                    lambda formula=formula, dicts=dicts: [
+                        evaluate(formula, model) for model in dicts
+                    ],
+                    len(models),
+                ),
+                throughput(
+                    partial(list, truth_values(formula, all_models(variables))),
+                    len(models),
+                ),
+                throughput(partial(list, map(function, tuples)), len(models)),
+                throughput(
+                    partial(list, map(function, range(len(models)))),
+                    len(models),
+                ),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark of sweeping all models of formulas with local structure, in
+Gray-code order with incremental re-evaluation, and in the order of
+`all_models` with full evaluation of each model.
+
+Run from the package root with ``python benchmarks/bench_gray_code.py``.
+"""
+
+import random
+from functools import partial
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import (
+    compile_formula,
+    evaluate,
+    gray_code_truth_values,
+)
+
+from _common import measure
+
+#: Number of variable names of the benchmarked formulas.
+N_VARIABLES = 14
+
+#: Depths of the blocks of the benchmarked formulas.
+DEPTHS = (50, 500, 2000)
+
+
+def local_blocks(depth: int) -> Formula:
+    """Builds a random formula with local structure: a balanced combination of
+    one block per variable name, each a chain of the given depth over that
+    variable name and the next one.
+
+    Parameters:
+        depth: depth of the block of each variable name.
+
+    Returns:
+        The built formula.
+    """
+    rng = random.Random(depth)
+    blocks = []
+    for index in range(N_VARIABLES):
+        variables = ("x" + str(index), "x" + str((index + 1) % N_VARIABLES))
+        block = Formula(variables[0])
+        for _ in range(depth):
+            operator = rng.choice(("&", "|", "->", "+", "<->"))
+            operand = Formula(rng.choice(variables))
+            if rng.random() < 0.5:
+                block = Formula(operator, block, operand)
+            else:
+                block = Formula(operator, operand, block)
+        blocks.append(block)
+    return Formula.combine("+", blocks)
+
+
+def main() -> None:
+    variables = ["x" + str(i) for i in range(N_VARIABLES)]
+    models = 2**N_VARIABLES
+    print("| block depth | evaluate (s) | compiled (s) | Gray code (s) |")
+    print("|-------------|--------------|--------------|---------------|")
+    for depth in DEPTHS:
+        formula = local_blocks(depth)
+        function = compile_formula(formula, variables)
+        # Plain evaluation is too slow to sweep all models of large formulas,
+        # so it is timed over a sample and extrapolated.
+        sample = [
+            dict(zip(variables, [m >> i & 1 == 1 for i in range(N_VARIABLES)]))
+            for m in range(0, models, models // 64)
+        ]
+        print(
+            "| {} | {:.3f} | {:.3f} | {:.3f} |".format(
+                depth,
+                measure(
+                    lambda formula=formula, sample=sample: [
+                        evaluate(formula, m) for m in sample
+                    ]
+                )
+                * models
+                / len(sample),
+                measure(partial(list, map(function, range(models)))),
+                measure(
+                    partial(list, gray_code_truth_values(formula, variables))
+                ),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark of checking formulas in worker processes.
+
+Run from the package root with ``python benchmarks/bench_parallel.py``.
+"""
+
+import os
+import random
+from functools import partial
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import is_tautology
+
+from _common import measure
+
+#: Numbers of variable names of the checked tautologies.
+VARIABLES = (22, 24, 26)
+
+#: Number of binary operators in each benchmarked formula.
+OPERATORS = 200
+
+#: Numbers of worker processes to check with.
+WORKERS = (1, 2, 4, os.cpu_count() or 1)
+
+
+def random_tautology(n_variables: int) -> Formula:
+    """Builds the law of excluded middle for a random formula over the given
+    number of variable names.
+
+    Parameters:
+        n_variables: number of variable names.
+
+    Returns:
+        A tautology of the form ``(f|~f)``, where ``f`` is the exclusive or of
+        the variable names and of `OPERATORS` random formulas over them.
+    """
+    rng = random.Random(n_variables)
+    formulas = [Formula("x" + str(i)) for i in range(n_variables)]
+    for _ in range(OPERATORS):
+        first, second = rng.sample(formulas, 2)
+        operator = rng.choice(("&", "|", "->", "+", "<->", "-&", "-|"))
+        formulas.append(Formula(operator, first, Formula("~", second)))
+    formula = Formula.combine("+", formulas)
+    return Formula("|", formula, Formula("~", formula))
+
+
+def main() -> None:
+    workers = sorted(set(WORKERS))
+    print(
+        "| variables | "
+        + " | ".join("is_tautology, {} (s)".format(n) for n in workers)
+        + " | is_tautology of f, {} (s) |".format(workers[-1])
+    )
+    print(
+        "|-----------|"
+        + "|".join("-" * (len(str(n)) + 21) for n in workers)
+        + "|"
+        + "-" * (len(str(workers[-1])) + 27)
+        + "|"
+    )
+    for n_variables in VARIABLES:
+        formula = random_tautology(n_variables)
+        times = [
+            measure(partial(is_tautology, formula, workers=n)) for n in workers
+        ]
+        times.append(
+            measure(partial(is_tautology, formula.first, workers=workers[-1]))
+        )
+        print(
+            "| {} | ".format(n_variables)
+            + " | ".join("{:.3f}".format(time) for time in times)
+            + " |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark of parsing large formulas in standard and polish notation.
+
+Run from the package root with ``python benchmarks/bench_parsing.py``.
+"""
+
+import random
+from functools import partial
+from typing import Callable, List, Tuple
+
+from logic.propositions.syntax import Formula
+
+from _common import measure
+
+#: Approximate lengths, in characters, of the benchmarked formula strings.
+SIZES = (10**5, 3 * 10**5, 10**6)
+
+
+def left_deep_chain(size: int) -> Tuple[str, str]:
+    """Builds a left-deep conjunction of distinct variables of roughly the
+    given length, such as the ones built by the reductions in this package.
+
+    Parameters:
+        size: approximate length of the string to build.
+
+    Returns:
+        The standard string representation and the polish notation
+        representation of the conjunction.
+    """
+    variables = ["x1"]
+    length = 2
+    while length < size:
+        variables.append("x" + str(len(variables) + 1))
+        length += len(variables[-1]) + 3
+    infix = "(" * (len(variables) - 1) + variables[0]
+    infix += "".join("&" + variable + ")" for variable in variables[1:])
+    polish = "&" * (len(variables) - 1) + "".join(variables)
+    return infix, polish
+
+
+def negation_chain(size: int) -> Tuple[str, str]:
+    """Builds a chain of negations of roughly the given length.
+
+    Parameters:
+        size: approximate length of the string to build.
+
+    Returns:
+        The standard string representation and the polish notation
+        representation of the chain.
+    """
+    string = "~" * (size - 1) + "p"
+    return string, string
+
+
+def random_balanced(size: int) -> Tuple[str, str]:
+    """Builds a random formula of roughly the given length whose tree is
+    balanced.
+
+    Parameters:
+        size: approximate length of the string to build.
+
+    Returns:
+        The standard string representation and the polish notation
+        representation of the formula.
+    """
+    rng = random.Random(size)
+    layer = [("x" + str(rng.randrange(1000)),) * 2 for _ in range(size // 8)]
+    while len(layer) > 1:
+        next_layer = []
+        for i in range(0, len(layer), 2):
+            if i + 1 < len(layer):
+                operator = rng.choice(("&", "|", "->", "+", "<->"))
+                (first_infix, first_polish), (second_infix, second_polish) = (
+                    layer[i],
+                    layer[i + 1],
+                )
+                next_layer.append(
+                    (
+                        "(" + first_infix + operator + second_infix + ")",
+                        operator + first_polish + second_polish,
+                    )
+                )
+            else:
+                next_layer.append(("~" + layer[i][0], "~" + layer[i][1]))
+        layer = next_layer
+    return layer[0]
+
+
+def main() -> None:
+    shapes: List[Tuple[str, Callable[[int], Tuple[str, str]]]] = [
+        ("left-deep chain", left_deep_chain),
+        ("negation chain", negation_chain),
+        ("random balanced", random_balanced),
+    ]
+    print("| shape | characters | parse (s) | parse_polish (s) |")
+    print("|-------|------------|-----------|------------------|")
+    for name, builder in shapes:
+        for size in SIZES:
+            infix, polish = builder(size)
+            print(
+                "| {} | {} | {:.3f} | {:.3f} |".format(
+                    name,
+                    len(infix),
+                    measure(partial(Formula.parse, infix)),
+                    measure(partial(Formula.parse_polish, polish)),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
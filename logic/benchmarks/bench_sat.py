@@ -0,0 +1,71 @@
+"""Benchmark of 3-coloring random graphs with the truth-table sweep and with the
+conflict-driven clause-learning solver.
+
+Run from the package root with ``python benchmarks/bench_sat.py``.
+"""
+
+import random
+from functools import partial
+
+from logic.propositions.reductions import Graph, tricolor_graph
+
+from _common import measure, timed
+
+#: Numbers of vertices of the benchmarked graphs.
+VERTICES = (6, 8, 50, 100, 200, 400)
+
+#: The ratio of edges to vertices of the benchmarked graphs, close to the
+#: threshold of 3-colorability of random graphs, where they are the hardest.
+EDGES_PER_VERTEX = 2.2
+
+#: The largest number of vertices of the graphs to 3-color by the truth-table
+#: sweep, which takes time exponential in the number of vertices.
+TRUTH_TABLE_VERTICES = 8
+
+
+def random_graph(n_vertices: int) -> Graph:
+    """Builds a random graph with the given number of vertices.
+
+    Parameters:
+        n_vertices: number of vertices.
+
+    Returns:
+        A graph with `EDGES_PER_VERTEX` times as many random edges as vertices.
+    """
+    rng = random.Random(n_vertices)
+    edges = set()
+    while len(edges) < min(
+        int(EDGES_PER_VERTEX * n_vertices), n_vertices * (n_vertices - 1) // 2
+    ):
+        first, second = sorted(rng.sample(range(1, n_vertices + 1), 2))
+        edges.add((first, second))
+    return n_vertices, frozenset(edges)
+
+
+def main() -> None:
+    print("| vertices | edges | 3-colorable | truth table (s) | cdcl (s) |")
+    print("|----------|-------|-------------|-----------------|----------|")
+    for n_vertices in VERTICES:
+        graph = random_graph(n_vertices)
+        if n_vertices <= TRUTH_TABLE_VERTICES:
+            truth_table_time = "{:.3f}".format(
+                measure(partial(tricolor_graph, graph))
+            )
+        else:
+            truth_table_time = "-"
+        cdcl_time, coloring = timed(
+            partial(tricolor_graph, graph, method="cdcl")
+        )
+        print(
+            "| {} | {} | {} | {} | {:.3f} |".format(
+                n_vertices,
+                len(graph[1]),
+                coloring is not None,
+                truth_table_time,
+                cdcl_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark of constructing and checking formulas over many variable names.
+
+Run from the package root with ``python benchmarks/bench_symbols.py``.
+"""
+
+from functools import partial
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import is_satisfiable, is_tautology
+from logic.propositions.reductions import graph3coloring_to_formula
+
+from _common import measure
+
+#: Numbers of vertices of the cycles whose 3-coloring problems are reduced.
+VERTICES = (1000, 10000, 30000)
+
+#: Numbers of variable names of the checked tautologies.
+VARIABLES = (10, 14, 16)
+
+
+def excluded_middles(n_variables: int) -> Formula:
+    """Builds the conjunction of the law of excluded middle over the given
+    number of variable names.
+
+    Parameters:
+        n_variables: number of variable names.
+
+    Returns:
+        The built tautology.
+    """
+    return Formula.combine(
+        "&",
+        [Formula.parse("(x{0}|~x{0})".format(i)) for i in range(n_variables)],
+    )
+
+
+def main() -> None:
+    print("| vertices | graph3coloring_to_formula (s) |")
+    print("|----------|-------------------------------|")
+    for n_vertices in VERTICES:
+        edges = frozenset(
+            (i, i % n_vertices + 1) for i in range(1, n_vertices + 1)
+        )
+        print(
+            "| {} | {:.3f} |".format(
+                n_vertices,
+                measure(
+                    partial(graph3coloring_to_formula, (n_vertices, edges))
+                ),
+            )
+        )
+    print()
+    print("| variables | is_tautology (s) | is_satisfiable of ~ (s) |")
+    print("|-----------|------------------|-------------------------|")
+    for n_variables in VARIABLES:
+        formula = excluded_middles(n_variables)
+        print(
+            "| {} | {:.3f} | {:.3f} |".format(
+                n_variables,
+                measure(partial(is_tautology, formula)),
+                measure(partial(is_satisfiable, Formula("~", formula))),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
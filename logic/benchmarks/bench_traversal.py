@@ -0,0 +1,69 @@
+"""Benchmark of the operations on formulas as their nesting depth grows.
+
+Run from the package root with ``python benchmarks/bench_traversal.py``.
+"""
+
+from functools import partial
+from typing import Callable, Dict
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import evaluate
+
+from _common import measure
+
+#: Nesting depths of the benchmarked formulas.
+DEPTHS = (10**3, 10**4, 10**5, 10**6)
+
+
+def left_deep_chain(depth: int) -> Formula:
+    """Builds a left-deep chain of implications of the given depth, over ten
+    variable names.
+
+    Parameters:
+        depth: nesting depth of the formula to build.
+
+    Returns:
+        The built formula.
+    """
+    formula = Formula("x0")
+    for i in range(1, depth):
+        formula = Formula(
+            "->", formula, Formula("~", Formula("x" + str(i % 10)))
+        )
+    return formula
+
+
+def main() -> None:
+    model: Dict[str, bool] = {"x" + str(i): i % 2 == 0 for i in range(10)}
+    substitution = {"x0": Formula.parse("(p&q)")}
+    schemas = {"->": Formula.parse("(~p|q)")}
+    operations: Dict[str, Callable[[Formula], object]] = {
+        "str": str,
+        "variables": lambda formula: formula.variables(),
+        "polish": lambda formula: formula.polish(),
+        "substitute_variables": lambda formula: formula.substitute_variables(
+            substitution
+        ),
+        "substitute_operators": lambda formula: formula.substitute_operators(
+            schemas
+        ),
+        "evaluate": lambda formula: evaluate(formula, model),
+    }
+    names = list(operations)
+    print("| depth | " + " | ".join(name + " (s)" for name in names) + " |")
+    print("|-------|" + "|".join("-" * (len(name) + 6) for name in names) + "|")
+    for depth in DEPTHS:
+        times = []
+        for operation in operations.values():
+            # Each operation is timed on a freshly built formula, so that no
+            # operation benefits from results memoized by another.
+            times.append(measure(partial(operation, left_deep_chain(depth))))
+        print(
+            "| {} | ".format(depth)
+            + " | ".join("{:.3f}".format(time) for time in times)
+            + " |"
+        )
+
+
+if __name__ == "__main__":
+    main()
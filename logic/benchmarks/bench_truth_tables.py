@@ -0,0 +1,51 @@
+"""Benchmark of checking tautologies over growing numbers of variable names.
+
+Run from the package root with ``python benchmarks/bench_truth_tables.py``.
+"""
+
+from functools import partial
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import (
+    is_contradiction,
+    is_satisfiable,
+    is_tautology,
+)
+
+from _common import measure
+
+#: Numbers of variable names of the checked formulas.
+VARIABLES = (12, 16, 20, 22, 24)
+
+
+def main() -> None:
+    print(
+        "| variables | is_tautology (s) | is_contradiction (s) |"
+        " is_satisfiable (s) |"
+    )
+    print(
+        "|-----------|------------------|----------------------|"
+        "--------------------|"
+    )
+    for n_variables in VARIABLES:
+        variables = ["x" + str(i) for i in range(n_variables)]
+        # A tautology, for which no check can stop early.
+        formula = Formula.combine(
+            "&",
+            [
+                Formula("->", Formula(variable), Formula(variable))
+                for variable in variables
+            ],
+        )
+        print(
+            "| {} | {:.3f} | {:.3f} | {:.3f} |".format(
+                n_variables,
+                measure(partial(is_tautology, formula)),
+                measure(partial(is_contradiction, formula)),
+                measure(partial(is_satisfiable, Formula("~", formula))),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""Compact array-backed representation of propositional formulas."""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, FrozenSet, List, Mapping, Sequence, Tuple
+
+from logic.utils.logic_utils import frozen
+from logic.propositions.syntax import Formula
+from logic.propositions.symbols import F, OPERATIONS, OPERATORS, T, VARIABLE
+
+
+@frozen
+class FormulaArena:
+    """An immutable propositional formula in the representation of a directed
+    acyclic graph stored in parallel typed arrays, with one entry per distinct
+    subformula.
+
+    Subformulas are stored in post-order, so that the operands of every node
+    precede it, and the last node is the root of the formula.
+
+    Attributes:
+        opcodes (`~array.array`): the opcode of each node, an index into
+            `~logic.propositions.symbols.OPERATORS`.
+        firsts (`~array.array`): the index of the first operand of each node,
+            or ``-1`` if its root is not an operator.
+        seconds (`~array.array`): the index of the second operand of each node,
+            or ``-1`` if its root is not a binary operator.
+        variable_ids (`~array.array`): the index in `variable_names` of each
+            node that is a variable name, or ``-1`` for any other node.
+        variable_names (`~typing.Tuple`\\[`str`, ...]): the variable names of
+            the formula, in order of first appearance.
+    """
+
+    __slots__ = (
+        "opcodes",
+        "firsts",
+        "seconds",
+        "variable_ids",
+        "variable_names",
+    )
+
+    opcodes: array
+    firsts: array
+    seconds: array
+    variable_ids: array
+    variable_names: Tuple[str, ...]
+
+    def __init__(
+        self,
+        opcodes: Sequence[int],
+        firsts: Sequence[int],
+        seconds: Sequence[int],
+        variable_ids: Sequence[int],
+        variable_names: Sequence[str],
+    ):
+        """Initializes a `FormulaArena` from its parallel arrays.
+
+        Parameters:
+            opcodes: the opcode of each node.
+            firsts: the index of the first operand of each node, or ``-1``.
+            seconds: the index of the second operand of each node, or ``-1``.
+            variable_ids: the variable-name index of each node, or ``-1``.
+            variable_names: the variable names of the formula.
+        """
+        assert len(opcodes) > 0
+        assert len(opcodes) == len(firsts) == len(seconds) == len(variable_ids)
+        object.__setattr__(self, "opcodes", array("B", opcodes))
+        object.__setattr__(self, "firsts", array("q", firsts))
+        object.__setattr__(self, "seconds", array("q", seconds))
+        object.__setattr__(self, "variable_ids", array("q", variable_ids))
+        object.__setattr__(self, "variable_names", tuple(variable_names))
+
+    @staticmethod
+    def from_formula(formula: Formula) -> FormulaArena:
+        """Converts the given formula into an arena, sharing each distinct
+        subformula.
+
+        Parameters:
+            formula: formula to convert.
+
+        Returns:
+            An arena representing the given formula.
+        """
+        indices: Dict[Formula, int] = {}
+        variable_ids: Dict[str, int] = {}
+        opcodes: List[int] = []
+        firsts: List[int] = []
+        seconds: List[int] = []
+        variables: List[int] = []
+        for node in formula.postorder():
+            indices[node] = len(opcodes)
+            opcodes.append(node.opcode)
+            if node.opcode == VARIABLE:
+                variables.append(
+                    variable_ids.setdefault(node.root, len(variable_ids))
+                )
+            else:
+                variables.append(-1)
+            firsts.append(-1 if node.first is None else indices[node.first])
+            seconds.append(-1 if node.second is None else indices[node.second])
+        return FormulaArena(opcodes, firsts, seconds, variables, variable_ids)
+
+    def to_formula(self) -> Formula:
+        """Converts the current arena back into a formula.
+
+        Returns:
+            The formula represented by the current arena.
+        """
+        formulas: List[Formula] = []
+        for opcode, first, second, variable_id in zip(
+            self.opcodes, self.firsts, self.seconds, self.variable_ids
+        ):
+            if opcode == VARIABLE:
+                formulas.append(Formula(self.variable_names[variable_id]))
+            elif first < 0:
+                formulas.append(Formula(OPERATORS[opcode]))
+            elif second < 0:
+                formulas.append(Formula(OPERATORS[opcode], formulas[first]))
+            else:
+                formulas.append(
+                    Formula(
+                        OPERATORS[opcode], formulas[first], formulas[second]
+                    )
+                )
+        return formulas[-1]
+
+    def __len__(self) -> int:
+        """Counts the nodes of the current arena.
+
+        Returns:
+            The number of distinct subformulas of the represented formula.
+        """
+        return len(self.opcodes)
+
+    def __repr__(self) -> str:
+        """Computes the string representation of the represented formula.
+
+        Returns:
+            The standard string representation of the represented formula.
+        """
+        parts: List[str] = []
+        # Each entry is either a node index to print, or a literal string.
+        stack: List[object] = [len(self.opcodes) - 1]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+                continue
+            opcode = self.opcodes[item]
+            if opcode == VARIABLE:
+                parts.append(self.variable_names[self.variable_ids[item]])
+            elif self.firsts[item] < 0:
+                parts.append(OPERATORS[opcode])
+            elif self.seconds[item] < 0:
+                parts.append(OPERATORS[opcode])
+                stack.append(self.firsts[item])
+            else:
+                parts.append("(")
+                stack.extend((")", self.seconds[item], OPERATORS[opcode]))
+                stack.append(self.firsts[item])
+        return "".join(parts)
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the current arena with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is a `FormulaArena` object with the same
+            arrays and variable names as the current arena, `False` otherwise.
+        """
+        return (
+            isinstance(other, FormulaArena)
+            and self.opcodes == other.opcodes
+            and self.firsts == other.firsts
+            and self.seconds == other.seconds
+            and self.variable_ids == other.variable_ids
+            and self.variable_names == other.variable_names
+        )
+
+    def __ne__(self, other: object) -> bool:
+        """Compares the current arena with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is not a `FormulaArena` object or does
+            not equal the current arena, `False` otherwise.
+        """
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash((self.opcodes.tobytes(), self.variable_names))
+
+    def variables(self) -> FrozenSet[str]:
+        """Finds all variable names in the represented formula.
+
+        Returns:
+            A set of all variable names used in the represented formula.
+        """
+        return frozenset(self.variable_names)
+
+    def evaluate(self, model: Mapping[str, bool]) -> bool:
+        """Calculates the truth value of the represented formula in the given
+        model.
+
+        Parameters:
+            model: model over (possibly a superset of) the variable names of
+                the represented formula, to calculate the truth value in.
+
+        Returns:
+            The truth value of the represented formula in the given model.
+        """
+        assignment = [model[variable] for variable in self.variable_names]
+        values: List[bool] = []
+        for opcode, first, second, variable_id in zip(
+            self.opcodes, self.firsts, self.seconds, self.variable_ids
+        ):
+            if opcode == VARIABLE:
+                value = assignment[variable_id]
+            elif opcode == T:
+                value = True
+            elif opcode == F:
+                value = False
+            else:
+                value = OPERATIONS[opcode](values[first], values[second], True)
+            values.append(value)
+        return values[-1]
@@ -0,0 +1,703 @@
+"""Reduced ordered binary decision diagrams of propositional formulas."""
+
+from __future__ import annotations
+import sys
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from weakref import finalize
+
+from logic.utils.logic_utils import frozen
+from logic.propositions.syntax import Formula, is_variable
+from logic.propositions.symbols import (
+    AND,
+    F,
+    IFF,
+    IMPLIES,
+    NAND,
+    NOR,
+    NOT,
+    OR,
+    T,
+    VARIABLE,
+    XOR,
+)
+
+#: The number of nodes above which a manager first collects the nodes that no
+#: live `BDD` refers to. After each collection, the threshold is raised to
+#: twice the number of remaining nodes, if that is more.
+GC_THRESHOLD = 1 << 16
+
+#: The edges to the terminal node, which stand for the constant functions.
+_TRUE, _FALSE = 0, 1
+
+#: The level of the terminal node, below the levels of all variables.
+_TERMINAL_LEVEL = sys.maxsize
+
+
+class BDDManager:
+    """A shared store of reduced ordered binary decision diagrams over a common
+    order of variable names.
+
+    Nodes are hash-consed, so that each Boolean function over the variable
+    names of the manager is represented by exactly one edge, and equivalence
+    of functions is equality of edges. An edge is an integer whose bit 0
+    complements the function of the node whose index is in the other bits,
+    and the high (then) edge of each node is never complemented, so the
+    negation of a function takes constant time. All operations reduce to
+    if-then-else, whose results are cached.
+
+    Nodes that no live `BDD` refers to are collected once their number exceeds
+    a threshold, starting at `GC_THRESHOLD`.
+    """
+
+    def __init__(self, variables: Iterable[str] = ()):
+        """Initializes an empty `BDDManager`.
+
+        Parameters:
+            variables: distinct variable names to test first, in order from the
+                root. Other variable names are tested after them, in the order
+                in which they are first used.
+        """
+        self._names: List[str] = []
+        self._levels: Dict[str, int] = {}
+        # Node 0 is the terminal node. A freed node has level -1 until reused.
+        self._node_levels = [_TERMINAL_LEVEL]
+        self._highs = [_TRUE]
+        self._lows = [_TRUE]
+        self._unique: Dict[Tuple[int, int, int], int] = {}
+        self._free: List[int] = []
+        self._cache: Dict[Tuple[int, int, int], int] = {}
+        # The number of live `BDD` handles of each root edge. Equal handles
+        # are counted separately, so that each of them protects its nodes.
+        self._roots: Dict[int, int] = {}
+        self._gc_threshold = GC_THRESHOLD
+        for variable in variables:
+            assert variable not in self._levels
+            self.add_variable(variable)
+
+    def __repr__(self) -> str:
+        """Computes a string representation of the current manager.
+
+        Returns:
+            A string representation of the current manager.
+        """
+        return "BDDManager({} variables, {} nodes)".format(
+            len(self._names), len(self)
+        )
+
+    def __len__(self) -> int:
+        """Counts the nodes of the current manager.
+
+        Returns:
+            The number of nodes of the current manager that are not yet
+            collected, including the terminal node.
+        """
+        return len(self._node_levels) - len(self._free)
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """The variable names of the current manager, in order from the root."""
+        return tuple(self._names)
+
+    def add_variable(self, variable: str) -> None:
+        """Adds the given variable name to the current manager, to be tested
+        after all of its variable names, unless it is already one of them.
+
+        Parameters:
+            variable: variable name to add.
+        """
+        assert is_variable(variable)
+        if variable not in self._levels:
+            self._levels[variable] = len(self._names)
+            self._names.append(variable)
+
+    def variable(self, variable: str) -> BDD:
+        """Builds the diagram of the given variable name.
+
+        Parameters:
+            variable: variable name to build the diagram of, which is added to
+                the current manager if it is not yet one of its variable names.
+
+        Returns:
+            The diagram of the function that is true exactly when the given
+            variable name is.
+        """
+        self.add_variable(variable)
+        return self._wrap(self._make(self._levels[variable], _TRUE, _FALSE))
+
+    @property
+    def true(self) -> BDD:
+        """The diagram of the constant true function."""
+        return self._wrap(_TRUE)
+
+    @property
+    def false(self) -> BDD:
+        """The diagram of the constant false function."""
+        return self._wrap(_FALSE)
+
+    def ite(self, condition: BDD, then: BDD, otherwise: BDD) -> BDD:
+        """Builds the diagram of an if-then-else of the given diagrams.
+
+        Parameters:
+            condition: diagram of the current manager to branch on.
+            then: diagram of the current manager to take where the condition
+                is true.
+            otherwise: diagram of the current manager to take where the
+                condition is false.
+
+        Returns:
+            The diagram of the function that agrees with `then` where
+            `condition` is true and with `otherwise` elsewhere.
+        """
+        assert condition.manager is then.manager is otherwise.manager is self
+        return self._wrap(self._ite(condition.edge, then.edge, otherwise.edge))
+
+    def from_formula(self, formula: Formula) -> BDD:
+        """Builds the diagram of the given formula.
+
+        The variable names of the formula that are not yet variable names of
+        the current manager are added to it in order of first appearance in
+        the formula, which keeps variable names that occur close together in
+        the formula close together in the order.
+
+        Parameters:
+            formula: formula to build the diagram of.
+
+        Returns:
+            The diagram of the function that is true exactly in the models of
+            the given formula.
+
+        Examples:
+            >>> formula = Formula.parse('(p->(q->p))')
+            >>> BDDManager().from_formula(formula).is_tautology()
+            True
+        """
+        levels = self._levels
+        ite = self._ite
+        edges: Dict[int, int] = {}
+        for node in formula.postorder():
+            opcode = node.opcode
+            if opcode == VARIABLE:
+                self.add_variable(node.root)
+                edge = self._make(levels[node.root], _TRUE, _FALSE)
+            elif opcode == T:
+                edge = _TRUE
+            elif opcode == F:
+                edge = _FALSE
+            elif opcode == NOT:
+                edge = edges[id(node.first)] ^ 1
+            else:
+                a = edges[id(node.first)]
+                b = edges[id(node.second)]
+                if opcode == AND:
+                    edge = ite(a, b, _FALSE)
+                elif opcode == OR:
+                    edge = ite(a, _TRUE, b)
+                elif opcode == IMPLIES:
+                    edge = ite(a, b, _TRUE)
+                elif opcode == XOR:
+                    edge = ite(a, b ^ 1, b)
+                elif opcode == IFF:
+                    edge = ite(a, b, b ^ 1)
+                elif opcode == NAND:
+                    edge = ite(a, b, _FALSE) ^ 1
+                else:
+                    assert opcode == NOR
+                    edge = ite(a, _TRUE, b) ^ 1
+            edges[id(node)] = edge
+        return self._wrap(edges[id(formula)])
+
+    def copy(self, diagram: BDD) -> BDD:
+        """Rebuilds the given diagram of any manager in the current manager.
+
+        Copying to a manager with a different order of variable names
+        reorders the diagram, which may change its size exponentially.
+
+        Parameters:
+            diagram: diagram to copy.
+
+        Returns:
+            The diagram of the current manager of the same function as the
+            given diagram.
+        """
+        source = diagram.manager
+        if source is self:
+            return diagram
+        for variable in source._names:
+            self.add_variable(variable)
+        edges = {0: _TRUE}
+        for node in diagram._nodes():
+            if node == 0:
+                continue
+            variable = self._make(
+                self._levels[source._names[source._node_levels[node]]],
+                _TRUE,
+                _FALSE,
+            )
+            high = source._highs[node]
+            low = source._lows[node]
+            edges[node] = self._ite(
+                variable,
+                edges[high >> 1] ^ (high & 1),
+                edges[low >> 1] ^ (low & 1),
+            )
+        return self._wrap(edges[diagram.edge >> 1] ^ (diagram.edge & 1))
+
+    def collect_garbage(self) -> int:
+        """Frees the nodes of the current manager that no live `BDD` refers to,
+        and the cached results that refer to them.
+
+        Returns:
+            The number of freed nodes.
+        """
+        node_levels = self._node_levels
+        highs = self._highs
+        lows = self._lows
+        marked = [False] * len(node_levels)
+        stack = [edge >> 1 for edge in self._roots]
+        while stack:
+            node = stack.pop()
+            if not marked[node]:
+                marked[node] = True
+                stack.append(highs[node] >> 1)
+                stack.append(lows[node] >> 1)
+        freed = 0
+        for node in range(1, len(node_levels)):
+            if not marked[node] and node_levels[node] >= 0:
+                del self._unique[(node_levels[node], highs[node], lows[node])]
+                node_levels[node] = -1
+                self._free.append(node)
+                freed += 1
+        self._cache = {
+            key: result
+            for key, result in self._cache.items()
+            if marked[result >> 1]
+            and marked[key[0] >> 1]
+            and marked[key[1] >> 1]
+            and marked[key[2] >> 1]
+        }
+        return freed
+
+    def _wrap(self, edge: int) -> BDD:
+        """Hands out the given edge as a diagram that protects its nodes from
+        collection, collecting garbage if the current manager grew past its
+        threshold.
+
+        Parameters:
+            edge: edge of the current manager.
+
+        Returns:
+            The diagram of the given edge.
+        """
+        diagram = BDD(self, edge)
+        self._roots[edge] = self._roots.get(edge, 0) + 1
+        finalize(diagram, self._release, edge)
+        if len(self) > self._gc_threshold:
+            self.collect_garbage()
+            self._gc_threshold = max(self._gc_threshold, 2 * len(self))
+        return diagram
+
+    def _release(self, edge: int) -> None:
+        """Forgets a handle of the given edge that was collected.
+
+        Parameters:
+            edge: root edge of the collected handle.
+        """
+        count = self._roots[edge] - 1
+        if count:
+            self._roots[edge] = count
+        else:
+            del self._roots[edge]
+
+    def _make(self, level: int, high: int, low: int) -> int:
+        """Finds or creates the node with the given level and children.
+
+        Parameters:
+            level: level of the variable name that the node tests.
+            high: edge to take where the variable name is true, to a node of a
+                higher level.
+            low: edge to take where the variable name is false, to a node of a
+                higher level.
+
+        Returns:
+            The edge of the reduced function of the given node.
+        """
+        if high == low:
+            return high
+        # Keep the high edge regular by complementing the node instead.
+        negated = high & 1
+        if negated:
+            high ^= 1
+            low ^= 1
+        key = (level, high, low)
+        node = self._unique.get(key)
+        if node is None:
+            if self._free:
+                node = self._free.pop()
+                self._node_levels[node] = level
+                self._highs[node] = high
+                self._lows[node] = low
+            else:
+                node = len(self._node_levels)
+                self._node_levels.append(level)
+                self._highs.append(high)
+                self._lows.append(low)
+            self._unique[key] = node
+        return node << 1 | negated
+
+    def _ite(self, f: int, g: int, h: int) -> int:
+        """Computes the if-then-else of the given edges.
+
+        The recursion on the cofactors of the top variable name runs on an
+        explicit stack, so it handles any number of variable names.
+
+        Parameters:
+            f: edge to branch on.
+            g: edge to take where `f` is true.
+            h: edge to take where `f` is false.
+
+        Returns:
+            The edge of the function that agrees with `g` where `f` is true and
+            with `h` elsewhere.
+        """
+        node_levels = self._node_levels
+        highs = self._highs
+        lows = self._lows
+        cache = self._cache
+        results: List[int] = []
+        # Each task is either a call on three edges, or, marked by a level, the
+        # combination of the results of the calls on their cofactors, to be
+        # complemented if negated is set.
+        tasks: List[Tuple[int, int, int, int, int]] = [(-1, f, g, h, 0)]
+        while tasks:
+            level, f, g, h, negated = tasks.pop()
+            if level >= 0:
+                low = results.pop()
+                high = results.pop()
+                result = self._make(level, high, low)
+                cache[(f, g, h)] = result
+                results.append(result ^ negated)
+                continue
+            if f == _TRUE:
+                results.append(g)
+                continue
+            if f == _FALSE:
+                results.append(h)
+                continue
+            if g == f:
+                g = _TRUE
+            elif g == f ^ 1:
+                g = _FALSE
+            if h == f:
+                h = _FALSE
+            elif h == f ^ 1:
+                h = _TRUE
+            if g == h:
+                results.append(g)
+                continue
+            if g == _TRUE and h == _FALSE:
+                results.append(f)
+                continue
+            if g == _FALSE and h == _TRUE:
+                results.append(f ^ 1)
+                continue
+            # Normalize to a regular condition and a regular then edge, so that
+            # equivalent calls share cache entries.
+            if f & 1:
+                f ^= 1
+                g, h = h, g
+            negated = g & 1
+            if negated:
+                g ^= 1
+                h ^= 1
+            result = cache.get((f, g, h))
+            if result is not None:
+                results.append(result ^ negated)
+                continue
+            level = min(
+                node_levels[f >> 1], node_levels[g >> 1], node_levels[h >> 1]
+            )
+            tasks.append((level, f, g, h, negated))
+            cofactors = []
+            for edge in (f, g, h):
+                node = edge >> 1
+                if node_levels[node] == level:
+                    negation = edge & 1
+                    cofactors.append(
+                        (highs[node] ^ negation, lows[node] ^ negation)
+                    )
+                else:
+                    cofactors.append((edge, edge))
+            (fh, fl), (gh, gl), (hh, hl) = cofactors
+            tasks.append((-1, fl, gl, hl, 0))
+            tasks.append((-1, fh, gh, hh, 0))
+        return results[0]
+
+    def _count(self, edge: int) -> int:
+        """Counts the models of the given edge.
+
+        Parameters:
+            edge: edge of the current manager.
+
+        Returns:
+            The number of models over the variable names of the current manager
+            in which the function of the given edge is true.
+        """
+        n = len(self._names)
+        node_levels = self._node_levels
+        # The number of models over the variable names from the level of each
+        # node on of its regular function.
+        counts = {0: 1}
+
+        def level(node: int) -> int:
+            return min(node_levels[node], n)
+
+        def count(edge: int, parent_level: int) -> int:
+            node = edge >> 1
+            models = counts[node]
+            if edge & 1:
+                models = (1 << (n - level(node))) - models
+            return models << (level(node) - parent_level - 1)
+
+        for node in BDD(self, edge)._nodes():
+            if node != 0:
+                counts[node] = count(
+                    self._highs[node], node_levels[node]
+                ) + count(self._lows[node], node_levels[node])
+        return count(edge, -1)
+
+
+@frozen
+class BDD:
+    """An immutable reference to a Boolean function in a `BDDManager`.
+
+    Diagrams of the same manager are equal exactly when their functions are,
+    and they can be combined with the operators ``~``, ``&``, ``|`` and ``^``.
+
+    Attributes:
+        manager (`BDDManager`): the manager of the function.
+        edge (`int`): the edge of the function in its manager.
+    """
+
+    __slots__ = ("manager", "edge", "__weakref__")
+
+    manager: BDDManager
+    edge: int
+
+    def __init__(self, manager: BDDManager, edge: int):
+        """Initializes a `BDD` from its manager and edge.
+
+        Parameters:
+            manager: the manager of the function.
+            edge: the edge of the function in its manager.
+        """
+        object.__setattr__(self, "manager", manager)
+        object.__setattr__(self, "edge", edge)
+
+    def __repr__(self) -> str:
+        """Computes a string representation of the current diagram.
+
+        Returns:
+            A string representation of the current diagram.
+        """
+        return "BDD({} nodes)".format(len(self))
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the current diagram with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is a `BDD` object of the same manager and
+            function as the current diagram, `False` otherwise.
+        """
+        return (
+            isinstance(other, BDD)
+            and self.manager is other.manager
+            and self.edge == other.edge
+        )
+
+    def __ne__(self, other: object) -> bool:
+        """Compares the current diagram with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is not a `BDD` object or does not equal
+            the current diagram, `False` otherwise.
+        """
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash((id(self.manager), self.edge))
+
+    def __len__(self) -> int:
+        """Counts the nodes of the current diagram.
+
+        Returns:
+            The number of nodes reachable from the current diagram, including
+            the terminal node.
+        """
+        return len(self._nodes())
+
+    def __invert__(self) -> BDD:
+        return self.manager._wrap(self.edge ^ 1)
+
+    def __and__(self, other: BDD) -> BDD:
+        assert self.manager is other.manager
+        return self.manager._wrap(
+            self.manager._ite(self.edge, other.edge, _FALSE)
+        )
+
+    def __or__(self, other: BDD) -> BDD:
+        assert self.manager is other.manager
+        return self.manager._wrap(
+            self.manager._ite(self.edge, _TRUE, other.edge)
+        )
+
+    def __xor__(self, other: BDD) -> BDD:
+        assert self.manager is other.manager
+        return self.manager._wrap(
+            self.manager._ite(self.edge, other.edge ^ 1, other.edge)
+        )
+
+    def _nodes(self) -> List[int]:
+        """Lists the nodes reachable from the current diagram, each after its
+        children.
+
+        Returns:
+            The indices of the nodes reachable from the current diagram, in
+            post-order.
+        """
+        highs = self.manager._highs
+        lows = self.manager._lows
+        order: List[int] = []
+        visited = set()
+        # As in `~logic.propositions.syntax.Formula.postorder`, each expanded
+        # node is followed by a -1 marker, above which its children are pushed.
+        stack = [self.edge >> 1]
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                order.append(stack.pop())
+                continue
+            if node in visited:
+                continue
+            visited.add(node)
+            stack.append(node)
+            stack.append(-1)
+            if node != 0:
+                for child in (lows[node] >> 1, highs[node] >> 1):
+                    if child not in visited:
+                        stack.append(child)
+        return order
+
+    def is_tautology(self) -> bool:
+        """Checks if the current diagram is of the constant true function.
+
+        Returns:
+            `True` if the current diagram is true in every model, `False`
+            otherwise.
+        """
+        return self.edge == _TRUE
+
+    def is_contradiction(self) -> bool:
+        """Checks if the current diagram is of the constant false function.
+
+        Returns:
+            `True` if the current diagram is false in every model, `False`
+            otherwise.
+        """
+        return self.edge == _FALSE
+
+    def is_satisfiable(self) -> bool:
+        """Checks if the current diagram is true in some model.
+
+        Returns:
+            `True` if the current diagram is true in some model, `False`
+            otherwise.
+        """
+        return self.edge != _FALSE
+
+    def support(self) -> FrozenSet[str]:
+        """Finds the variable names that the current diagram depends on.
+
+        Returns:
+            The variable names tested by the nodes of the current diagram.
+        """
+        names = self.manager._names
+        node_levels = self.manager._node_levels
+        return frozenset(
+            names[node_levels[node]] for node in self._nodes() if node != 0
+        )
+
+    def count_models(self, variables: Optional[Iterable[str]] = None) -> int:
+        """Counts the models of the current diagram, in time linear in its
+        size.
+
+        Parameters:
+            variables: variable names over which to count the models, a
+                superset of the `support` of the current diagram, or `None` for
+                the variable names of its manager.
+
+        Returns:
+            The number of models over the given variable names in which the
+            current diagram is true.
+
+        Examples:
+            >>> BDDManager().from_formula(Formula.parse('(p|q)')).count_models()
+            3
+        """
+        models = self.manager._count(self.edge)
+        if variables is None:
+            return models
+        variables = frozenset(variables)
+        assert self.support().issubset(variables)
+        shared = len(variables.intersection(self.manager._names))
+        # Drop the unused variable names of the manager, then count over the
+        # given ones that it does not know.
+        models >>= len(self.manager._names) - shared
+        return models << (len(variables) - shared)
+
+    def model(self) -> Optional[Dict[str, bool]]:
+        """Finds a model of the current diagram.
+
+        Returns:
+            A model over the variable names of the manager of the current
+            diagram in which the diagram is true, with the variable names that
+            it does not need to test false, or `None` if the current diagram is
+            a contradiction.
+        """
+        if self.edge == _FALSE:
+            return None
+        manager = self.manager
+        model = dict.fromkeys(manager._names, False)
+        edge = self.edge
+        while edge != _TRUE:
+            node = edge >> 1
+            high = manager._highs[node] ^ (edge & 1)
+            value = high != _FALSE
+            model[manager._names[manager._node_levels[node]]] = value
+            edge = high if value else manager._lows[node] ^ (edge & 1)
+        return model
+
+
+def is_equivalent(first: Formula, second: Formula) -> bool:
+    """Checks if the given formulas are equivalent, by comparing their
+    diagrams.
+
+    Parameters:
+        first: first formula to compare.
+        second: second formula to compare.
+
+    Returns:
+        `True` if the given formulas are true in the same models over their
+        variable names, `False` otherwise.
+
+    Examples:
+        >>> is_equivalent(Formula.parse('~(p&q)'), Formula.parse('(~p|~q)'))
+        True
+    """
+    manager = BDDManager()
+    return manager.from_formula(first) == manager.from_formula(second)
@@ -0,0 +1,321 @@
+"""Linear-size conjunctive normal form encodings of propositional formulas."""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from logic.propositions.syntax import Formula
+from logic.propositions.symbols import (
+    AND,
+    F,
+    IFF,
+    IMPLIES,
+    NAND,
+    NOR,
+    NOT,
+    OR,
+    T,
+    VARIABLE,
+    XOR,
+)
+
+#: The polarities of subformulas: whether the encoding of a subformula needs to
+#: imply it, be implied by it, or both.
+POSITIVE, NEGATIVE, BOTH = 1, 2, 3
+
+
+class ClauseDatabase:
+    """A set of clauses stored in flat integer arrays.
+
+    Variables are numbered from 1, and a clause is a sequence of nonzero
+    integers, each of which is a variable or the negation of a variable, as in
+    the DIMACS CNF format. The first variables may be named after variable
+    names of formulas, and the others are auxiliary.
+
+    Attributes:
+        literals (`~array.array`): the literals of all clauses, one clause after
+            the other.
+        offsets (`~array.array`): the index in `literals` of the first literal
+            of each clause, followed by the number of literals.
+        names (`~typing.List`\\[`str`]): the variable names of the named
+            variables, indexed by their numbers minus 1.
+        numbers (`~typing.Dict`\\[`str`, `int`]): the numbers of the named
+            variables.
+        n_variables (`int`): the number of variables, named or auxiliary.
+    """
+
+    __slots__ = ("literals", "offsets", "names", "numbers", "n_variables")
+
+    literals: array
+    offsets: array
+    names: List[str]
+    numbers: Dict[str, int]
+    n_variables: int
+
+    def __init__(self, names: Iterable[str] = (), n_variables: int = 0):
+        """Initializes an empty `ClauseDatabase`.
+
+        Parameters:
+            names: the distinct variable names of the first variables, in
+                order.
+            n_variables: the number of variables, or 0 for the number of the
+                given variable names. Auxiliary variables can be added later
+                by `new_variable`.
+        """
+        self.literals = array("i")
+        self.offsets = array("q", [0])
+        self.names = list(names)
+        self.numbers = {
+            name: number for number, name in enumerate(self.names, 1)
+        }
+        assert len(self.numbers) == len(self.names)
+        self.n_variables = max(n_variables, len(self.names))
+
+    def __repr__(self) -> str:
+        """Computes a string representation of the current database.
+
+        Returns:
+            A string representation of the current database.
+        """
+        return "ClauseDatabase({} variables, {} clauses)".format(
+            self.n_variables, len(self)
+        )
+
+    def __len__(self) -> int:
+        """Counts the clauses of the current database.
+
+        Returns:
+            The number of clauses in the current database.
+        """
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> array:
+        """Finds the clause with the given number in the current database.
+
+        Parameters:
+            index: the number of the clause to find, counted from zero.
+
+        Returns:
+            The literals of the clause with the given number.
+        """
+        return self.literals[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[array]:
+        """Enumerates the clauses of the current database.
+
+        Returns:
+            An iterator over the literals of each clause of the current
+            database, in order.
+        """
+        literals = self.literals
+        offsets = self.offsets
+        for index in range(len(offsets) - 1):
+            yield literals[offsets[index] : offsets[index + 1]]
+
+    def new_variable(self) -> int:
+        """Adds an auxiliary variable to the current database.
+
+        Returns:
+            The number of the new variable.
+        """
+        self.n_variables += 1
+        return self.n_variables
+
+    def add_clause(self, clause: Iterable[int]) -> None:
+        """Adds a clause to the current database.
+
+        Parameters:
+            clause: the literals of the clause, over the variables of the
+                current database.
+        """
+        self.literals.extend(clause)
+        self.offsets.append(len(self.literals))
+
+    def decode(self, values: Sequence[bool]) -> Dict[str, bool]:
+        """Restricts the given assignment to the named variables.
+
+        Parameters:
+            values: the truth values of the variables of the current database,
+                in order.
+
+        Returns:
+            The model that maps the name of each named variable to its truth
+            value in the given assignment.
+        """
+        return dict(zip(self.names, values))
+
+
+def _negate(polarity: int) -> int:
+    """Computes the polarity of the operand of a negation.
+
+    Parameters:
+        polarity: polarity of a negation.
+
+    Returns:
+        The polarity of the operand of a negation of the given polarity.
+    """
+    return (polarity & POSITIVE) << 1 | (polarity & NEGATIVE) >> 1
+
+
+def _literals(formula: Formula) -> Optional[List[Formula]]:
+    """Finds the literals of the given formula if it is a disjunction of them.
+
+    Parameters:
+        formula: formula to check.
+
+    Returns:
+        The variable names, negated variable names, and constants that the
+        given formula is a disjunction of, or `None` if it is not such a
+        disjunction.
+    """
+    literals: List[Formula] = []
+    stack = [formula]
+    while stack:
+        node = stack.pop()
+        if node.opcode == OR:
+            stack.append(node.second)
+            stack.append(node.first)
+        elif node.opcode in (VARIABLE, T, F) or (
+            node.opcode == NOT and node.first.opcode == VARIABLE
+        ):
+            literals.append(node)
+        else:
+            return None
+    return literals
+
+
+def tseitin(formula: Formula, polarity_aware: bool = False) -> ClauseDatabase:
+    """Encodes the given formula as a set of clauses of size linear in the size
+    of the formula.
+
+    Each distinct binary operator subformula is encoded by an auxiliary
+    variable with clauses that state that it is equivalent to the subformula,
+    and negations are encoded by negating literals. The conjuncts at the top of
+    the formula are encoded separately, and those that are disjunctions of
+    literals are encoded as single clauses.
+
+    With `polarity_aware`, the Plaisted-Greenbaum encoding is used instead:
+    an auxiliary variable of a subformula that only occurs under an even
+    (respectively, odd) number of negations only implies (respectively, is
+    only implied by) the subformula, which takes roughly half of the clauses.
+
+    Parameters:
+        formula: formula to encode.
+        polarity_aware: whether to only encode the implications that the
+            polarities of the subformulas require.
+
+    Returns:
+        A clause database whose named variables are the variable names of the
+        given formula in alphabetical order, and whose clauses are satisfied
+        by an assignment to its variables only if the given formula is
+        satisfied by the restriction of the assignment to the named variables.
+        Each model of the given formula extends to an assignment that
+        satisfies the clauses.
+
+    Examples:
+        >>> list(map(list, tseitin(Formula.parse('(p&(q|~r))'))))
+        [[1], [2, -3]]
+    """
+    database = ClauseDatabase(sorted(formula.variables()))
+    numbers = database.numbers
+    roots: List[Formula] = []
+    stack = [formula]
+    while stack:
+        node = stack.pop()
+        if node.opcode == AND:
+            stack.append(node.second)
+            stack.append(node.first)
+            continue
+        literals = _literals(node)
+        if literals is None:
+            roots.append(node)
+        elif all(literal.opcode != T for literal in literals):
+            database.add_clause(
+                (
+                    numbers[literal.root]
+                    if literal.opcode == VARIABLE
+                    else -numbers[literal.first.root]
+                )
+                for literal in literals
+                if literal.opcode != F
+            )
+    # The distinct subformulas of the roots, with each after its operands.
+    program: Dict[int, Formula] = {}
+    for root in roots:
+        for node in root.postorder():
+            program.setdefault(id(node), node)
+    polarities = {
+        id(node): 0 if polarity_aware else BOTH for node in program.values()
+    }
+    if polarity_aware:
+        for root in roots:
+            polarities[id(root)] |= POSITIVE
+        # Each subformula precedes its operands in reverse, so its polarity is
+        # final when it is propagated to them.
+        for node in reversed(program.values()):
+            polarity = polarities[id(node)]
+            opcode = node.opcode
+            if opcode in (NOT, NAND, NOR):
+                polarity = _negate(polarity)
+            if opcode == NOT:
+                polarities[id(node.first)] |= polarity
+            elif opcode in (AND, OR, NAND, NOR):
+                polarities[id(node.first)] |= polarity
+                polarities[id(node.second)] |= polarity
+            elif opcode == IMPLIES:
+                polarities[id(node.first)] |= _negate(polarity)
+                polarities[id(node.second)] |= polarity
+            elif opcode in (XOR, IFF):
+                polarities[id(node.first)] = BOTH
+                polarities[id(node.second)] = BOTH
+    add_clause = database.add_clause
+    literals: Dict[int, int] = {}
+    true = 0
+    for node in program.values():
+        opcode = node.opcode
+        if opcode == VARIABLE:
+            literals[id(node)] = numbers[node.root]
+            continue
+        if opcode == T or opcode == F:
+            if not true:
+                true = database.new_variable()
+                add_clause((true,))
+            literals[id(node)] = true if opcode == T else -true
+            continue
+        a = literals[id(node.first)]
+        if opcode == NOT:
+            literals[id(node)] = -a
+            continue
+        b = literals[id(node.second)]
+        x = database.new_variable()
+        polarity = polarities[id(node)]
+        if opcode in (NAND, NOR, IFF):
+            # The auxiliary variable encodes the negation of the subformula.
+            literals[id(node)] = -x
+            polarity = _negate(polarity)
+        else:
+            literals[id(node)] = x
+        if opcode == AND or opcode == NAND:
+            if polarity & POSITIVE:
+                add_clause((-x, a))
+                add_clause((-x, b))
+            if polarity & NEGATIVE:
+                add_clause((x, -a, -b))
+        elif opcode == OR or opcode == NOR or opcode == IMPLIES:
+            if opcode == IMPLIES:
+                a = -a
+            if polarity & POSITIVE:
+                add_clause((-x, a, b))
+            if polarity & NEGATIVE:
+                add_clause((x, -a))
+                add_clause((x, -b))
+        else:
+            if polarity & POSITIVE:
+                add_clause((-x, a, b))
+                add_clause((-x, -a, -b))
+            if polarity & NEGATIVE:
+                add_clause((x, -a, b))
+                add_clause((x, a, -b))
+    for root in roots:
+        add_clause((literals[id(root)],))
+    return database
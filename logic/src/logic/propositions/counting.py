@@ -0,0 +1,360 @@
+"""Counting the models of propositional formulas without enumerating them."""
+
+from __future__ import annotations
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import iter_truth_table
+from logic.propositions.cnf import tseitin
+from logic.propositions.bdd import BDDManager
+
+T = TypeVar("T")
+
+#: A clause, as sorted nonzero integers, each of which is a variable or the
+#: negation of a variable, as in the DIMACS CNF format.
+Clause = Tuple[int, ...]
+
+#: A set of clauses that share no variable with other sets, as sorted clauses.
+Component = Tuple[Clause, ...]
+
+#: A branch of the search of a component: the literals that it assigns, the
+#: variables that it leaves free, and the number of components that remain, or
+#: `None` for a branch that falsifies a clause.
+_Branch = Optional[Tuple[Set[int], Set[int], int]]
+
+#: The largest number of variable names over which ``'auto'`` counts models by
+#: truth tables rather than by ``'dpll'``.
+TRUTH_TABLE_VARIABLES = 20
+
+
+def _count_truth_table(formula: Formula, variables: Sequence[str]) -> int:
+    """Counts the models of the given formula by its truth table.
+
+    Parameters:
+        formula: formula to count the models of.
+        variables: variable names over which to count the models.
+
+    Returns:
+        The number of models over the given variable names in which the given
+        formula is true.
+    """
+    return sum(
+        bin(table).count("1")
+        for _, table in iter_truth_table(formula, variables)
+    )
+
+
+def _count_bdd(formula: Formula, variables: Sequence[str]) -> int:
+    """Counts the models of the given formula by its binary decision diagram.
+
+    Parameters:
+        formula: formula to count the models of.
+        variables: variable names over which to count the models, in the order
+            in which the diagram tests them.
+
+    Returns:
+        The number of models over the given variable names in which the given
+        formula is true.
+    """
+    diagram = BDDManager(variables).from_formula(formula)
+    return diagram.count_models(variables)
+
+
+def _propagate(
+    clauses: Iterable[Clause], literals: Iterable[int]
+) -> Optional[Tuple[List[Clause], Set[int]]]:
+    """Simplifies the given clauses by the given literals and the literals that
+    unit propagation implies from them.
+
+    Parameters:
+        clauses: clauses to simplify.
+        literals: literals to assume true.
+
+    Returns:
+        The clauses that the assumed and implied literals do not satisfy, with
+        the false literals removed, and the set of the assumed and implied
+        literals, or `None` if they falsify a clause.
+    """
+    assigned = set(literals)
+    while True:
+        remaining: List[Clause] = []
+        units: List[int] = []
+        for clause in clauses:
+            reduced = []
+            for literal in clause:
+                if literal in assigned:
+                    break
+                if -literal not in assigned:
+                    reduced.append(literal)
+            else:
+                if not reduced:
+                    return None
+                if len(reduced) == 1:
+                    units.append(reduced[0])
+                else:
+                    remaining.append(tuple(reduced))
+        if not units:
+            return remaining, assigned
+        for unit in units:
+            if -unit in assigned:
+                return None
+            assigned.add(unit)
+        clauses = remaining
+
+
+def _components(clauses: Sequence[Clause]) -> List[Component]:
+    """Partitions the given clauses into sets that share no variables.
+
+    Parameters:
+        clauses: clauses to partition.
+
+    Returns:
+        The sets of the given clauses that are connected by shared variables,
+        each sorted, so that equal sets of clauses are equal components.
+    """
+    parents: Dict[int, int] = {}
+
+    def find(variable: int) -> int:
+        root = variable
+        while parents[root] != root:
+            root = parents[root]
+        while parents[variable] != root:
+            parents[variable], variable = root, parents[variable]
+        return root
+
+    for clause in clauses:
+        first = find(parents.setdefault(abs(clause[0]), abs(clause[0])))
+        for literal in clause[1:]:
+            other = find(parents.setdefault(abs(literal), abs(literal)))
+            if other != first:
+                parents[other] = first
+    groups: Dict[int, List[Clause]] = {}
+    for clause in clauses:
+        groups.setdefault(find(abs(clause[0])), []).append(clause)
+    return [tuple(sorted(group)) for group in groups.values()]
+
+
+def _variables(clauses: Iterable[Clause]) -> Set[int]:
+    """Finds the variables of the given clauses.
+
+    Parameters:
+        clauses: clauses to find the variables of.
+
+    Returns:
+        The variables that occur in the given clauses, negated or not.
+    """
+    return {abs(literal) for clause in clauses for literal in clause}
+
+
+def _branch(component: Component) -> int:
+    """Chooses the variable of the given component to branch on.
+
+    Parameters:
+        component: component to branch in.
+
+    Returns:
+        A variable of the given component with the most occurrences.
+    """
+    occurrences: Dict[int, int] = {}
+    for clause in component:
+        for literal in clause:
+            variable = abs(literal)
+            occurrences[variable] = occurrences.get(variable, 0) + 1
+    return max(occurrences, key=occurrences.__getitem__)
+
+
+def search_components(
+    clauses: Iterable[Iterable[int]],
+    n_variables: int,
+    branch: Callable[[Set[int], Set[int], List[T]], T],
+    decide: Callable[[int, List[T]], T],
+    contradiction: T,
+) -> T:
+    """Runs a component-caching Davis-Putnam-Logemann-Loveland search over the
+    given clauses, and folds it into a value.
+
+    The search branches on a variable, propagates units, and splits the
+    remaining clauses into components that share no variables. The value of
+    each component is cached, so that components that recur in other branches
+    are searched once.
+
+    Parameters:
+        clauses: clauses over the variables from 1 to the given number.
+        n_variables: number of variables.
+        branch: combines the literals that a branch assigns, the variables
+            that it leaves free, and the values of the components that remain,
+            in order, into the value of the branch.
+        decide: combines the variable that a component branches on and the
+            values of its branches on the variable and on its negation into the
+            value of the component.
+        contradiction: the value of a branch that falsifies a clause.
+
+    Returns:
+        The value of the branch of the given clauses that assigns no literal.
+    """
+    propagated = _propagate([tuple(sorted(clause)) for clause in clauses], ())
+    if propagated is None:
+        return contradiction
+    remaining, root_literals = propagated
+    root_free = set(range(1, n_variables + 1)) - _variables(remaining)
+    root_free -= {abs(literal) for literal in root_literals}
+    cache: Dict[Component, T] = {}
+    results: List[T] = []
+    # Each task is either a component to search, or, marked by its branches,
+    # the combination of the values of the components of its branches.
+    tasks: List[Tuple[Component, int, List[_Branch]]] = [
+        (component, 0, []) for component in _components(remaining)
+    ]
+    while tasks:
+        component, variable, branches = tasks.pop()
+        if branches:
+            values = []
+            for searched in reversed(branches):
+                if searched is None:
+                    values.append(contradiction)
+                    continue
+                literals, free, n_components = searched
+                parts = results[len(results) - n_components :]
+                del results[len(results) - n_components :]
+                values.append(branch(literals, free, parts))
+            value = decide(variable, values[::-1])
+            cache[component] = value
+            results.append(value)
+            continue
+        if component in cache:
+            results.append(cache[component])
+            continue
+        variable = _branch(component)
+        variables = _variables(component)
+        subtasks: List[Tuple[Component, int, List[_Branch]]] = []
+        for literal in (variable, -variable):
+            propagated = _propagate(component, (literal,))
+            if propagated is None:
+                branches.append(None)
+                continue
+            remaining, assigned = propagated
+            components = _components(remaining)
+            free = variables - _variables(remaining)
+            free -= {abs(literal) for literal in assigned}
+            branches.append((assigned, free, len(components)))
+            subtasks.extend((part, 0, []) for part in components)
+        tasks.append((component, variable, branches))
+        tasks.extend(reversed(subtasks))
+    return branch(root_literals, root_free, results)
+
+
+def _count_dpll(formula: Formula, variables: Sequence[str]) -> int:
+    """Counts the models of the given formula by `search_components` over its
+    Tseitin encoding, in which the counts of the components of each branch
+    multiply, and the counts of the branches of each variable add up.
+
+    Parameters:
+        formula: formula to count the models of.
+        variables: variable names over which to count the models.
+
+    Returns:
+        The number of models over the given variable names in which the given
+        formula is true.
+    """
+
+    def branch(literals: Set[int], free: Set[int], counts: List[int]) -> int:
+        count = 1 << len(free)
+        for part in counts:
+            count *= part
+        return count
+
+    # The Tseitin encoding extends each model of the formula uniquely.
+    database = tseitin(formula)
+    count = search_components(
+        database,
+        database.n_variables,
+        branch,
+        lambda variable, counts: sum(counts),
+        0,
+    )
+    return count << (len(variables) - len(database.names))
+
+
+def _count_ddnnf(formula: Formula, variables: Sequence[str]) -> int:
+    """Counts the models of the given formula by its decision-DNNF circuit.
+
+    Parameters:
+        formula: formula to count the models of.
+        variables: variable names over which to count the models.
+
+    Returns:
+        The number of models over the given variable names in which the given
+        formula is true.
+    """
+    from logic.propositions.ddnnf import compile_ddnnf
+
+    circuit = compile_ddnnf(formula)
+    return circuit.count_models() << (len(variables) - len(circuit.names))
+
+
+#: The model counters by method name, each of which takes a formula and the
+#: distinct variable names over which to count its models, a superset of its
+#: variable names, and returns the number of them. Other counters can be
+#: added under new method names.
+COUNTERS: Dict[str, Callable[[Formula, Sequence[str]], int]] = {
+    "truth_table": _count_truth_table,
+    "dpll": _count_dpll,
+    "bdd": _count_bdd,
+    "ddnnf": _count_ddnnf,
+}
+
+
+def count_models(
+    formula: Formula,
+    variables: Optional[Iterable[str]] = None,
+    method: str = "auto",
+) -> int:
+    """Counts the models of the given formula, without enumerating them.
+
+    Parameters:
+        formula: formula to count the models of.
+        variables: variable names over which to count the models, a superset
+            of the variable names of the given formula, or `None` for its
+            variable names.
+        method: the name of a counter in `COUNTERS`: ``'truth_table'`` to
+            count the models in bit-parallel chunks of the truth table,
+            ``'dpll'`` to count them by a component-caching search,
+            ``'bdd'`` to count them on the binary decision diagram of the
+            formula, ordered by the given variable names, or ``'ddnnf'`` to
+            count them on the decision-DNNF circuit of the formula, compiled by
+            `~logic.propositions.ddnnf`. ``'auto'`` picks
+            ``'truth_table'`` for up to `TRUTH_TABLE_VARIABLES` variable
+            names, and ``'dpll'`` otherwise.
+
+    Returns:
+        The number of models over the given variable names in which the given
+        formula is true.
+
+    Examples:
+        >>> count_models(Formula.parse('(p|q)'))
+        3
+
+        >>> count_models(Formula.parse('(p|q)'), ['p', 'q', 'r'])
+        6
+    """
+    if variables is None:
+        variables = sorted(formula.variables())
+    else:
+        variables = list(dict.fromkeys(variables))
+        assert formula.variables().issubset(variables)
+    if method == "auto":
+        if len(variables) <= TRUTH_TABLE_VARIABLES:
+            method = "truth_table"
+        else:
+            method = "dpll"
+    return COUNTERS[method](formula, variables)
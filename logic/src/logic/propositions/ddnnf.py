@@ -0,0 +1,681 @@
+"""Compilation of propositional formulas into decision-DNNF circuits, which
+answer queries in time linear in their size."""
+
+from __future__ import annotations
+import os
+from array import array
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from logic.utils.logic_utils import frozen
+from logic.propositions.syntax import Formula, is_variable
+from logic.propositions.cnf import tseitin
+from logic.propositions.dimacs import NAME_COMMENT, NAMES_COMMENT
+from logic.propositions.counting import search_components
+
+#: The kinds of the nodes of a circuit: a literal, a conjunction of children
+#: that share no variables, and a disjunction of children that no assignment
+#: satisfies together.
+LITERAL, CONJUNCTION, DISJUNCTION = range(3)
+
+
+@frozen
+class DDNNF:
+    """An immutable smooth decision-DNNF circuit, stored in flat arrays.
+
+    Variables are numbered from 1 and literals are nonzero integers, as in the
+    DIMACS CNF format. The first variables are named after the variable names
+    of the compiled formula, and the others are auxiliary variables of its
+    Tseitin encoding, which each model of the formula extends uniquely, so the
+    queries below are over the named variables. The children of every
+    conjunction share no variables, the children of every disjunction are
+    mutually exclusive, and all children of a disjunction mention the same
+    variables.
+
+    Nodes are stored in an order in which the children of every node precede
+    it, and the last node is the root of the circuit.
+
+    Attributes:
+        kinds (`~array.array`): the kind of each node, `LITERAL`,
+            `CONJUNCTION`, or `DISJUNCTION`.
+        values (`~array.array`): the literal of each literal node, and the
+            variable that each disjunction decides on, or 0.
+        children (`~array.array`): the children of all nodes, one node after
+            the other.
+        offsets (`~array.array`): the index in `children` of the first child
+            of each node, followed by the number of children.
+        names (`~typing.Tuple`\\[`str`, ...]): the variable names of the named
+            variables, indexed by their numbers minus 1.
+        n_variables (`int`): the number of variables, named or auxiliary.
+    """
+
+    __slots__ = (
+        "kinds",
+        "values",
+        "children",
+        "offsets",
+        "names",
+        "n_variables",
+    )
+
+    kinds: array
+    values: array
+    children: array
+    offsets: array
+    names: Tuple[str, ...]
+    n_variables: int
+
+    def __init__(
+        self,
+        kinds: Sequence[int],
+        values: Sequence[int],
+        children: Sequence[int],
+        offsets: Sequence[int],
+        names: Sequence[str],
+        n_variables: int,
+    ):
+        """Initializes a `DDNNF` from its arrays.
+
+        Parameters:
+            kinds: the kind of each node.
+            values: the literal or decision variable of each node.
+            children: the children of all nodes, one node after the other.
+            offsets: the index of the first child of each node, followed by
+                the number of children.
+            names: the variable names of the named variables.
+            n_variables: the number of variables, named or auxiliary.
+        """
+        assert len(kinds) > 0
+        assert len(kinds) == len(values) == len(offsets) - 1
+        object.__setattr__(self, "kinds", array("B", kinds))
+        object.__setattr__(self, "values", array("q", values))
+        object.__setattr__(self, "children", array("q", children))
+        object.__setattr__(self, "offsets", array("q", offsets))
+        object.__setattr__(self, "names", tuple(names))
+        object.__setattr__(self, "n_variables", n_variables)
+
+    def __len__(self) -> int:
+        """Counts the nodes of the current circuit.
+
+        Returns:
+            The number of nodes of the current circuit.
+        """
+        return len(self.kinds)
+
+    def __repr__(self) -> str:
+        """Computes a string representation of the current circuit.
+
+        Returns:
+            A string representation of the current circuit.
+        """
+        return "DDNNF({} nodes, {} edges, {} variables)".format(
+            len(self), len(self.children), self.n_variables
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the current circuit with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is a `DDNNF` object with the same arrays
+            and variables as the current circuit, `False` otherwise.
+        """
+        return (
+            isinstance(other, DDNNF)
+            and self.kinds == other.kinds
+            and self.values == other.values
+            and self.children == other.children
+            and self.offsets == other.offsets
+            and self.names == other.names
+            and self.n_variables == other.n_variables
+        )
+
+    def __ne__(self, other: object) -> bool:
+        """Compares the current circuit with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is not a `DDNNF` object or does not
+            equal the current circuit, `False` otherwise.
+        """
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash((self.kinds.tobytes(), self.children.tobytes()))
+
+    def _weights(
+        self,
+        weights: Mapping[str, Tuple[Any, Any]],
+        condition: Optional[Mapping[str, bool]],
+    ) -> Tuple[List[Any], List[Any]]:
+        """Computes the weights of the literals of the current circuit.
+
+        Parameters:
+            weights: the weights of the truth values `True` and `False` of
+                named variables.
+            condition: the truth values of named variables to condition on, or
+                `None`.
+
+        Returns:
+            The weights of the variables and of their negations, indexed by
+            the variables.
+        """
+        numbers = {name: number for number, name in enumerate(self.names, 1)}
+        positive: List[Any] = [1] * (self.n_variables + 1)
+        negative: List[Any] = [1] * (self.n_variables + 1)
+        for name, (true_weight, false_weight) in weights.items():
+            positive[numbers[name]] = true_weight
+            negative[numbers[name]] = false_weight
+        for name, value in (condition or {}).items():
+            if value:
+                negative[numbers[name]] = 0
+            else:
+                positive[numbers[name]] = 0
+        return positive, negative
+
+    def _evaluate(
+        self, positive: Sequence[Any], negative: Sequence[Any]
+    ) -> List[Any]:
+        """Computes the weighted model count of every node of the current
+        circuit.
+
+        Parameters:
+            positive: the weights of the variables, indexed by the variables.
+            negative: the weights of the negations of the variables, indexed
+                by the variables.
+
+        Returns:
+            The sum over the models of each node of the products of the
+            weights of their literals, indexed by the nodes.
+        """
+        kinds = self.kinds
+        values = self.values
+        children = self.children
+        offsets = self.offsets
+        counts: List[Any] = []
+        for node, kind in enumerate(kinds):
+            if kind == LITERAL:
+                literal = values[node]
+                count = positive[literal] if literal > 0 else negative[-literal]
+            elif kind == CONJUNCTION:
+                count = 1
+                for child in children[offsets[node] : offsets[node + 1]]:
+                    count *= counts[child]
+            else:
+                count = 0
+                for child in children[offsets[node] : offsets[node + 1]]:
+                    count += counts[child]
+            counts.append(count)
+        return counts
+
+    def is_satisfiable(
+        self, condition: Optional[Mapping[str, bool]] = None
+    ) -> bool:
+        """Checks if the compiled formula is satisfiable.
+
+        Parameters:
+            condition: the truth values of named variables to condition on, or
+                `None`.
+
+        Returns:
+            `True` if some model of the compiled formula agrees with the given
+            condition, `False` otherwise.
+        """
+        positive, negative = self._weights({}, condition)
+        kinds = self.kinds
+        values = self.values
+        children = self.children
+        offsets = self.offsets
+        satisfiable: List[bool] = []
+        for node, kind in enumerate(kinds):
+            if kind == LITERAL:
+                literal = values[node]
+                if literal > 0:
+                    satisfiable.append(bool(positive[literal]))
+                else:
+                    satisfiable.append(bool(negative[-literal]))
+                continue
+            node_children = children[offsets[node] : offsets[node + 1]]
+            if kind == CONJUNCTION:
+                satisfiable.append(
+                    all(satisfiable[child] for child in node_children)
+                )
+            else:
+                satisfiable.append(
+                    any(satisfiable[child] for child in node_children)
+                )
+        return satisfiable[-1]
+
+    def count_models(
+        self, condition: Optional[Mapping[str, bool]] = None
+    ) -> int:
+        """Counts the models of the compiled formula.
+
+        Parameters:
+            condition: the truth values of named variables to condition on, or
+                `None`.
+
+        Returns:
+            The number of models over the named variables of the compiled
+            formula that agree with the given condition.
+
+        Examples:
+            >>> compile_ddnnf(Formula.parse('(p|q)')).count_models()
+            3
+
+            >>> circuit = compile_ddnnf(Formula.parse('(p|q)'))
+            >>> circuit.count_models({'p': False})
+            1
+        """
+        return self._evaluate(*self._weights({}, condition))[-1]
+
+    def weighted_count(
+        self,
+        weights: Mapping[str, Tuple[Any, Any]],
+        condition: Optional[Mapping[str, bool]] = None,
+    ) -> Any:
+        """Computes the weighted model count of the compiled formula.
+
+        Parameters:
+            weights: the weights of the truth values `True` and `False` of
+                named variables, as numbers that can be added and multiplied,
+                such as `float` or `~fractions.Fraction`. Other variables weigh
+                1 either way.
+            condition: the truth values of named variables to condition on, or
+                `None`.
+
+        Returns:
+            The sum over the models of the compiled formula that agree with the
+            given condition of the products of the weights of their truth
+            values. If the weights of the truth values of each variable are
+            probabilities that sum to 1, this is the probability that the
+            compiled formula is true.
+
+        Examples:
+            >>> circuit = compile_ddnnf(Formula.parse('(p|q)'))
+            >>> circuit.weighted_count({'p': (0.5, 0.5), 'q': (0.25, 0.75)})
+            0.625
+        """
+        return self._evaluate(*self._weights(weights, condition))[-1]
+
+    def models(
+        self, condition: Optional[Mapping[str, bool]] = None
+    ) -> Iterator[Dict[str, bool]]:
+        """Enumerates the models of the compiled formula.
+
+        Each model is found from its index among the models, by following the
+        model counts of the nodes, in time linear in the size of the circuit.
+
+        Parameters:
+            condition: the truth values of named variables to condition on, or
+                `None`.
+
+        Returns:
+            An iterator over the models over the named variables of the
+            compiled formula that agree with the given condition.
+        """
+        counts = self._evaluate(*self._weights({}, condition))
+        kinds = self.kinds
+        values = self.values
+        children = self.children
+        offsets = self.offsets
+        names = self.names
+        for index in range(counts[-1]):
+            model = dict.fromkeys(names, False)
+            stack = [(len(kinds) - 1, index)]
+            while stack:
+                node, index = stack.pop()
+                kind = kinds[node]
+                if kind == LITERAL:
+                    literal = values[node]
+                    if abs(literal) <= len(names):
+                        model[names[abs(literal) - 1]] = literal > 0
+                elif kind == CONJUNCTION:
+                    # The index of a model of a conjunction is in mixed radix,
+                    # with the model counts of the children as the bases.
+                    for child in children[offsets[node] : offsets[node + 1]]:
+                        stack.append((child, index % counts[child]))
+                        index //= counts[child]
+                else:
+                    for child in children[offsets[node] : offsets[node + 1]]:
+                        if index < counts[child]:
+                            stack.append((child, index))
+                            break
+                        index -= counts[child]
+            yield model
+
+
+class _CircuitBuilder:
+    """A builder of a `DDNNF` that shares equal nodes and simplifies constants
+    away.
+
+    Attributes:
+        true (`int`): the node of the empty conjunction.
+        false (`int`): the node of the empty disjunction.
+    """
+
+    def __init__(self) -> None:
+        """Initializes a `_CircuitBuilder` with the constant nodes."""
+        self._kinds: List[int] = []
+        self._values: List[int] = []
+        self._children: List[Tuple[int, ...]] = []
+        self._nodes: Dict[Tuple[int, int, Tuple[int, ...]], int] = {}
+        self.true = self._node(CONJUNCTION, 0, ())
+        self.false = self._node(DISJUNCTION, 0, ())
+
+    def _node(self, kind: int, value: int, children: Tuple[int, ...]) -> int:
+        """Finds or adds the given node.
+
+        Parameters:
+            kind: the kind of the node.
+            value: the literal or decision variable of the node.
+            children: the children of the node.
+
+        Returns:
+            The index of the node.
+        """
+        key = (kind, value, children)
+        node = self._nodes.get(key)
+        if node is None:
+            node = len(self._kinds)
+            self._kinds.append(kind)
+            self._values.append(value)
+            self._children.append(children)
+            self._nodes[key] = node
+        return node
+
+    def literal(self, literal: int) -> int:
+        """Adds a literal node.
+
+        Parameters:
+            literal: the literal of the node.
+
+        Returns:
+            The index of the node.
+        """
+        return self._node(LITERAL, literal, ())
+
+    def conjunction(self, children: Sequence[int]) -> int:
+        """Adds a conjunction node.
+
+        Parameters:
+            children: the children of the node, which share no variables.
+
+        Returns:
+            The index of the node, or of its only child that is not true.
+        """
+        if self.false in children:
+            return self.false
+        remaining = tuple(sorted(set(children) - {self.true}))
+        if len(remaining) == 1:
+            return remaining[0]
+        return self._node(CONJUNCTION, 0, remaining)
+
+    def disjunction(self, variable: int, children: Sequence[int]) -> int:
+        """Adds a disjunction node.
+
+        Parameters:
+            variable: the variable that the children decide on.
+            children: the children of the node, which are mutually exclusive.
+
+        Returns:
+            The index of the node, or of its only child that is not false.
+        """
+        remaining = tuple(child for child in children if child != self.false)
+        if not remaining:
+            return self.false
+        if len(remaining) == 1:
+            return remaining[0]
+        return self._node(DISJUNCTION, variable, remaining)
+
+    def branch(
+        self, literals: Iterable[int], free: Iterable[int], parts: List[int]
+    ) -> int:
+        """Adds the conjunction of the given literals, free variables, and
+        compiled components.
+
+        Parameters:
+            literals: literals that hold.
+            free: variables that may take either truth value.
+            parts: the nodes of the compiled components.
+
+        Returns:
+            The index of the node of the conjunction.
+        """
+        children = [self.literal(literal) for literal in sorted(literals)]
+        for variable in sorted(free):
+            children.append(
+                self.disjunction(
+                    variable, (self.literal(variable), self.literal(-variable))
+                )
+            )
+        return self.conjunction(children + parts)
+
+    def build(self, root: int, names: Sequence[str], n_variables: int) -> DDNNF:
+        """Builds the circuit of the given node.
+
+        Parameters:
+            root: the node of the root of the circuit.
+            names: the variable names of the named variables.
+            n_variables: the number of variables, named or auxiliary.
+
+        Returns:
+            The circuit of the nodes reachable from the given root, renumbered
+            in post-order.
+        """
+        numbers: Dict[int, int] = {}
+        kinds: List[int] = []
+        values: List[int] = []
+        children: List[int] = []
+        offsets = [0]
+        # As in `~logic.propositions.syntax.Formula.postorder`, each expanded
+        # node is followed by a -1 marker, above which its children are pushed.
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                node = stack.pop()
+                numbers[node] = len(kinds)
+                kinds.append(self._kinds[node])
+                values.append(self._values[node])
+                children.extend(map(numbers.__getitem__, self._children[node]))
+                offsets.append(len(children))
+                continue
+            if node in numbers:
+                continue
+            stack.append(node)
+            stack.append(-1)
+            for child in reversed(self._children[node]):
+                if child not in numbers:
+                    stack.append(child)
+        return DDNNF(kinds, values, children, offsets, names, n_variables)
+
+
+def compile_ddnnf(formula: Formula) -> DDNNF:
+    """Compiles the given formula into a smooth decision-DNNF circuit.
+
+    The compiler runs `~logic.propositions.counting.search_components` over
+    the Tseitin encoding of the formula, and records the search as a circuit:
+    each branch on a variable becomes a disjunction that decides on it, of the
+    conjunctions of the literals that each truth value of the variable implies
+    and of the circuits of the components that remain. The circuit of each
+    component is cached, so that components that recur in other branches are
+    compiled once, and equal nodes are shared.
+
+    Parameters:
+        formula: formula to compile.
+
+    Returns:
+        A circuit whose models over its named variables, which are the
+        variable names of the given formula in alphabetical order, are the
+        models of the given formula.
+    """
+    # The Tseitin encoding extends each model of the formula uniquely.
+    database = tseitin(formula)
+    builder = _CircuitBuilder()
+    root = search_components(
+        database,
+        database.n_variables,
+        builder.branch,
+        builder.disjunction,
+        builder.false,
+    )
+    return builder.build(root, database.names, database.n_variables)
+
+
+def write_nnf(path: Union[str, os.PathLike], circuit: DDNNF) -> None:
+    """Writes the given circuit to the given file in the NNF format of the c2d
+    and d4 compilers.
+
+    The number of named variables and their names are written in comment
+    lines of the forms ``c names <count>`` and ``c var <number> <name>``
+    before the header, as by `~logic.propositions.dimacs.write_dimacs`, and
+    the nodes are written one per line.
+
+    Parameters:
+        path: path of the file to write.
+        circuit: circuit to write.
+    """
+    kinds = circuit.kinds
+    values = circuit.values
+    children = circuit.children
+    offsets = circuit.offsets
+    with open(path, "w") as file:
+        file.write("{} {}\n".format(NAMES_COMMENT, len(circuit.names)))
+        for number, name in enumerate(circuit.names, 1):
+            file.write("{} {} {}\n".format(NAME_COMMENT, number, name))
+        file.write(
+            "nnf {} {} {}\n".format(
+                len(circuit), len(children), circuit.n_variables
+            )
+        )
+        for node, kind in enumerate(kinds):
+            if kind == LITERAL:
+                file.write("L {}\n".format(values[node]))
+                continue
+            node_children = children[offsets[node] : offsets[node + 1]]
+            if kind == CONJUNCTION:
+                file.write("A {}".format(len(node_children)))
+            else:
+                file.write("O {} {}".format(values[node], len(node_children)))
+            file.write("".join(" " + str(child) for child in node_children))
+            file.write("\n")
+
+
+def read_nnf(path: Union[str, os.PathLike]) -> DDNNF:
+    """Reads a circuit from the given file in the NNF format of the c2d and d4
+    compilers.
+
+    Parameters:
+        path: path of the file to read, written by `write_nnf` or by a
+            compiler that writes smooth decision-DNNF circuits.
+
+    Returns:
+        The circuit of the given file. The named variables are the ones named
+        by comment lines of the form ``c var <number> <name>``, if there are
+        any or if a comment line of the form ``c names <count>`` declares
+        their number, or otherwise all variables, each named ``x`` followed by
+        its number.
+
+    Raises:
+        ValueError: if the given file is not in the NNF format.
+    """
+    names: Dict[int, str] = {}
+    n_names: Optional[int] = None
+    header: Optional[List[int]] = None
+    kinds: List[int] = []
+    values: List[int] = []
+    children: List[int] = []
+    offsets = [0]
+    with open(path) as file:
+        for line_number, line in enumerate(file, 1):
+            words = line.split()
+            if not words:
+                continue
+            if words[0] == "c":
+                if line.startswith(NAME_COMMENT) and len(words) == 4:
+                    names[int(words[2])] = words[3]
+                elif line.startswith(NAMES_COMMENT) and len(words) == 3:
+                    n_names = int(words[2])
+                continue
+            if header is None:
+                if len(words) != 4 or words[0] != "nnf":
+                    raise ValueError(
+                        "Expected an 'nnf' header in line {}".format(
+                            line_number
+                        )
+                    )
+                header = [int(word) for word in words[1:]]
+                continue
+            numbers = [int(word) for word in words[1:]]
+            if words[0] == "L" and len(numbers) == 1:
+                if not 0 < abs(numbers[0]) <= header[2]:
+                    raise ValueError(
+                        "Undeclared variable in line {}".format(line_number)
+                    )
+                kinds.append(LITERAL)
+                values.append(numbers[0])
+            elif words[0] == "A" and numbers and len(numbers) == numbers[0] + 1:
+                kinds.append(CONJUNCTION)
+                values.append(0)
+                children.extend(numbers[1:])
+            elif (
+                words[0] == "O"
+                and len(numbers) > 1
+                and len(numbers) == numbers[1] + 2
+            ):
+                kinds.append(DISJUNCTION)
+                values.append(numbers[0])
+                children.extend(numbers[2:])
+            else:
+                raise ValueError("Invalid node in line {}".format(line_number))
+            if not all(
+                0 <= child < len(offsets) - 1
+                for child in children[offsets[-1] :]
+            ):
+                raise ValueError("Invalid child in line {}".format(line_number))
+            offsets.append(len(children))
+    if header is None:
+        raise ValueError("Missing 'nnf' header")
+    if not kinds:
+        raise ValueError("Missing nodes")
+    if header[:2] != [len(kinds), len(children)]:
+        raise ValueError(
+            "Expected {} nodes and {} edges, found {} and {}".format(
+                header[0], header[1], len(kinds), len(children)
+            )
+        )
+    if not names and n_names is None:
+        names = {
+            number: "x" + str(number) for number in range(1, header[2] + 1)
+        }
+    if (
+        sorted(names) != list(range(1, len(names) + 1))
+        or n_names not in (None, len(names))
+        or len(names) > header[2]
+        or len(set(names.values())) < len(names)
+        or not all(map(is_variable, names.values()))
+    ):
+        raise ValueError("Invalid variable names")
+    return DDNNF(
+        kinds,
+        values,
+        children,
+        offsets,
+        [names[number] for number in range(1, len(names) + 1)],
+        header[2],
+    )
@@ -0,0 +1,158 @@
+"""Streaming reading and writing of clauses in the DIMACS CNF format."""
+
+import os
+from typing import Dict, List, Optional, Union
+
+from logic.propositions.syntax import Formula, is_variable
+from logic.propositions.cnf import ClauseDatabase, tseitin
+
+#: The prefix of the comment lines that name the variables of a DIMACS CNF
+#: file, each followed by the number of a variable and its variable name.
+NAME_COMMENT = "c var"
+
+#: The prefix of the comment line that precedes the names of the variables of
+#: a DIMACS CNF file, followed by the number of named variables, so that a file
+#: with no named variables is told apart from a file without names.
+NAMES_COMMENT = "c names"
+
+
+def write_dimacs(
+    path: Union[str, os.PathLike],
+    source: Union[Formula, ClauseDatabase],
+    polarity_aware: bool = False,
+) -> None:
+    """Writes the given clauses to the given file in the DIMACS CNF format.
+
+    The number of named variables is written in a comment line of the form
+    ``c names <count>``, and their names in comment lines of the form
+    ``c var <number> <name>``, before the header. The clauses are written one
+    per line, so memory usage does not grow with the size of the file.
+
+    Parameters:
+        path: path of the file to write.
+        source: clauses to write, or a formula to encode as clauses by
+            `~logic.propositions.cnf.tseitin` first. A formula that is a
+            conjunction of disjunctions of literals, such as the formulas
+            returned by
+            `~logic.propositions.reductions.graph3coloring_to_formula`, is
+            written as is, without auxiliary variables.
+        polarity_aware: whether to encode the given formula by the
+            Plaisted-Greenbaum encoding rather than the Tseitin encoding. The
+            Tseitin encoding is satisfied by exactly one extension of each
+            model of the formula, and thus preserves the number of models.
+    """
+    if isinstance(source, Formula):
+        source = tseitin(source, polarity_aware)
+    with open(path, "w") as file:
+        file.write("{} {}\n".format(NAMES_COMMENT, len(source.names)))
+        for number, name in enumerate(source.names, 1):
+            file.write("{} {} {}\n".format(NAME_COMMENT, number, name))
+        file.write("p cnf {} {}\n".format(source.n_variables, len(source)))
+        for clause in source:
+            file.write(" ".join(map(str, clause)))
+            file.write(" 0\n" if clause else "0\n")
+
+
+def read_dimacs(path: Union[str, os.PathLike]) -> ClauseDatabase:
+    """Reads clauses from the given file in the DIMACS CNF format.
+
+    The file is read one line at a time, and the clauses are loaded directly
+    into the flat arrays of a clause database, without building formulas.
+
+    Parameters:
+        path: path of the file to read.
+
+    Returns:
+        A clause database with the clauses and the number of variables of the
+        given file. The named variables are the ones named by comment lines of
+        the form ``c var <number> <name>``, if there are any or if a comment
+        line of the form ``c names <count>`` declares their number, or
+        otherwise all variables, each named ``x`` followed by its number.
+
+    Raises:
+        ValueError: if the given file is not in the DIMACS CNF format.
+    """
+    names: Dict[int, str] = {}
+    n_names: Optional[int] = None
+    database = None
+    clause: List[int] = []
+    with open(path) as file:
+        for line_number, line in enumerate(file, 1):
+            if line.startswith("%"):
+                # Some benchmark collections end their files this way.
+                break
+            if line.startswith("c"):
+                words = line.split()
+                if line.startswith(NAME_COMMENT) and len(words) == 4:
+                    names[int(words[2])] = words[3]
+                elif line.startswith(NAMES_COMMENT) and len(words) == 3:
+                    n_names = int(words[2])
+                continue
+            if database is None:
+                words = line.split()
+                if not words:
+                    continue
+                if len(words) != 4 or words[:2] != ["p", "cnf"]:
+                    raise ValueError(
+                        "Expected a 'p cnf' header in line {}".format(
+                            line_number
+                        )
+                    )
+                n_variables, n_clauses = int(words[2]), int(words[3])
+                if not names and n_names is None:
+                    names = {
+                        number: "x" + str(number)
+                        for number in range(1, n_variables + 1)
+                    }
+                if (
+                    sorted(names) != list(range(1, len(names) + 1))
+                    or n_names not in (None, len(names))
+                    or len(names) > n_variables
+                    or len(set(names.values())) < len(names)
+                    or not all(map(is_variable, names.values()))
+                ):
+                    raise ValueError(
+                        "Invalid variable names before line {}".format(
+                            line_number
+                        )
+                    )
+                database = ClauseDatabase(
+                    (names[number] for number in range(1, len(names) + 1)),
+                    n_variables,
+                )
+                continue
+            literals = list(map(int, line.split()))
+            if (
+                not clause
+                and literals
+                and literals.count(0) == 1
+                and literals[-1] == 0
+                and -n_variables <= min(literals)
+                and max(literals) <= n_variables
+            ):
+                # The common case of a single whole clause in a line.
+                literals.pop()
+                database.add_clause(literals)
+                continue
+            for literal in literals:
+                if literal == 0:
+                    database.add_clause(clause)
+                    clause.clear()
+                elif abs(literal) > n_variables:
+                    raise ValueError(
+                        "Undeclared variable {} in line {}".format(
+                            abs(literal), line_number
+                        )
+                    )
+                else:
+                    clause.append(literal)
+    if database is None:
+        raise ValueError("Missing 'p cnf' header")
+    if clause:
+        # The last clause may omit its terminating zero.
+        database.add_clause(clause)
+    if len(database) != n_clauses:
+        raise ValueError(
+            "Expected {} clauses, found {}".format(n_clauses, len(database))
+        )
+    return database
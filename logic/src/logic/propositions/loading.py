@@ -0,0 +1,121 @@
+"""Streaming ingestion of propositional formulas from files."""
+
+import mmap
+import os
+from typing import Callable, Iterator, Optional, Set, Tuple, Union
+
+from logic.propositions.syntax import Formula, ParseError
+
+#: A callback that is given the number of a line that is not a valid standard
+#: string representation of a formula, and the error found in that line.
+ErrorHandler = Callable[[int, ParseError], None]
+
+
+def _retain(formula: Formula, retained: Set[Formula]) -> None:
+    """Adds the given formula and all of its subformulas to the given set.
+
+    Parameters:
+        formula: formula to add.
+        retained: set to add to. Subformulas that are already in this set are
+            assumed to have all of their own subformulas in it as well.
+    """
+    stack = [formula]
+    while stack:
+        formula = stack.pop()
+        if formula in retained:
+            continue
+        retained.add(formula)
+        if formula.first is not None:
+            stack.append(formula.first)
+        if formula.second is not None:
+            stack.append(formula.second)
+
+
+def iter_formulas_in_buffer(
+    buffer: Union[bytes, mmap.mmap],
+    on_error: Optional[ErrorHandler] = None,
+    intern: bool = False,
+) -> Iterator[Tuple[int, Formula]]:
+    """Lazily parses the given buffer, which holds one standard string
+    representation of a formula per line.
+
+    Parameters:
+        buffer: buffer to parse, e.g., a memory-mapped file.
+        on_error: function to call for each nonblank line that is not a valid
+            standard string representation of a formula, or ``None`` to
+            silently skip such lines.
+        intern: whether to keep every subformula of every parsed formula alive
+            until the iteration is over, so that subformulas repeated across
+            lines are shared even if earlier formulas are no longer referenced
+            by the caller. Otherwise only the line being parsed is held in
+            memory.
+
+    Returns:
+        An iterator over pairs of the number of a line, counting from one, and
+        the formula that this line represents, in the order of the lines. Blank
+        lines are skipped.
+    """
+    retained: Set[Formula] = set()
+    size = len(buffer)
+    start = 0
+    line_number = 0
+    while start < size:
+        end = buffer.find(b"\n", start)
+        if end == -1:
+            end = size
+        line_number += 1
+        line = buffer[start:end].decode("latin-1").strip()
+        start = end + 1
+        if not line:
+            continue
+        formula = Formula.try_parse(line)
+        if isinstance(formula, ParseError):
+            if on_error is not None:
+                on_error(line_number, formula)
+            continue
+        if intern:
+            _retain(formula, retained)
+        yield line_number, formula
+
+
+def iter_formulas(
+    path: Union[str, os.PathLike],
+    on_error: Optional[ErrorHandler] = None,
+    intern: bool = False,
+) -> Iterator[Tuple[int, Formula]]:
+    """Lazily parses the given file, which holds one standard string
+    representation of a formula per line.
+
+    The file is memory-mapped rather than read, so memory usage does not grow
+    with the size of the file.
+
+    Parameters:
+        path: path of the file to parse.
+        on_error: function to call for each nonblank line that is not a valid
+            standard string representation of a formula, or ``None`` to
+            silently skip such lines.
+        intern: whether to keep every subformula of every parsed formula alive
+            until the iteration is over, so that subformulas repeated across
+            lines are shared.
+
+    Returns:
+        An iterator over pairs of the number of a line, counting from one, and
+        the formula that this line represents, in the order of the lines. Blank
+        lines are skipped.
+
+    Examples:
+        >>> errors = []
+        >>> for line_number, formula in iter_formulas(
+        ...     'formulas.txt', on_error=lambda *error: errors.append(error)
+        ... ):
+        ...     print(line_number, formula)
+        1 (p|~q)
+        3 ~x12
+        >>> errors
+        [(2, Unexpected symbol '&' at offset 3)]
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from iter_formulas_in_buffer(buffer, on_error, intern)
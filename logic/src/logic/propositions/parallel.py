@@ -0,0 +1,140 @@
+"""Parallel sweeps of the models of propositional formulas over a process
+pool."""
+
+from __future__ import annotations
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import Event
+from typing import Any, Optional, Sequence
+
+from logic.propositions.syntax import Formula
+from logic.propositions.arena import FormulaArena
+from logic.propositions.semantics import (
+    CHUNK_VARIABLES,
+    ModelSpace,
+    iter_truth_table,
+)
+
+#: The number of shards of the model space to sweep per worker process, so
+#: that workers that finish their shards early take over the remaining ones.
+SHARDS_PER_WORKER = 4
+
+#: The event that the worker processes of the current sweep poll for
+#: cancellation, set in each worker process by `_initialize_worker`.
+_cancelled: Any = None
+
+
+def _initialize_worker(cancelled: Any) -> None:
+    """Initializes a worker process of a sweep.
+
+    Parameters:
+        cancelled: event that is set once the sweep is decided.
+    """
+    global _cancelled
+    _cancelled = cancelled
+
+
+def _sweep_shard(
+    arena: FormulaArena,
+    variables: Sequence[str],
+    start: int,
+    stop: int,
+    value: bool,
+) -> Optional[bool]:
+    """Sweeps a shard of the models of a formula, in a worker process.
+
+    Parameters:
+        arena: the formula to sweep, in its compact representation.
+        variables: variable names over which the models are defined.
+        start: the number of the first model of the shard, in the order
+            returned by `~logic.propositions.semantics.all_models(variables)`.
+        stop: the number of the model following the last model of the shard.
+        value: truth value to search for.
+
+    Returns:
+        `True` if the formula has the given truth value in some model of the
+        shard, `False` if it does not, or `None` if the sweep was cancelled
+        before the shard was fully swept.
+    """
+    formula = arena.to_formula()
+    for width, table in iter_truth_table(
+        formula, variables, start=start, stop=stop
+    ):
+        if table != (0 if value else (1 << width) - 1):
+            return True
+        if _cancelled is not None and _cancelled.is_set():
+            return None
+    return False
+
+
+def search_truth_value(
+    formula: Formula,
+    value: bool,
+    workers: Optional[int] = None,
+    space: Optional[ModelSpace] = None,
+) -> bool:
+    """Checks in parallel if the given formula has the given truth value in
+    some model.
+
+    The models are partitioned by the values of a prefix of the variable names
+    into contiguous shards, which are swept by a pool of worker processes. The
+    formula is sent to the workers as a compact
+    `~logic.propositions.arena.FormulaArena`, and as soon as any worker finds a
+    model in which the formula has the given truth value, the remaining shards
+    are cancelled and the running workers stop after their current chunk of
+    models.
+
+    Parameters:
+        formula: formula to check.
+        value: truth value to search for.
+        workers: the number of worker processes, or `None` for the number of
+            processors of the machine.
+        space: models over (possibly a superset of) the variable names of the
+            given formula to search, or `None` to search all models over its
+            variable names.
+
+    Returns:
+        `True` if the given formula has the given truth value in some model of
+        the given space, `False` otherwise.
+    """
+    if space is None:
+        space = ModelSpace(sorted(formula.variables()))
+    assert formula.variables().issubset(space.variables)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    assert workers > 0
+    # Each shard fixes the values of the first prefix variable names, and,
+    # unless the space is smaller, covers whole chunks of models.
+    prefix = min(
+        (workers * SHARDS_PER_WORKER - 1).bit_length(),
+        max(len(space.variables) - CHUNK_VARIABLES, 0),
+    )
+    n_shards = 1 << prefix
+    arena = FormulaArena.from_formula(formula)
+    cancelled = Event()
+    with ProcessPoolExecutor(
+        min(workers, n_shards),
+        initializer=_initialize_worker,
+        initargs=(cancelled,),
+    ) as executor:
+        pending = set()
+        for k in range(n_shards):
+            shard = space.shard(k, n_shards)
+            pending.add(
+                executor.submit(
+                    _sweep_shard,
+                    arena,
+                    shard.variables,
+                    shard.start,
+                    shard.stop,
+                    value,
+                )
+            )
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if any(future.result() for future in done):
+                cancelled.set()
+                for future in pending:
+                    future.cancel()
+                return True
+    return False
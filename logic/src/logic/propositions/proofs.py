@@ -3,16 +3,17 @@
 from __future__ import annotations
 from typing import (
     AbstractSet,
+    Dict,
+    FrozenSet,
     List,
     Mapping,
     Optional,
     Sequence,
-    Set,
     Tuple,
     Union,
 )
 
-from logic.utils.logic_utils import frozen, memoized_parameterless_method
+from logic.utils.logic_utils import frozen, memoized_immutable_method
 from logic.propositions.syntax import *
 
 #: A mapping from variable names to formulas.
@@ -31,6 +32,13 @@ class InferenceRule:
         conclusion (`~propositions.syntax.Formula`): the conclusion of the rule.
     """
 
+    __slots__ = (
+        "assumptions",
+        "conclusion",
+        "_memoized_repr",
+        "_memoized_variables",
+    )
+
     assumptions: Tuple[Formula, ...]
     conclusion: Formula
 
@@ -41,10 +49,10 @@ class InferenceRule:
             assumptions: the assumptions for the rule.
             conclusion: the conclusion for the rule.
         """
-        self.assumptions = tuple(assumptions)
-        self.conclusion = conclusion
+        object.__setattr__(self, "assumptions", tuple(assumptions))
+        object.__setattr__(self, "conclusion", conclusion)
 
-    @memoized_parameterless_method
+    @memoized_immutable_method
     def __repr__(self) -> str:
         """Computes a string representation of the current inference rule.
 
@@ -89,9 +97,10 @@ class InferenceRule:
         return not self == other
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return hash((self.assumptions, self.conclusion))
 
-    def variables(self) -> Set[str]:
+    @memoized_immutable_method
+    def variables(self) -> FrozenSet[str]:
         """Finds all variable names in the current inference rule.
 
         Returns:
@@ -192,44 +201,27 @@ class InferenceRule:
             in fact not a specialization of `general`.
         """
         # TODO: Task 4.5b
-        # 1. Break them down by tree structure until one operand is a variable,
-        # then close that branch.
-        map1 = dict()
-
-        if is_variable(general.root):
-            map1 = {general.root: specialization}
-            return map1
-        elif is_constant(general.root):
-            if general.root == specialization.root:
-                return {}
-            else:
-                return None
-
-        if general.root == specialization.root:
-            if is_unary(general.root):
-                map2 = InferenceRule._formula_specialization_map(
-                    general.first, specialization.first
-                )
-                if map2 is not None:
-                    map1 = InferenceRule._merge_specialization_maps(map1, map2)
-                    return map1
-                else:
-                    return None
-            elif is_binary(general.root):
-                map2 = InferenceRule._formula_specialization_map(
-                    general.first, specialization.first
-                )
-                map3 = InferenceRule._formula_specialization_map(
-                    general.second, specialization.second
-                )
-                if map2 is not None and map3 is not None:
-                    map1 = InferenceRule._merge_specialization_maps(map1, map2)
-                    map1 = InferenceRule._merge_specialization_maps(map1, map3)
-                    return map1
-                else:
+        # Break both formulas down by tree structure, side by side, until the
+        # general one is a variable name, which is then mapped to the
+        # corresponding part of the specialization.
+        specialization_map: Dict[str, Formula] = {}
+        stack = [(general, specialization)]
+        while stack:
+            general, specialization = stack.pop()
+            if is_variable(general.root):
+                if (
+                    specialization_map.setdefault(general.root, specialization)
+                    != specialization
+                ):
                     return None
-        else:
-            return None
+            elif general.root != specialization.root:
+                return None
+            else:
+                if general.second is not None:
+                    stack.append((general.second, specialization.second))
+                if general.first is not None:
+                    stack.append((general.first, specialization.first))
+        return specialization_map
 
     def specialization_map(
         self, specialization: InferenceRule
@@ -289,8 +281,10 @@ class Proof:
         lines (`~typing.Tuple`\\[`Line`]): the lines of the proof.
     """
 
+    __slots__ = ("statement", "rules", "lines")
+
     statement: InferenceRule
-    rules: FronzenSet[InferenceRule]
+    rules: FrozenSet[InferenceRule]
     lines: Tuple[Proof.Line, ...]
 
     def __init__(
@@ -307,9 +301,9 @@ class Proof:
             rules: the allowed rules for the proof.
             lines: the lines for the proof.
         """
-        self.statement = statement
-        self.rules = frozenset(rules)
-        self.lines = tuple(lines)
+        object.__setattr__(self, "statement", statement)
+        object.__setattr__(self, "rules", frozenset(rules))
+        object.__setattr__(self, "lines", tuple(lines))
 
     @frozen
     class Line:
@@ -332,6 +326,8 @@ class Proof:
                 justified as an assumption of the proof.
         """
 
+        __slots__ = ("formula", "rule", "assumptions")
+
         formula: Formula
         rule: Optional[InferenceRule]
         assumptions: Optional[Tuple[int, ...]]
@@ -360,10 +356,13 @@ class Proof:
             assert (rule is None and assumptions is None) or (
                 rule is not None and assumptions is not None
             )
-            self.formula = formula
-            self.rule = rule
-            if assumptions is not None:
-                self.assumptions = tuple(assumptions)
+            object.__setattr__(self, "formula", formula)
+            object.__setattr__(self, "rule", rule)
+            object.__setattr__(
+                self,
+                "assumptions",
+                None if assumptions is None else tuple(assumptions),
+            )
 
         def __repr__(self) -> str:
             """Computes a string representation of the current line.
@@ -458,10 +457,7 @@ class Proof:
         # TODO: Task 4.6b
         line = self.lines[line_number]
         if Proof.Line.is_assumption(line):
-            return any(
-                str(line) == str(assumption)
-                for assumption in self.statement.assumptions
-            )
+            return line.formula in self.statement.assumptions
         else:
             rule_was_given = any(line.rule == rule for rule in self.rules)
             rule_matches_line = (
@@ -1,11 +1,12 @@
 """Reduction between computational search problems."""
 
 from __future__ import annotations
-from typing import AbstractSet, Mapping, Tuple, Union
+from typing import AbstractSet, Mapping, Optional, Tuple, Union
 from itertools import combinations
 
 from logic.propositions.syntax import *
 from logic.propositions.semantics import *
+from logic.propositions.sat import solve
 
 #: A graph on a vertex set of the form (1,...,`n_vertices`), represented by the
 #: number of vertices `n_vertices` and a set of edges over the vertices.
@@ -71,31 +72,24 @@ def graph3coloring_to_formula(graph: Graph) -> Formula:
     # TODO: Optional Task 2.10a
     (n_vertices, edges) = graph
     colors = ("1", "2", "3")
-    formula = None
+    clauses = []
 
     for node in range(1, n_vertices + 1):
         """
         Every vertex has some color
         """
         variables = ["x" + str(node) + color for color in colors]
-        nodeformula = Formula(variables[0])
-
-        for variable in variables[1:]:
-            nodeformula = Formula("|", nodeformula, Formula(variable))
+        clauses.append(
+            Formula.combine("|", [Formula(variable) for variable in variables])
+        )
 
         """
         No vertex has more than one colour
         """
         for i, j in combinations(variables, 2):
-            tempformula = Formula(
-                "|", Formula("~", Formula(i)), Formula("~", Formula(j))
+            clauses.append(
+                Formula("|", Formula("~", Formula(i)), Formula("~", Formula(j)))
             )
-            nodeformula = Formula("&", nodeformula, tempformula)
-
-        if not formula:
-            formula = nodeformula
-        else:
-            formula = Formula("&", formula, nodeformula)
 
     """
     Two vertices connected by an edge do not have the same color
@@ -106,17 +100,18 @@ def graph3coloring_to_formula(graph: Graph) -> Formula:
             ("x" + str(node_1) + color for color in colors),
         )
         for source, target in variables:
-            formula = Formula(
-                "&",
-                formula,
+            clauses.append(
                 Formula(
                     "|",
                     Formula("~", Formula(source)),
                     Formula("~", Formula(target)),
-                ),
+                )
             )
 
-    return formula
+    if not clauses:
+        # The empty conjunction of a graph without vertices.
+        return Formula("T")
+    return Formula.combine("&", clauses)
 
 
 def assignment_to_3coloring(
@@ -148,19 +143,47 @@ def assignment_to_3coloring(
     return mapping
 
 
-def tricolor_graph(graph: Graph) -> Union[Mapping[int, int], None]:
+def tricolor_graph(
+    graph: Graph,
+    space: Optional[ModelSpace] = None,
+    method: str = "truth_table",
+) -> Union[Mapping[int, int], None]:
     """Computes a 3-coloring of the given graph.
 
     Parameters:
         graph: graph to 3-color.
+        space: assignments to (possibly a superset of) the variable names of
+            the formula returned by `graph3coloring_to_formula(graph)` to
+            search, for example a shard of the assignments, or `None` to search
+            all assignments to them.
+        method: ``'truth_table'`` to check each assignment in the given space,
+            or ``'cdcl'`` to search for a satisfying assignment with the
+            conflict-driven clause-learning solver of `~logic.propositions.sat`,
+            in which case `space` is not supported.
 
     Returns:
-        An arbitrary 3-coloring o the given graph if it is 3-colorable.
-        `None` otherwise.
+        An arbitrary 3-coloring o the given graph if it is 3-colorable by a
+        satisfying assignment in the given space. `None` otherwise.
     """
     assert is_graph(graph)
     formula = graph3coloring_to_formula(graph)
-    for assignment in all_models(list(formula.variables())):
-        if evaluate(formula, assignment):
-            return assignment_to_3coloring(graph, assignment)
+    if method == "cdcl":
+        assert space is None
+        assignment = solve(formula)
+        if assignment is None:
+            return None
+        return assignment_to_3coloring(graph, assignment)
+    assert method == "truth_table"
+    if space is None:
+        space = ModelSpace(sorted(formula.variables()))
+    index = 0
+    for width, table in iter_truth_table(
+        formula, space.variables, start=space.start, stop=space.stop
+    ):
+        if table:
+            # The lowest set bit is the first satisfying assignment in the
+            # chunk.
+            index += (table & -table).bit_length() - 1
+            return assignment_to_3coloring(graph, space.model_at(index))
+        index += width
     return None
@@ -0,0 +1,397 @@
+"""Conflict-driven clause-learning satisfiability solving of propositional
+formulas."""
+
+from __future__ import annotations
+import heapq
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from logic.propositions.syntax import Formula
+from logic.propositions.cnf import tseitin
+
+#: The number of conflicts in the first run of the solver, which the Luby
+#: sequence scales to the numbers of conflicts of the later runs.
+RESTART_CONFLICTS = 100
+
+#: The factor by which the activities of the variables decay at each conflict.
+ACTIVITY_DECAY = 0.95
+
+#: The number of learned clauses above which the least useful ones are deleted
+#: on the next restart, for instances with few clauses.
+MIN_LEARNED_CLAUSES = 2000
+
+#: The literal block distance up to which learned clauses are never deleted.
+GLUE_DISTANCE = 2
+
+
+def _luby(index: int) -> int:
+    """Computes an element of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, ....
+
+    Parameters:
+        index: the index of the element to compute, counted from zero.
+
+    Returns:
+        The element with the given index.
+    """
+    size, power = 1, 0
+    while size < index + 1:
+        power += 1
+        size = 2 * size + 1
+    while size - 1 != index:
+        size = (size - 1) >> 1
+        power -= 1
+        index %= size
+    return 1 << power
+
+
+class Solver:
+    """A conflict-driven clause-learning solver for the satisfiability of sets
+    of clauses.
+
+    Variables are numbered from 1, and a clause is a sequence of nonzero
+    integers, each of which is a variable or the negation of a variable, as in
+    the DIMACS CNF format. The solver propagates units through two watched
+    literals per clause, branches on the variable with the highest decaying
+    activity in the conflicts, learns the first-UIP clause of each conflict,
+    restarts according to the Luby sequence, and deletes the learned clauses
+    with the highest literal block distance on restarts.
+
+    Internally, the literal of variable `v` is ``2 * (v - 1)`` and its negation
+    is ``2 * (v - 1) + 1``.
+
+    Attributes:
+        n_variables (`int`): the number of variables.
+        conflicts (`int`): the number of conflicts encountered so far.
+        decisions (`int`): the number of decisions taken so far.
+    """
+
+    def __init__(self, n_variables: int, clauses: Iterable[Sequence[int]]):
+        """Initializes a `Solver` from the clauses to satisfy.
+
+        Parameters:
+            n_variables: the number of variables.
+            clauses: the clauses to satisfy, over the variables 1 to
+                `n_variables`.
+        """
+        self.n_variables = n_variables
+        self.conflicts = 0
+        self.decisions = 0
+        #: The value of each literal: 1 if true, -1 if false, 0 if unassigned.
+        self._values = [0] * (2 * n_variables)
+        self._levels = [0] * n_variables
+        self._reasons: List[Optional[List[int]]] = [None] * n_variables
+        self._phases = [False] * n_variables
+        self._activities = [0.0] * n_variables
+        self._increment = 1.0
+        self._heap = [(0.0, variable) for variable in range(n_variables)]
+        self._seen = [False] * n_variables
+        self._watches: List[List[List[int]]] = [
+            [] for _ in range(2 * n_variables)
+        ]
+        self._trail: List[int] = []
+        self._trail_limits: List[int] = []
+        self._head = 0
+        self._learned: List[Tuple[int, List[int]]] = []
+        self._max_learned = MIN_LEARNED_CLAUSES
+        self._consistent = True
+        for clause in clauses:
+            self._add_clause(clause)
+
+    def _add_clause(self, clause: Sequence[int]) -> None:
+        """Adds an input clause to the solver, before solving.
+
+        Parameters:
+            clause: clause to add.
+        """
+        literals = set()
+        for literal in clause:
+            assert literal != 0 and abs(literal) <= self.n_variables
+            literals.add(
+                2 * (literal - 1) if literal > 0 else 2 * (-literal - 1) + 1
+            )
+        if any(literal ^ 1 in literals for literal in literals):
+            return
+        values = self._values
+        if any(values[literal] == 1 for literal in literals):
+            return
+        literals = [literal for literal in literals if values[literal] == 0]
+        if not literals:
+            self._consistent = False
+        elif len(literals) == 1:
+            self._assign(literals[0], None)
+            if self._propagate() is not None:
+                self._consistent = False
+        else:
+            self._watches[literals[0]].append(literals)
+            self._watches[literals[1]].append(literals)
+
+    def _assign(self, literal: int, reason: Optional[List[int]]) -> None:
+        """Makes the given literal true at the current decision level.
+
+        Parameters:
+            literal: unassigned literal to make true.
+            reason: the clause that implies the given literal, with the literal
+                first, or `None` for a decision or a unit.
+        """
+        self._values[literal] = 1
+        self._values[literal ^ 1] = -1
+        variable = literal >> 1
+        self._levels[variable] = len(self._trail_limits)
+        self._reasons[variable] = reason
+        self._trail.append(literal)
+
+    def _propagate(self) -> Optional[List[int]]:
+        """Assigns the literals implied by unit propagation of the assigned
+        literals not yet propagated.
+
+        Returns:
+            A clause all of whose literals are false, or `None` if propagation
+            ended without a conflict.
+        """
+        values = self._values
+        watches = self._watches
+        trail = self._trail
+        while self._head < len(trail):
+            false_literal = trail[self._head] ^ 1
+            self._head += 1
+            watching = watches[false_literal]
+            kept = []
+            for index, clause in enumerate(watching):
+                if not clause:
+                    # A deleted learned clause.
+                    continue
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], false_literal
+                first = clause[0]
+                if values[first] == 1:
+                    kept.append(clause)
+                    continue
+                for position in range(2, len(clause)):
+                    literal = clause[position]
+                    if values[literal] != -1:
+                        clause[1] = literal
+                        clause[position] = false_literal
+                        watches[literal].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if values[first] == -1:
+                        kept.extend(watching[index + 1 :])
+                        watches[false_literal] = kept
+                        self._head = len(trail)
+                        return clause
+                    self._assign(first, clause)
+            watches[false_literal] = kept
+        return None
+
+    def _bump(self, variable: int) -> None:
+        """Increases the activity of the given variable.
+
+        Parameters:
+            variable: variable that took part in a conflict.
+        """
+        activities = self._activities
+        activities[variable] += self._increment
+        if activities[variable] > 1e100:
+            for other in range(self.n_variables):
+                activities[other] *= 1e-100
+            self._increment *= 1e-100
+            self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        """Rebuilds the heap of unassigned variables from their activities."""
+        values = self._values
+        self._heap = [
+            (-activity, variable)
+            for variable, activity in enumerate(self._activities)
+            if values[2 * variable] == 0
+        ]
+        heapq.heapify(self._heap)
+
+    def _analyze(self, conflict: List[int]) -> Tuple[List[int], int]:
+        """Learns the first-UIP clause of the given conflict.
+
+        Parameters:
+            conflict: clause all of whose literals are false.
+
+        Returns:
+            The learned clause, with its only literal of the current decision
+            level first and a literal of the highest other level second, and
+            the decision level to backtrack to.
+        """
+        levels = self._levels
+        reasons = self._reasons
+        seen = self._seen
+        trail = self._trail
+        level = len(self._trail_limits)
+        learned = [0]
+        pending = 0
+        index = len(trail) - 1
+        clause = conflict
+        start = 0
+        while True:
+            for position in range(start, len(clause)):
+                literal = clause[position]
+                variable = literal >> 1
+                if not seen[variable] and levels[variable] > 0:
+                    seen[variable] = True
+                    self._bump(variable)
+                    if levels[variable] == level:
+                        pending += 1
+                    else:
+                        learned.append(literal)
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            literal = trail[index]
+            index -= 1
+            variable = literal >> 1
+            seen[variable] = False
+            pending -= 1
+            if pending == 0:
+                break
+            # The implied literal of a reason is its first literal.
+            clause = reasons[variable]  # type: ignore[assignment]
+            start = 1
+        learned[0] = literal ^ 1
+        for literal in learned[1:]:
+            seen[literal >> 1] = False
+        if len(learned) == 1:
+            return learned, 0
+        highest = max(
+            range(1, len(learned)), key=lambda i: levels[learned[i] >> 1]
+        )
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, levels[learned[1] >> 1]
+
+    def _backtrack(self, level: int) -> None:
+        """Unassigns the literals of the decision levels above the given one.
+
+        Parameters:
+            level: decision level to backtrack to.
+        """
+        if len(self._trail_limits) <= level:
+            return
+        values = self._values
+        activities = self._activities
+        phases = self._phases
+        heap = self._heap
+        start = self._trail_limits[level]
+        for literal in self._trail[start:]:
+            values[literal] = values[literal ^ 1] = 0
+            variable = literal >> 1
+            phases[variable] = literal & 1 == 0
+            heapq.heappush(heap, (-activities[variable], variable))
+        del self._trail[start:]
+        del self._trail_limits[level:]
+        self._head = start
+        if len(heap) > 4 * self.n_variables:
+            self._rebuild_heap()
+
+    def _decide(self) -> bool:
+        """Assigns the unassigned variable of the highest activity, to its
+        last assigned truth value.
+
+        Returns:
+            `False` if all variables are assigned, `True` otherwise.
+        """
+        values = self._values
+        heap = self._heap
+        while heap:
+            variable = heapq.heappop(heap)[1]
+            if values[2 * variable] == 0:
+                self.decisions += 1
+                self._trail_limits.append(len(self._trail))
+                self._assign(
+                    2 * variable + (0 if self._phases[variable] else 1), None
+                )
+                return True
+        return False
+
+    def _reduce(self) -> None:
+        """Deletes the half of the learned clauses with the highest literal
+        block distances, at decision level zero, except for glue clauses."""
+        self._learned.sort(key=lambda learned: learned[0])
+        half = len(self._learned) // 2
+        kept = self._learned[:half]
+        for distance, clause in self._learned[half:]:
+            if distance <= GLUE_DISTANCE:
+                kept.append((distance, clause))
+            else:
+                # Watch lists drop cleared clauses lazily.
+                clause.clear()
+        self._learned = kept
+        self._max_learned = int(self._max_learned * 1.1)
+
+    def solve(self) -> Optional[List[bool]]:
+        """Searches for an assignment that satisfies all clauses of the solver.
+
+        Returns:
+            The truth values of the variables 1 to `n_variables`, in order, in
+            an assignment that satisfies all clauses, or `None` if no such
+            assignment exists.
+        """
+        if not self._consistent or self._propagate() is not None:
+            self._consistent = False
+            return None
+        restarts = 0
+        limit = RESTART_CONFLICTS
+        while True:
+            conflict = self._propagate()
+            if conflict is None:
+                if not self._decide():
+                    values = self._values
+                    return [
+                        values[2 * variable] == 1
+                        for variable in range(self.n_variables)
+                    ]
+                continue
+            self.conflicts += 1
+            limit -= 1
+            if not self._trail_limits:
+                self._consistent = False
+                return None
+            learned, level = self._analyze(conflict)
+            self._backtrack(level)
+            if len(learned) == 1:
+                self._assign(learned[0], None)
+            else:
+                levels = self._levels
+                distance = len({levels[literal >> 1] for literal in learned})
+                self._watches[learned[0]].append(learned)
+                self._watches[learned[1]].append(learned)
+                self._learned.append((distance, learned))
+                self._assign(learned[0], learned)
+            self._increment /= ACTIVITY_DECAY
+            if limit <= 0:
+                restarts += 1
+                limit = RESTART_CONFLICTS * _luby(restarts)
+                self._backtrack(0)
+                if len(self._learned) > self._max_learned:
+                    self._reduce()
+
+
+def solve(formula: Formula) -> Optional[Dict[str, bool]]:
+    """Searches for a model of the given formula with a conflict-driven
+    clause-learning solver.
+
+    The formula is first encoded as clauses by the Plaisted-Greenbaum encoding
+    of `~logic.propositions.cnf.tseitin`.
+
+    Parameters:
+        formula: formula to solve.
+
+    Returns:
+        A model over the variable names of the given formula in which the
+        formula is true, or `None` if the formula is not satisfiable.
+
+    Examples:
+        >>> solve(Formula.parse('((p->q)&p)'))
+        {'p': True, 'q': True}
+
+        >>> solve(Formula.parse('(p&~p)')) is None
+        True
+    """
+    database = tseitin(formula, polarity_aware=True)
+    values = Solver(database.n_variables, database).solve()
+    if values is None:
+        return None
+    return database.decode(values)
@@ -1,22 +1,335 @@
 """Semantic analysis of propositional-logic constructs."""
 
-from typing import AbstractSet, Iterable, Iterator, Mapping, Sequence, Tuple
-from itertools import product
-
-from logic.propositions.syntax import (
-    is_variable,
-    Formula,
-    is_constant,
-    is_binary,
-    is_unary,
+from __future__ import annotations
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
 )
+from weakref import WeakKeyDictionary
+
+from logic.utils.logic_utils import frozen
+from logic.propositions.syntax import is_variable, Formula
 from logic.propositions.proofs import InferenceRule
+from logic.propositions.sat import solve
+from logic.propositions.bdd import BDDManager
+from logic.propositions.symbols import (
+    AND,
+    F,
+    IFF,
+    IMPLIES,
+    NAND,
+    NOR,
+    NOT,
+    OPERATIONS,
+    OR,
+    T,
+    VARIABLE,
+    XOR,
+    SymbolTable,
+)
 
 #: A model for propositional-logic formulas, a mapping from variable names to
 #: truth values
 Model = Mapping[str, bool]
 
 
+@frozen
+class BitModel(Mapping[str, bool]):
+    """An immutable model over a sequence of variable names, stored as a single
+    integer with one bit per variable name.
+
+    The model with `bits` equal to `m` over some variable names is the `m`-th
+    model returned by `all_models` over them, so the first variable name
+    corresponds to the most significant bit.
+
+    Attributes:
+        variables (`~typing.Tuple`\\[`str`, ...]): the variable names over which
+            the model is defined.
+        bits (`int`): the truth values of the variable names, with the value of
+            the last variable name in the least significant bit.
+    """
+
+    __slots__ = ("variables", "bits", "_symbols")
+
+    variables: Tuple[str, ...]
+    bits: int
+    # The variable names numbered by the bits that hold their truth values,
+    # from the least significant one.
+    _symbols: SymbolTable
+
+    def __init__(self, variables: Sequence[str], bits: int):
+        """Initializes a `BitModel` from its variable names and truth values.
+
+        Parameters:
+            variables: the distinct variable names over which the model is
+                defined.
+            bits: the truth values of the variable names, with the value of
+                the last variable name in the least significant bit.
+        """
+        variables = tuple(variables)
+        for variable in variables:
+            assert is_variable(variable)
+        assert 0 <= bits < 1 << len(variables)
+        object.__setattr__(self, "variables", variables)
+        object.__setattr__(self, "bits", bits)
+        object.__setattr__(self, "_symbols", SymbolTable(variables[::-1]))
+
+    def _with_bits(self, bits: int) -> BitModel:
+        """Constructs a model over the same variable names as the current one,
+        sharing the lookup tables of the current model.
+
+        Parameters:
+            bits: the truth values of the variable names of the new model.
+
+        Returns:
+            The new model.
+        """
+        model = object.__new__(BitModel)
+        object.__setattr__(model, "variables", self.variables)
+        object.__setattr__(model, "bits", bits)
+        object.__setattr__(model, "_symbols", self._symbols)
+        return model
+
+    def __getitem__(self, variable: str) -> bool:
+        """Looks up the truth value of the given variable name.
+
+        Parameters:
+            variable: variable name over which the current model is defined.
+
+        Returns:
+            The truth value of the given variable name in the current model.
+        """
+        return self.bits >> self._symbols.ids[variable] & 1 == 1
+
+    def __contains__(self, variable: object) -> bool:
+        return variable in self._symbols.ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.variables)
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    def __repr__(self) -> str:
+        """Computes the string representation of the current model.
+
+        Returns:
+            The string representation of the dictionary with the same items as
+            the current model.
+        """
+        return repr(dict(self.items()))
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the current model with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is a mapping with the same items as the
+            current model, `False` otherwise.
+        """
+        if isinstance(other, BitModel) and self.variables == other.variables:
+            return self.bits == other.bits
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        """Compares the current model with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is not a mapping with the same items as
+            the current model, `False` otherwise.
+        """
+        return not self == other
+
+
+@frozen
+class ModelSpace:
+    """An immutable, random-access range of the models over a sequence of
+    variable names, in the order returned by `all_models` over them.
+
+    The model number `i` of the full space over some variable names is the
+    model with `bits` equal to `i`, so any model, and any contiguous range of
+    models, is found without enumerating the models that precede it. A space
+    can thus be split into shards that are swept independently, for example by
+    different processes.
+
+    Attributes:
+        variables (`~typing.Tuple`\\[`str`, ...]): the variable names over which
+            the models of the space are defined.
+        start (`int`): the number of the first model of the space, in the order
+            returned by `all_models(variables)`.
+        stop (`int`): the number of the model following the last model of the
+            space, in the order returned by `all_models(variables)`.
+    """
+
+    __slots__ = ("variables", "start", "stop", "_first")
+
+    variables: Tuple[str, ...]
+    start: int
+    stop: int
+    _first: BitModel
+
+    def __init__(
+        self,
+        variables: Sequence[str],
+        start: int = 0,
+        stop: Optional[int] = None,
+    ):
+        """Initializes a `ModelSpace` from its variable names and range.
+
+        Parameters:
+            variables: the distinct variable names over which the models of the
+                space are defined.
+            start: the number of the first model of the space, in the order
+                returned by `all_models(variables)`.
+            stop: the number of the model following the last model of the
+                space, in the order returned by `all_models(variables)`, or
+                `None` to continue up to the last model over the given variable
+                names.
+        """
+        first = BitModel(variables, 0)
+        if stop is None:
+            stop = 1 << len(first.variables)
+        assert 0 <= start <= stop <= 1 << len(first.variables)
+        object.__setattr__(self, "variables", first.variables)
+        object.__setattr__(self, "start", start)
+        object.__setattr__(self, "stop", stop)
+        object.__setattr__(self, "_first", first)
+
+    def __repr__(self) -> str:
+        """Computes a string representation of the current space.
+
+        Returns:
+            A string representation of the current space.
+        """
+        return "ModelSpace({}, {}, {})".format(
+            list(self.variables), self.start, self.stop
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the current space with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is a `ModelSpace` object with the same
+            variable names and range as the current space, `False` otherwise.
+        """
+        return (
+            isinstance(other, ModelSpace)
+            and self.variables == other.variables
+            and self.start == other.start
+            and self.stop == other.stop
+        )
+
+    def __ne__(self, other: object) -> bool:
+        """Compares the current space with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is not a `ModelSpace` object or does not
+            equal the current space, `False` otherwise.
+        """
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash((self.variables, self.start, self.stop))
+
+    def __len__(self) -> int:
+        """Counts the models of the current space.
+
+        Returns:
+            The number of models in the current space.
+        """
+        return self.stop - self.start
+
+    def __iter__(self) -> Iterator[BitModel]:
+        """Enumerates the models of the current space.
+
+        Returns:
+            An iterator over the models of the current space, in the order
+            returned by `all_models`.
+        """
+        first = self._first
+        return (first._with_bits(bits) for bits in range(self.start, self.stop))
+
+    def model_at(self, index: int) -> BitModel:
+        """Finds the model with the given number in the current space.
+
+        Parameters:
+            index: number of the model to find, counted from zero for the first
+                model of the current space.
+
+        Returns:
+            The model with the given number in the current space.
+
+        Examples:
+            >>> ModelSpace(['p', 'q']).model_at(2)
+            {'p': True, 'q': False}
+        """
+        assert 0 <= index < self.stop - self.start
+        return self._first._with_bits(self.start + index)
+
+    def slice(self, start: int, stop: int) -> ModelSpace:
+        """Restricts the current space to a contiguous range of its models.
+
+        Parameters:
+            start: the number of the first model of the range, counted from
+                zero for the first model of the current space.
+            stop: the number of the model following the last model of the
+                range, counted from zero for the first model of the current
+                space.
+
+        Returns:
+            The space of the models of the current space with the numbers
+            `start` up to, but not including, `stop`.
+        """
+        assert 0 <= start <= stop <= self.stop - self.start
+        return ModelSpace(self.variables, self.start + start, self.start + stop)
+
+    def shard(self, k: int, of_n: int) -> ModelSpace:
+        """Splits the current space into contiguous shards of nearly equal
+        sizes, and finds one of them.
+
+        Parameters:
+            k: the number of the shard to find, counted from zero.
+            of_n: the positive number of shards to split into.
+
+        Returns:
+            The `k`-th of `of_n` shards whose concatenation, in order, is the
+            current space, and whose sizes differ by at most one.
+
+        Examples:
+            >>> [len(ModelSpace(['p', 'q', 'r']).shard(k, 3)) for k in range(3)]
+            [2, 3, 3]
+        """
+        assert 0 <= k < of_n
+        size = self.stop - self.start
+        return self.slice(size * k // of_n, size * (k + 1) // of_n)
+
+
+#: A formula compiled by `compile_formula`, a function from a sequence of
+#: truth values, or from an integer that encodes them, to a truth value.
+CompiledFormula = Callable[[Union[Sequence[bool], int]], bool]
+
+
 def is_model(model: Model) -> bool:
     """Checks if the given dictionary is a model over some set of variable
     names.
@@ -65,47 +378,127 @@ def evaluate(formula: Formula, model: Model) -> bool:
         >>> evaluate(Formula.parse('~(p&q76)'), {'p': True, 'q76': True})
         False
     """
+    if isinstance(model, BitModel):
+        # The model was validated upon construction. A single model is
+        # evaluated on its bits without compiling the formula, which pays off
+        # only over many models, as in `truth_values`.
+        assert formula.variables().issubset(model._symbols.ids)
+        return model._symbols.evaluate(formula, model.bits)
     assert is_model(model)
     assert formula.variables().issubset(variables(model))
     # TODO: Task 2.1
-    root = formula.root
-    if is_constant(root):
-        return formula.root == "T"
-    elif is_variable(root):
-        return model[root]
-    elif is_unary(root):
-        return not evaluate(formula.first, model)
-    elif is_binary(root):
-        if root == "&":
-            return evaluate(formula.first, model) and evaluate(
-                formula.second, model
-            )
-        elif root == "|":
-            return evaluate(formula.first, model) or evaluate(
-                formula.second, model
-            )
-        elif root == "->":
-            return not evaluate(formula.first, model) or evaluate(
-                formula.second, model
-            )
-        elif root == "-&":
-            return not (
-                evaluate(formula.first, model)
-                and evaluate(formula.second, model)
-            )
-        elif root == "-|":
-            return not (
-                evaluate(formula.first, model)
-                or evaluate(formula.second, model)
-            )
-        elif root == "+":
-            return evaluate(formula.first, model) != evaluate(
-                formula.second, model
-            )
-        elif root == "<->":
-            return evaluate(formula.first, model) == evaluate(
-                formula.second, model
+
+    def evaluate_root(
+        formula: Formula, first: Optional[bool], second: Optional[bool]
+    ) -> bool:
+        opcode = formula.opcode
+        if opcode == VARIABLE:
+            return model[formula.root]
+        elif opcode == T:
+            return True
+        elif opcode == F:
+            return False
+        return OPERATIONS[opcode](first, second, True)
+
+    return formula.fold(evaluate_root)
+
+
+#: The Python expressions that compute the truth value of each operator, as
+#: ``0`` or ``1``, from those of its operands.
+_COMPILED_OPERATORS: Mapping[int, str] = {
+    NOT: "{0} ^ 1",
+    AND: "{0} & {1}",
+    OR: "{0} | {1}",
+    IMPLIES: "{0} ^ 1 | {1}",
+    XOR: "{0} ^ {1}",
+    IFF: "{0} ^ {1} ^ 1",
+    NAND: "{0} & {1} ^ 1",
+    NOR: "({0} | {1}) ^ 1",
+}
+
+#: The largest number of variable orders for which `compile_formula` caches
+#: the functions compiled for each formula.
+COMPILED_ORDERS = 8
+
+#: The functions compiled by `compile_formula` for each live formula, keyed by
+#: the variable orders they were compiled for, from the least recently used.
+_compiled_formulas: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def compile_formula(
+    formula: Formula, variable_order: Sequence[str]
+) -> CompiledFormula:
+    """Compiles the given formula into a Python function that calculates its
+    truth value.
+
+    The generated function computes each distinct subformula once, into a
+    local variable, without any dispatch on operators. The functions compiled
+    for the `COMPILED_ORDERS` most recently used variable orders of each
+    formula are cached for as long as the formula is alive.
+
+    Parameters:
+        formula: formula to compile.
+        variable_order: variable names, including all those of the given
+            formula, in the order in which the compiled function takes their
+            truth values.
+
+    Returns:
+        A function that takes either a sequence of truth values for the given
+        variable names, in order, or an integer whose bit number `i` is the
+        truth value of the variable name number `i`, and returns the truth
+        value of the given formula in that model.
+
+    Examples:
+        >>> function = compile_formula(Formula.parse('~(p&q76)'), ['q76', 'p'])
+        >>> function((False, True)), function(0b11)
+        (True, False)
+    """
+    variable_order = tuple(variable_order)
+    compiled = _compiled_formulas.setdefault(formula, {})
+    function = compiled.pop(variable_order, None)
+    if function is not None:
+        compiled[variable_order] = function
+        return function
+    assert formula.variables().issubset(variable_order)
+    arguments = ["v" + str(index) for index in range(len(variable_order))]
+    arguments_of = dict(zip(variable_order, arguments))
+    lines = ["def compiled(model):"]
+    if arguments:
+        lines.append("    if model.__class__ is int:")
+        lines.extend(
+            "        {} = model >> {} & 1".format(argument, index)
+            for index, argument in enumerate(arguments)
+        )
+        lines.append("    else:")
+        lines.append("        ({},) = model".format(", ".join(arguments)))
+    # The expression computing each distinct subformula, keyed by identity.
+    names: Dict[int, str] = {}
+    for node in formula.postorder():
+        if node.opcode == VARIABLE:
+            names[id(node)] = arguments_of[node.root]
+        elif node.opcode == T:
+            names[id(node)] = "1"
+        elif node.opcode == F:
+            names[id(node)] = "0"
+        else:
+            name = "n" + str(len(names))
+            lines.append(
+                "    {} = {}".format(
+                    name,
+                    _COMPILED_OPERATORS[node.opcode].format(
+                        names[id(node.first)], names.get(id(node.second))
+                    ),
+                )
             )
+            names[id(node)] = name
+    lines.append("    return {} == 1".format(names[id(formula)]))
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    function = namespace["compiled"]
+    if len(compiled) >= COMPILED_ORDERS:
+        del compiled[next(iter(compiled))]
+    compiled[variable_order] = function
+    return function
 
 
 def all_models(variables: Sequence[str]) -> Iterable[Model]:
@@ -131,10 +524,8 @@ def all_models(variables: Sequence[str]) -> Iterable[Model]:
     for v in variables:
         assert is_variable(v)
     # TODO: Task 2.2
-    return (
-        ({tuple(variables)[j]: i[j] for j in range(len(i))})
-        for i in product({False, True}, repeat=len(variables))
-    )
+    first = BitModel(variables, 0)
+    return (first._with_bits(bits) for bits in range(1 << len(variables)))
 
 
 def truth_values(formula: Formula, models: Iterable[Model]) -> Iterable[bool]:
@@ -155,7 +546,449 @@ def truth_values(formula: Formula, models: Iterable[Model]) -> Iterable[bool]:
         [True, True, True, False]
     """
     # TODO: Task 2.3
-    return (evaluate(formula, model) for model in models)
+    variable_order = sorted(formula.variables())
+    function = None
+    # The bit models of a sweep share their symbol table, so the function
+    # compiled for the table of the last one is kept at hand.
+    symbols = None
+    for model in models:
+        if isinstance(model, BitModel):
+            if model._symbols is not symbols:
+                symbols = model._symbols
+                bit_function = compile_formula(formula, symbols.names)
+            yield bit_function(model.bits)
+        else:
+            if function is None:
+                function = compile_formula(formula, variable_order)
+            yield function([model[variable] for variable in variable_order])
+
+
+def gray_code_truth_values(
+    formula: Formula, variables: Sequence[str]
+) -> Iterator[Tuple[int, bool]]:
+    """Calculates the truth value of the given formula in every model over the
+    given variable names, visiting the models in Gray-code order.
+
+    Consecutive models in Gray-code order differ in the truth value of a single
+    variable name, so after the first model only the subformulas on the paths
+    from the flipped variable name to the root are recomputed, by a function
+    generated for each variable name as in `compile_formula`. For formulas
+    whose variable names occur locally, this takes time proportional to the
+    depth of the formula per model rather than to its size.
+
+    Parameters:
+        formula: formula to calculate the truth values of.
+        variables: variable names, including all those of the given formula,
+            over which to calculate the truth values.
+
+    Returns:
+        An iterator over pairs of the index of a model in the order returned by
+        `all_models(variables)`, and the truth value of the given formula in
+        that model, covering each model once.
+
+    Examples:
+        >>> list(gray_code_truth_values(Formula.parse('(p->q)'), ['p', 'q']))
+        [(0, True), (1, True), (3, True), (2, False)]
+    """
+    assert formula.variables().issubset(variables)
+    program = formula.postorder()
+    indices = {id(node): index for index, node in enumerate(program)}
+    # The statement that recomputes each subformula in a list of the truth
+    # values of all subformulas, and the subformulas whose operand it is.
+    statements: List[str] = []
+    parents: List[List[int]] = [[] for _ in program]
+    leaves: Dict[str, int] = {}
+    for index, node in enumerate(program):
+        if node.opcode == VARIABLE:
+            leaves[node.root] = index
+            statements.append("")
+        elif node.opcode == T or node.opcode == F:
+            statements.append(
+                "    v[{}] = {}".format(index, int(node.opcode == T))
+            )
+        else:
+            first = indices[id(node.first)]
+            second = indices.get(id(node.second), -1)
+            statements.append(
+                "    v[{}] = {}".format(
+                    index,
+                    _COMPILED_OPERATORS[node.opcode].format(
+                        "v[{}]".format(first), "v[{}]".format(second)
+                    ),
+                )
+            )
+            parents[first].append(index)
+            if second >= 0 and second != first:
+                parents[second].append(index)
+    lines = ["def initial(v):"]
+    lines.extend(statement for statement in statements if statement)
+    lines.append("    pass")
+    for variable, leaf in leaves.items():
+        lines.append("def flip_{}(v):".format(variable))
+        lines.append("    v[{}] ^= 1".format(leaf))
+        ancestors = set()
+        pending = [leaf]
+        while pending:
+            for parent in parents[pending.pop()]:
+                if parent not in ancestors:
+                    ancestors.add(parent)
+                    pending.append(parent)
+        lines.extend(statements[index] for index in sorted(ancestors))
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    flips = [
+        namespace.get("flip_" + variable) for variable in reversed(variables)
+    ]
+    values = [0] * len(program)
+    namespace["initial"](values)
+    root = len(program) - 1
+    model = 0
+    yield model, values[root] == 1
+    for step in range(1, 1 << len(variables)):
+        # The Gray code flips the lowest set bit of the step number, which
+        # holds the value of the variable name counted from the last.
+        bit = (step & -step).bit_length() - 1
+        model ^= 1 << bit
+        flip = flips[bit]
+        if flip is not None:
+            flip(values)
+        yield model, values[root] == 1
+
+
+#: The maximal number of variable names over which a truth table is computed
+#: as a single integer. Larger truth tables are computed in chunks of this many
+#: variable names, each spanning ``2**CHUNK_VARIABLES`` models.
+CHUNK_VARIABLES = 16
+
+
+def _column(index: int, width: int) -> int:
+    """Computes the truth-table column of a variable name over models encoded
+    by consecutive integers.
+
+    Parameters:
+        index: the number of the bit that holds the value of the variable name
+            in the encoding of each model.
+        width: the number of models, a power of two greater than ``2**index``.
+
+    Returns:
+        The integer whose bit number `m` is bit number `index` of `m`, for every
+        `m` smaller than `width`.
+    """
+    period = 2 << index
+    column = ((1 << (1 << index)) - 1) << (1 << index)
+    while period < width:
+        column |= column << period
+        period *= 2
+    return column
+
+
+def _count_uses(program: Sequence[Formula]) -> Dict[int, int]:
+    """Counts the occurrences of subformulas as operands in the given formula.
+
+    Parameters:
+        program: the distinct subformulas of a formula, in the order of
+            `~logic.propositions.syntax.Formula.postorder`.
+
+    Returns:
+        The number of the given subformulas of which each subformula is an
+        operand, keyed by the identity of the subformula, counting twice a
+        subformula that is both operands of the same subformula.
+    """
+    uses: Dict[int, int] = {}
+    for node in program:
+        for operand in (node.first, node.second):
+            if operand is not None:
+                uses[id(operand)] = uses.get(id(operand), 0) + 1
+    return uses
+
+
+def _bitwise_truth_table(
+    program: Sequence[Formula],
+    uses: Mapping[int, int],
+    columns: Mapping[str, Any],
+    empty: Any,
+    full: Any,
+) -> Any:
+    """Calculates the truth values of a formula in a set of models at once,
+    with bitwise operations over tables that hold one bit per model.
+
+    The table of every subformula is released as soon as the last subformula
+    whose operand it is has been computed.
+
+    Parameters:
+        program: the distinct subformulas of the formula, in the order of
+            `~logic.propositions.syntax.Formula.postorder`.
+        uses: the operand occurrences of the subformulas, as counted by
+            `_count_uses`.
+        columns: the table of each variable name of the formula.
+        empty: the table with all bits unset, i.e., of the constant 'F'.
+        full: the table with all bits set, i.e., of the constant 'T'.
+
+    Returns:
+        The table of the formula.
+    """
+    remaining = dict(uses)
+    tables: Dict[int, Any] = {}
+    for node in program:
+        opcode = node.opcode
+        if opcode == VARIABLE:
+            table = columns[node.root]
+        elif opcode == T:
+            table = full
+        elif opcode == F:
+            table = empty
+        else:
+            first = tables[id(node.first)]
+            remaining[id(node.first)] -= 1
+            if remaining[id(node.first)] == 0:
+                del tables[id(node.first)]
+            if opcode == NOT:
+                second = None
+            else:
+                second = tables[id(node.second)]
+                remaining[id(node.second)] -= 1
+                if remaining[id(node.second)] == 0:
+                    del tables[id(node.second)]
+            table = OPERATIONS[opcode](first, second, full)
+        tables[id(node)] = table
+    return tables[id(program[-1])]
+
+
+def iter_truth_table(
+    formula: Formula,
+    variables: Sequence[str],
+    chunk_variables: int = CHUNK_VARIABLES,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Iterator[Tuple[int, int]]:
+    """Calculates the truth table of the given formula, in bit-parallel chunks.
+
+    The value of every distinct subformula is computed once per chunk, for all
+    of the models of the chunk at once, with bitwise operations over integers
+    that hold one bit per model.
+
+    Parameters:
+        formula: formula to calculate the truth table of.
+        variables: variable names, including all those of the given formula,
+            over which to calculate the truth table.
+        chunk_variables: the maximal number of variable names whose models are
+            covered by a single chunk.
+        start: the number of the first model to cover, in the order returned
+            by `all_models(variables)`.
+        stop: the number of the model following the last model to cover, in
+            the order returned by `all_models(variables)`, or `None` to cover
+            up to the last model over the given variable names.
+
+    Returns:
+        An iterator over pairs of the number of models in a chunk, and the
+        truth values of the given formula in those models, as an integer whose
+        bit number `m` is the truth value in the `m`-th model of the chunk.
+        Concatenated, the chunks cover the models with the numbers `start` up
+        to, but not including, `stop`, in the order returned by
+        `all_models(variables)`.
+
+    Examples:
+        >>> list(iter_truth_table(Formula.parse('(p->q)'), ['p', 'q']))
+        [(4, 11)]
+    """
+    assert formula.variables().issubset(variables)
+    n_variables = len(variables)
+    if stop is None:
+        stop = 1 << n_variables
+    assert 0 <= start <= stop <= 1 << n_variables
+    if start == stop:
+        return
+    chunk_variables = min(chunk_variables, n_variables)
+    width = 1 << chunk_variables
+    full = (1 << width) - 1
+    # all_models varies the last variable name the fastest, so the last
+    # chunk_variables variable names vary within each chunk, and the others
+    # are constant in it.
+    low = {
+        variable: _column(n_variables - 1 - position, width)
+        for position, variable in enumerate(variables)
+        if position >= n_variables - chunk_variables
+    }
+    high = {
+        variable: n_variables - 1 - position - chunk_variables
+        for position, variable in enumerate(variables)
+        if position < n_variables - chunk_variables
+    }
+    program = formula.postorder()
+    uses = _count_uses(program)
+    for chunk in range(start // width, -(-stop // width)):
+        columns = dict(low)
+        for variable, index in high.items():
+            columns[variable] = full if chunk >> index & 1 else 0
+        table = _bitwise_truth_table(program, uses, columns, 0, full)
+        # Only the first and last chunks may be partially covered.
+        first = max(start - chunk * width, 0)
+        last = min(stop - chunk * width, width)
+        if last - first < width:
+            table = table >> first & (1 << (last - first)) - 1
+        yield last - first, table
+
+
+def truth_table(formula: Formula, variables: Sequence[str]) -> int:
+    """Calculates the truth table of the given formula as a single integer.
+
+    Parameters:
+        formula: formula to calculate the truth table of.
+        variables: variable names, including all those of the given formula,
+            over which to calculate the truth table.
+
+    Returns:
+        The integer whose bit number `m` is the truth value of the given
+        formula in the `m`-th model returned by `all_models(variables)`.
+
+    Examples:
+        >>> bin(truth_table(Formula.parse('(p->q)'), ['q', 'p']))
+        '0b1101'
+    """
+    return next(iter_truth_table(formula, variables, len(variables)))[1]
+
+
+#: The maximal number of variable names over which the NumPy backend evaluates
+#: a formula in a single block. Larger truth tables are computed in blocks of
+#: ``2**BLOCK_VARIABLES`` models, each taking ``2**(BLOCK_VARIABLES - 3)``
+#: bytes per column.
+BLOCK_VARIABLES = 20
+
+
+def _import_numpy() -> Any:
+    """Imports NumPy, which is an optional dependency of this package.
+
+    Returns:
+        The `numpy` module.
+
+    Raises:
+        ImportError: if NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError(
+            "The NumPy backend requires NumPy, which can be installed with "
+            "'pip install logic[numpy]'"
+        ) from error
+    return numpy
+
+
+def _numpy_blocks(
+    numpy: Any, variables: Sequence[str], block_variables: int
+) -> Iterator[Tuple[Dict[str, Any], Any, Any]]:
+    """Generates the packed columns of the given variable names, block by
+    block.
+
+    Parameters:
+        numpy: the `numpy` module.
+        variables: variable names to generate the columns of.
+        block_variables: the maximal number of variable names whose models are
+            covered by a single block. Blocks cover at least three variable
+            names if there are that many.
+
+    Returns:
+        An iterator over triplets of the columns of the given variable names in
+        a block, the column with no bits set, and the column with all bits set.
+        Each column is a `numpy.uint8` array in which bit number `m`, in little
+        endian bit order, is the truth value in the `m`-th model of the block,
+        and padding bits are unset. Concatenated, the blocks cover the models
+        in the order returned by `all_models(variables)`.
+    """
+    n_variables = len(variables)
+    # Blocks span whole bytes, so that they can be concatenated.
+    block_variables = min(max(block_variables, 3), n_variables)
+    width = 1 << block_variables
+    empty = numpy.zeros(max(1, width // 8), dtype=numpy.uint8)
+    full = numpy.full(len(empty), min(255, (1 << width) - 1), numpy.uint8)
+    low = {}
+    for position in range(n_variables - block_variables, n_variables):
+        index = n_variables - 1 - position
+        if index < 3:
+            # Bit number m of each byte is bit number index of m.
+            column = numpy.full(len(empty), (0xAA, 0xCC, 0xF0)[index])
+        else:
+            column = numpy.arange(len(empty)) >> (index - 3) & 1
+            column *= 255
+        low[variables[position]] = column.astype(numpy.uint8) & full
+    for block in range(1 << (n_variables - block_variables)):
+        columns = dict(low)
+        for position in range(n_variables - block_variables):
+            index = n_variables - 1 - position - block_variables
+            columns[variables[position]] = full if block >> index & 1 else empty
+        yield columns, empty, full
+
+
+def iter_models_matrix(
+    variables: Sequence[str], block_variables: int = BLOCK_VARIABLES
+) -> Iterator[Any]:
+    """Calculates all possible models over the given variable names, as packed
+    boolean matrices produced lazily block by block. Requires NumPy.
+
+    Parameters:
+        variables: variable names over which to calculate the models.
+        block_variables: the maximal number of variable names whose models are
+            covered by a single block. Blocks cover at least three variable
+            names if there are that many.
+
+    Returns:
+        An iterator over `numpy.uint8` matrices with a row per given variable
+        name, in which bit number `m` of each row, in little endian bit order,
+        is the truth value of that variable name in the `m`-th model of the
+        block. Concatenated, the blocks cover the models in the order returned
+        by `all_models(variables)`.
+
+    Examples:
+        >>> [block.tolist() for block in iter_models_matrix(['p', 'q'])]
+        [[[12], [10]]]
+    """
+    numpy = _import_numpy()
+    for columns, empty, _ in _numpy_blocks(numpy, variables, block_variables):
+        yield numpy.array(
+            [columns[variable] for variable in variables], numpy.uint8
+        ).reshape(len(variables), len(empty))
+
+
+def truth_values_array(
+    formula: Formula,
+    variables: Sequence[str],
+    block_variables: int = BLOCK_VARIABLES,
+) -> Any:
+    """Calculates the truth value of the given formula in every model over the
+    given variable names, with vectorized bitwise operations over packed
+    blocks of models. Requires NumPy.
+
+    Parameters:
+        formula: formula to calculate the truth values of.
+        variables: variable names, including all those of the given formula,
+            over which to calculate the truth values.
+        block_variables: the maximal number of variable names whose models are
+            evaluated in a single block. Blocks cover at least three variable
+            names if there are that many.
+
+    Returns:
+        A `numpy.uint8` array in which bit number `m`, in little endian bit
+        order, is the truth value of the given formula in the `m`-th model
+        returned by `all_models(variables)`, and padding bits are unset. The
+        truth values can be unpacked with ``numpy.unpackbits(array,
+        count=2**len(variables), bitorder='little')``.
+
+    Examples:
+        >>> truth_values_array(Formula.parse('(p->q)'), ['p', 'q']).tolist()
+        [11]
+    """
+    numpy = _import_numpy()
+    assert formula.variables().issubset(variables)
+    program = formula.postorder()
+    uses = _count_uses(program)
+    return numpy.concatenate(
+        [
+            _bitwise_truth_table(program, uses, columns, empty, full)
+            for columns, empty, full in _numpy_blocks(
+                numpy, variables, block_variables
+            )
+        ]
+    )
 
 
 def print_truth_table(formula: Formula) -> None:
@@ -191,58 +1024,173 @@ def print_truth_table(formula: Formula) -> None:
         + "-" * len(str(formula))
         + "-|"
     )
-    for i in all_models(variables):
+    values = (
+        bit == "1"
+        for width, table in iter_truth_table(formula, variables)
+        for bit in reversed(bin(table)[2:].zfill(width))
+    )
+    for i, value in zip(all_models(variables), values):
         print(
             "| "
             + " | ".join(
                 [bool_to_str(i[j]) + " " * (len(j) - 1) for j in variables]
             )
             + " | "
-            + bool_to_str(evaluate(formula, i))
+            + bool_to_str(value)
             + " " * len(str(formula))
             + "|"
         )
 
 
-def is_tautology(formula: Formula) -> bool:
+def _space_truth_tables(
+    formula: Formula, space: Optional[ModelSpace]
+) -> Iterator[Tuple[int, int]]:
+    """Calculates the truth table of the given formula over the given space, in
+    bit-parallel chunks.
+
+    Parameters:
+        formula: formula to calculate the truth table of.
+        space: models over (possibly a superset of) the variable names of the
+            given formula, or `None` for all models over its variable names.
+
+    Returns:
+        An iterator over the chunks of the truth table, as returned by
+        `iter_truth_table`.
+    """
+    if space is None:
+        return iter_truth_table(formula, sorted(formula.variables()))
+    return iter_truth_table(
+        formula, space.variables, start=space.start, stop=space.stop
+    )
+
+
+def is_tautology(
+    formula: Formula,
+    space: Optional[ModelSpace] = None,
+    workers: Optional[int] = 1,
+    method: str = "truth_table",
+) -> bool:
     """Checks if the given formula is a tautology.
 
     Parameters:
         formula: formula to check.
+        space: models over (possibly a superset of) the variable names of the
+            given formula to check the formula in, for example a shard of the
+            models, or `None` to check it in all models over its variable
+            names.
+        workers: the number of worker processes to check the formula in
+            parallel with, or `None` for the number of processors of the
+            machine. If 1, the formula is checked in the current process.
+        method: ``'truth_table'`` to check the formula in each model,
+            ``'cdcl'`` to search for a model with the conflict-driven
+            clause-learning solver of `~logic.propositions.sat`, or ``'bdd'``
+            to build the binary decision diagram of the formula with
+            `~logic.propositions.bdd`. The other optional parameters are only
+            supported by ``'truth_table'``.
 
     Returns:
         `True` if the given formula is a tautology, `False` otherwise.
     """
     # TODO: Task 2.5a
-    return all(truth_values(formula, all_models(Formula.variables(formula))))
+    if method == "cdcl":
+        assert space is None and workers == 1
+        return solve(Formula("~", formula)) is None
+    if method == "bdd":
+        assert space is None and workers == 1
+        return BDDManager().from_formula(formula).is_tautology()
+    assert method == "truth_table"
+    if workers != 1:
+        from logic.propositions.parallel import search_truth_value
+
+        return not search_truth_value(formula, False, workers, space)
+    return all(
+        table == (1 << width) - 1
+        for width, table in _space_truth_tables(formula, space)
+    )
 
 
-def is_contradiction(formula: Formula) -> bool:
+def is_contradiction(
+    formula: Formula,
+    space: Optional[ModelSpace] = None,
+    workers: Optional[int] = 1,
+    method: str = "truth_table",
+) -> bool:
     """Checks if the given formula is a contradiction.
 
     Parameters:
         formula: formula to check.
+        space: models over (possibly a superset of) the variable names of the
+            given formula to check the formula in, for example a shard of the
+            models, or `None` to check it in all models over its variable
+            names.
+        workers: the number of worker processes to check the formula in
+            parallel with, or `None` for the number of processors of the
+            machine. If 1, the formula is checked in the current process.
+        method: ``'truth_table'`` to check the formula in each model,
+            ``'cdcl'`` to search for a model with the conflict-driven
+            clause-learning solver of `~logic.propositions.sat`, or ``'bdd'``
+            to build the binary decision diagram of the formula with
+            `~logic.propositions.bdd`. The other optional parameters are only
+            supported by ``'truth_table'``.
 
     Returns:
         `True` if the given formula is a contradiction, `False` otherwise.
     """
     # TODO: Task 2.5b
-    return not any(
-        truth_values(formula, all_models(Formula.variables(formula)))
-    )
-
-
-def is_satisfiable(formula: Formula) -> bool:
+    if method == "cdcl":
+        assert space is None and workers == 1
+        return solve(formula) is None
+    if method == "bdd":
+        assert space is None and workers == 1
+        return BDDManager().from_formula(formula).is_contradiction()
+    assert method == "truth_table"
+    if workers != 1:
+        from logic.propositions.parallel import search_truth_value
+
+        return not search_truth_value(formula, True, workers, space)
+    return not any(table for _, table in _space_truth_tables(formula, space))
+
+
+def is_satisfiable(
+    formula: Formula,
+    space: Optional[ModelSpace] = None,
+    workers: Optional[int] = 1,
+    method: str = "truth_table",
+) -> bool:
     """Checks if the given formula is satisfiable.
 
     Parameters:
         formula: formula to check.
+        space: models over (possibly a superset of) the variable names of the
+            given formula to check the formula in, for example a shard of the
+            models, or `None` to check it in all models over its variable
+            names.
+        workers: the number of worker processes to check the formula in
+            parallel with, or `None` for the number of processors of the
+            machine. If 1, the formula is checked in the current process.
+        method: ``'truth_table'`` to check the formula in each model,
+            ``'cdcl'`` to search for a model with the conflict-driven
+            clause-learning solver of `~logic.propositions.sat`, or ``'bdd'``
+            to build the binary decision diagram of the formula with
+            `~logic.propositions.bdd`. The other optional parameters are only
+            supported by ``'truth_table'``.
 
     Returns:
         `True` if the given formula is satisfiable, `False` otherwise.
     """
     # TODO: Task 2.5c
-    return any(truth_values(formula, all_models(Formula.variables(formula))))
+    if method == "cdcl":
+        assert space is None and workers == 1
+        return solve(formula) is not None
+    if method == "bdd":
+        assert space is None and workers == 1
+        return BDDManager().from_formula(formula).is_satisfiable()
+    assert method == "truth_table"
+    if workers != 1:
+        from logic.propositions.parallel import search_truth_value
+
+        return search_truth_value(formula, True, workers, space)
+    return any(table for _, table in _space_truth_tables(formula, space))
 
 
 def _synthesize_for_model(model: Model) -> Formula:
@@ -260,21 +1208,13 @@ def _synthesize_for_model(model: Model) -> Formula:
     assert is_model(model)
     assert len(model.keys()) > 0
     # TODO: Task 2.6
-    variables = list(model.keys())
-
-    if not (model[variables[0]]):
-        formula = Formula("~", Formula(variables.pop(0)))
-    else:
-        formula = Formula(variables.pop(0))
-
-    while variables:
-        if not (model[variables[0]]):
-            second = Formula("~", Formula(variables.pop(0)))
-        else:
-            second = Formula(variables.pop(0))
-
-        formula = Formula("&", formula, second)
-    return formula
+    return Formula.combine(
+        "&",
+        (
+            Formula(variable) if value else Formula("~", Formula(variable))
+            for variable, value in model.items()
+        ),
+    )
 
 
 def synthesize(variables: Sequence[str], values: Iterable[bool]) -> Formula:
@@ -301,21 +1241,14 @@ def synthesize(variables: Sequence[str], values: Iterable[bool]) -> Formula:
     """
     assert len(variables) > 0
     # TODO: Task 2.7
-    variables = list(variables)
     rows = zip(all_models(variables), values)
     disjuncts = [_synthesize_for_model(i[0]) for i in rows if i[1]]
-    if disjuncts:
-        formula = disjuncts.pop(0)
-        while disjuncts:
-            formula = Formula("|", formula, disjuncts.pop(0))
-    else:
-        var = Formula(variables.pop(0))
-        formula = Formula("&", var, Formula("~", var))
-        while variables:
-            second = Formula(variables.pop(0))
-            second = Formula("&", second, Formula("~", second))
-            formula = Formula("|", formula, second)
-    return formula
+    if not disjuncts:
+        disjuncts = [
+            Formula("&", Formula(variable), Formula("~", Formula(variable)))
+            for variable in variables
+        ]
+    return Formula.combine("|", disjuncts)
 
 
 def _synthesize_for_all_except_model(model: Model) -> Formula:
@@ -333,25 +1266,13 @@ def _synthesize_for_all_except_model(model: Model) -> Formula:
     assert is_model(model)
     assert len(model.keys()) > 0
     # TODO: Optional Task 2.8
-
-    variables = list(model.keys())
-
-    init = True
-    for i in variables:
-        if init:
-            if model[i]:
-                formula = Formula("~", Formula(i))
-                init = False
-            else:
-                formula = Formula(i)
-                init = False
-        else:
-            if model[i]:
-                first = Formula("~", Formula(i))
-            else:
-                first = Formula(i)
-            formula = Formula("|", first, formula)
-    return formula
+    return Formula.combine(
+        "|",
+        (
+            Formula("~", Formula(variable)) if value else Formula(variable)
+            for variable, value in model.items()
+        ),
+    )
 
 
 def synthesize_cnf(variables: Sequence[str], values: Iterable[bool]) -> Formula:
@@ -378,34 +1299,52 @@ def synthesize_cnf(variables: Sequence[str], values: Iterable[bool]) -> Formula:
     """
     assert len(variables) > 0
     # TODO: Optional Task 2.9
-    variables = list(variables)
     rows = zip(all_models(variables), values)
     conjuncts = [
         _synthesize_for_all_except_model(i[0]) for i in rows if not i[1]
     ]
-    if conjuncts:
-        formula = conjuncts.pop(0)
-        while conjuncts:
-            formula = Formula("&", formula, conjuncts.pop(0))
-    else:
-        var = Formula(variables.pop(0))
-        formula = Formula("|", var, Formula("~", var))
-        while variables:
-            second = Formula(variables.pop(0))
-            second = Formula("|", second, Formula("~", second))
-            formula = Formula("&", formula, second)
-    return formula
+    if not conjuncts:
+        conjuncts = [
+            Formula("|", Formula(variable), Formula("~", Formula(variable)))
+            for variable in variables
+        ]
+    return Formula.combine("&", conjuncts)
+
 
+def combine_formula(formulas: Sequence[Formula], operator: str) -> Formula:
+    """Combines the given formulas with the given binary operator into a
+    balanced formula, see `Formula.combine`.
 
-def combine_formula(formulas: Iterable[Formula], operator: str) -> Formula:
+    Parameters:
+        formulas: formulas to combine.
+        operator: binary operator to combine with.
+
+    Returns:
+        The combined formula, or the given formulas if there are none.
+    """
     if len(formulas) == 0:
         return formulas
-    elif len(formulas) == 1:
-        return formulas[0]
-    else:
-        return Formula(
-            operator, formulas[0], combine_formula(formulas[1:], operator)
+    return Formula.combine(operator, formulas)
+
+
+def _inference_formula(rule: InferenceRule) -> Formula:
+    """Builds the formula that holds in exactly the models in which the given
+    inference rule holds.
+
+    Parameters:
+        rule: inference rule to build the formula of.
+
+    Returns:
+        The implication of the conclusion of the given rule by the conjunction
+        of its assumptions, or its conclusion if it has no assumptions.
+    """
+    if rule.assumptions:
+        formula = Formula(
+            "->", combine_formula(rule.assumptions, "&"), rule.conclusion
         )
+    else:
+        formula = rule.conclusion
+    return formula
 
 
 def evaluate_inference(rule: InferenceRule, model: Model) -> bool:
@@ -428,31 +1367,30 @@ def evaluate_inference(rule: InferenceRule, model: Model) -> bool:
         ...                    {'p': False, 'q': True})
         True
     """
+    if isinstance(model, BitModel):
+        # Evaluate the formulas of the rule on the bits of the model, rather
+        # than a formula built from them.
+        return not all(
+            evaluate(assumption, model) for assumption in rule.assumptions
+        ) or evaluate(rule.conclusion, model)
     assert is_model(model)
     # TODO: Task 4.2
-    if rule.assumptions:
-        formula = Formula(
-            "->", combine_formula(rule.assumptions, "&"), rule.conclusion
-        )
-    else:
-        formula = rule.conclusion
-    return evaluate(formula, model)
+    return evaluate(_inference_formula(rule), model)
 
 
-def is_sound_inference(rule: InferenceRule) -> bool:
+def is_sound_inference(rule: InferenceRule, workers: Optional[int] = 1) -> bool:
     """Checks if the given inference rule is sound, i.e., whether its
     conclusion is a semantically correct implication of its assumptions.
 
     Parameters:
         rule: inference rule to check.
+        workers: the number of worker processes to check the inference rule in
+            parallel with, or `None` for the number of processors of the
+            machine. If 1, the inference rule is checked in the current
+            process.
 
     Returns:
         `True` if the given inference rule is sound, `False` otherwise.
     """
     # TODO: Task 4.3
-    return all(
-        (
-            evaluate_inference(rule, model)
-            for model in all_models(InferenceRule.variables(rule))
-        )
-    )
+    return is_tautology(_inference_formula(rule), workers=workers)
@@ -0,0 +1,192 @@
+"""Integer encodings of the symbols of propositional formulas."""
+
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Tuple,
+)
+
+from logic.utils.logic_utils import frozen
+
+if TYPE_CHECKING:
+    from logic.propositions.syntax import Formula
+
+#: The constants and operators of propositional formulas, indexed by their
+#: opcodes. Opcode zero stands for a variable name.
+OPERATORS: Tuple[str, ...] = (
+    "",
+    "T",
+    "F",
+    "~",
+    "&",
+    "|",
+    "->",
+    "+",
+    "<->",
+    "-&",
+    "-|",
+)
+
+#: The opcodes of the constants and operators of propositional formulas.
+OPCODES: Mapping[str, int] = {
+    operator: opcode for opcode, operator in enumerate(OPERATORS) if operator
+}
+
+#: The opcode of variable names.
+VARIABLE = 0
+T, F, NOT, AND, OR, IMPLIES, XOR, IFF, NAND, NOR = range(1, len(OPERATORS))
+
+#: The bitwise operations that compute the truth values of each operator from
+#: those of its operands, given the value with all bits set. Truth values may
+#: be single bits, with ``1`` as that value, or tables with one bit per model.
+OPERATIONS: Mapping[int, Callable[[Any, Any, Any], Any]] = {
+    NOT: lambda first, second, full: first ^ full,
+    AND: lambda first, second, full: first & second,
+    OR: lambda first, second, full: first | second,
+    IMPLIES: lambda first, second, full: first ^ full | second,
+    XOR: lambda first, second, full: first ^ second,
+    IFF: lambda first, second, full: first ^ second ^ full,
+    NAND: lambda first, second, full: first & second ^ full,
+    NOR: lambda first, second, full: (first | second) ^ full,
+}
+
+
+@frozen
+class SymbolTable:
+    """An immutable numbering of variable names by dense integer ids, under
+    which a model is an integer whose bit number `i` is the truth value of the
+    variable name with id `i`.
+
+    Attributes:
+        names (`~typing.Tuple`\\[`str`, ...]): the variable names, indexed by
+            their ids.
+        ids (`~typing.Mapping`\\[`str`, `int`]): the ids of the variable names.
+    """
+
+    __slots__ = ("names", "ids")
+
+    names: Tuple[str, ...]
+    ids: Mapping[str, int]
+
+    def __init__(self, names: Iterable[str]):
+        """Initializes a `SymbolTable` from the variable names to number.
+
+        Parameters:
+            names: distinct variable names, in the order of their ids.
+        """
+        names = tuple(names)
+        ids = {name: index for index, name in enumerate(names)}
+        assert len(ids) == len(names)
+        object.__setattr__(self, "names", names)
+        object.__setattr__(self, "ids", ids)
+
+    def __repr__(self) -> str:
+        """Computes a string representation of the current symbol table.
+
+        Returns:
+            A string representation of the current symbol table.
+        """
+        return "SymbolTable(" + repr(list(self.names)) + ")"
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the current symbol table with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is a `SymbolTable` object that numbers
+            the same variable names in the same order, `False` otherwise.
+        """
+        return isinstance(other, SymbolTable) and self.names == other.names
+
+    def __ne__(self, other: object) -> bool:
+        """Compares the current symbol table with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is not a `SymbolTable` object or does
+            not equal the current symbol table, `False` otherwise.
+        """
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash(self.names)
+
+    def __len__(self) -> int:
+        """Counts the variable names of the current symbol table.
+
+        Returns:
+            The number of numbered variable names.
+        """
+        return len(self.names)
+
+    def evaluate(self, formula: Formula, bits: int) -> bool:
+        """Calculates the truth value of the given formula in the given model.
+
+        Parameters:
+            formula: formula over (possibly a subset of) the variable names of
+                the current symbol table.
+            bits: model as an integer, with the truth value of each variable
+                name at the bit of its id.
+
+        Returns:
+            The truth value of the given formula in the given model.
+        """
+        return next(self.truth_values(formula, (bits,)))
+
+    def truth_values(
+        self, formula: Formula, models: Iterable[int]
+    ) -> Iterator[bool]:
+        """Calculates the truth value of the given formula in each of the given
+        models.
+
+        Parameters:
+            formula: formula over (possibly a subset of) the variable names of
+                the current symbol table.
+            models: models as integers, with the truth value of each variable
+                name at the bit of its id.
+
+        Returns:
+            An iterator over the respective truth values of the given formula
+            in the given models.
+        """
+        ids = self.ids
+        # The opcode of each distinct subformula in post-order, with the
+        # indices of its operands in this list, or the id of its variable name.
+        instructions: List[Tuple[int, int, int]] = []
+        indices: Dict[int, int] = {}
+        for node in formula.postorder():
+            indices[id(node)] = len(instructions)
+            if node.opcode == VARIABLE:
+                instructions.append((VARIABLE, ids[node.root], -1))
+            else:
+                instructions.append(
+                    (
+                        node.opcode,
+                        indices.get(id(node.first), -1),
+                        indices.get(id(node.second), -1),
+                    )
+                )
+        for bits in models:
+            values: List[int] = []
+            for opcode, first, second in instructions:
+                if opcode == VARIABLE:
+                    value = bits >> first & 1
+                elif opcode == T:
+                    value = 1
+                elif opcode == F:
+                    value = 0
+                else:
+                    value = OPERATIONS[opcode](values[first], values[second], 1)
+                values.append(value)
+            yield values[-1] == 1
@@ -1,31 +1,75 @@
 """Syntactic handling of propositional formulas."""
 
 from __future__ import annotations
-from functools import lru_cache
-from typing import Mapping, Optional, Set, Tuple, Union
+from itertools import accumulate
+import re
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from weakref import WeakValueDictionary
+
+from logic.utils.logic_utils import frozen, memoized_immutable_method
+from logic.propositions.symbols import NOT, OPCODES, VARIABLE
+
+T = TypeVar("T")
+
+
+#: A single token of the standard or polish representation of a formula: a
+#: variable name, a constant, an operator, or a parenthesis. Any other character
+#: is matched by itself so that it can be reported as an unexpected symbol.
+_TOKEN_PATTERN = re.compile(r"[p-z]\d*|<->|->|-&|-\||[TF~&|+()]|.", re.DOTALL)
+
+
+def tokenize(string: str) -> Tuple[List[str], List[int]]:
+    """Splits the given string into the tokens of a formula representation in a
+    single pass.
+
+    Parameters:
+        string: string to split.
+
+    Returns:
+        A pair of the list of tokens of the given string, and the list of the
+        offsets in the string at which these tokens start. The latter list
+        ends with one additional offset, the length of the given string, which
+        stands for the end of the input. Characters that cannot start a token
+        are returned as tokens of their own.
+
+    Examples:
+        >>> tokenize('(x12->~T)')
+        (['(', 'x12', '->', '~', 'T', ')'], [0, 1, 4, 6, 7, 8, 9])
+    """
+    tokens = _TOKEN_PATTERN.findall(string)
+    offsets = list(accumulate(map(len, tokens), initial=0))
+    return tokens, offsets
 
-from logic.utils.logic_utils import frozen, memoized_parameterless_method
 
+def _unexpected(token: str) -> str:
+    """Describes the given token as unexpected in a parsed string.
 
-@lru_cache(maxsize=100)  # Cache the return value of split_str
-def split_str(
-    string,
-):  # returns any operator, constant, (, ), or variable if it's the first character.
-    if string and string[0] == "-":
-        prefix, suffix = string[:2], string[2:]
-    elif string and string[0] == "<":
-        prefix, suffix = string[:3], string[3:]
-    else:
-        prefix, suffix = string[:1], string[1:]
+    Parameters:
+        token: unexpected token, or an empty string for the end of the input.
 
-    if prefix and is_variable(prefix):
-        while suffix and suffix[0].isnumeric():
-            prefix += suffix[0]
-            suffix = suffix.replace(suffix[0], "", 1)
-    return prefix, suffix
+    Returns:
+        A human-readable error message.
+    """
+    if not token:
+        return "Unexpected end of input"
+    return "Unexpected symbol '{}'".format(token)
 
 
-@lru_cache(maxsize=100)  # Cache the return value of is_variable
 def is_variable(string: str) -> bool:
     """Checks if the given string is a variable name.
 
@@ -42,7 +86,6 @@ def is_variable(string: str) -> bool:
     )
 
 
-@lru_cache(maxsize=100)
 def is_constant(string: str) -> bool:
     """Checks if the given string is a constant.
 
@@ -55,7 +98,6 @@ def is_constant(string: str) -> bool:
     return string == "T" or string == "F"
 
 
-@lru_cache(maxsize=100)
 def is_unary(string: str) -> bool:
     """Checks if the given string is a unary operator.
 
@@ -68,7 +110,6 @@ def is_unary(string: str) -> bool:
     return string == "~"
 
 
-@lru_cache(maxsize=100)
 def is_binary(string: str) -> bool:
     """Checks if the given string is a binary operator.
 
@@ -83,11 +124,95 @@ def is_binary(string: str) -> bool:
     return string in {"&", "|", "->", "+", "<->", "-&", "-|"}
 
 
+@frozen
+class ParseError:
+    """An immutable description of why a string is not a valid representation
+    of a formula.
+
+    Attributes:
+        offset (`int`): the offset in the string of the first character that
+            could not be parsed, or the length of the string if it ended
+            prematurely.
+        message (`str`): a human-readable description of the error.
+    """
+
+    __slots__ = ("offset", "message")
+
+    offset: int
+    message: str
+
+    def __init__(self, offset: int, message: str):
+        """Initializes a `ParseError` from its offset and message.
+
+        Parameters:
+            offset: the offset in the string of the error.
+            message: a human-readable description of the error.
+        """
+        object.__setattr__(self, "offset", offset)
+        object.__setattr__(self, "message", message)
+
+    def __repr__(self) -> str:
+        """Computes a string representation of the current error.
+
+        Returns:
+            A string representation of the current error.
+        """
+        return "{} at offset {}".format(self.message, self.offset)
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the current error with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is a `ParseError` object that equals the
+            current error, `False` otherwise.
+        """
+        return (
+            isinstance(other, ParseError)
+            and self.offset == other.offset
+            and self.message == other.message
+        )
+
+    def __ne__(self, other: object) -> bool:
+        """Compares the current error with the given one.
+
+        Parameters:
+            other: object to compare to.
+
+        Returns:
+            `True` if the given object is not a `ParseError` object or does not
+            equal the current error, `False` otherwise.
+        """
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash((self.offset, self.message))
+
+
+#: The unique table of all live formulas, keyed by the root of each formula
+#: and the identities of its operands. Formulas are removed from the table as
+#: soon as they are no longer referenced.
+_unique_table: WeakValueDictionary = WeakValueDictionary()
+
+#: The lock under which formulas are added to `_unique_table`, so that threads
+#: that build equal formulas at the same time get the same one.
+_unique_table_lock = threading.Lock()
+
+#: A substitution schema compiled by `Formula._compile_schema`.
+_Template = Tuple[List[Tuple[str, int, int]], int]
+
+
 @frozen
 class Formula:
     """An immutable propositional formula in tree representation, composed from
     variable names, and operators applied to them.
 
+    Formulas are hash-consed: constructing a formula that is structurally equal
+    to a live formula returns that very same object, so that equality of
+    formulas is identity and subformulas are shared between formulas.
+
     Attributes:
         root (`str`): the constant, variable name, or operator at the root of
             the formula tree.
@@ -95,11 +220,75 @@ class Formula:
             if the root is a unary of binary operator.
         second (`~typing.Optional`\\[`Formula`]): the second operand of the root,
             if the root is a binary operator.
+        opcode (`int`): the opcode of the root, an index into
+            `~logic.propositions.symbols.OPERATORS`.
     """
 
+    __slots__ = (
+        "root",
+        "first",
+        "second",
+        "opcode",
+        "_hash",
+        "_memoized_repr",
+        "_memoized_variables",
+        "_memoized_operators",
+        "__weakref__",
+    )
+
     root: str
     first: Optional[Formula]
     second: Optional[Formula]
+    opcode: int
+    _hash: int
+
+    def __new__(
+        cls,
+        root: str,
+        first: Optional[Formula] = None,
+        second: Optional[Formula] = None,
+    ) -> Formula:
+        """Returns the unique live formula with the given root and root
+        operands, creating it if no such formula exists.
+
+        Parameters:
+            root: the root for the formula tree.
+            first: the first operand for the root, if the root is a unary or
+                binary operator.
+            second: the second operand for the root, if the root is a binary
+                operator.
+
+        Returns:
+            The canonical formula with the given root and root operands.
+        """
+        if first is not None and not isinstance(first, Formula):
+            first = Formula(first)
+        if second is not None and not isinstance(second, Formula):
+            second = Formula(second)
+        key = (root, id(first), id(second))
+        formula = _unique_table.get(key)
+        if formula is not None:
+            return formula
+        opcode = OPCODES.get(root, VARIABLE)
+        if first is None:
+            assert is_variable(root) if opcode == VARIABLE else opcode < NOT
+            assert second is None
+        elif second is None:
+            assert opcode == NOT
+        else:
+            assert opcode > NOT
+        with _unique_table_lock:
+            # Another thread may have added the formula since the lookup above.
+            formula = _unique_table.get(key)
+            if formula is None:
+                formula = super().__new__(cls)
+                object.__setattr__(formula, "root", root)
+                object.__setattr__(formula, "first", first)
+                object.__setattr__(formula, "second", second)
+                object.__setattr__(formula, "opcode", opcode)
+                object.__setattr__(formula, "_hash", hash(key))
+                _unique_table[key] = formula
+        return formula
 
     def __init__(
         self,
@@ -109,6 +298,9 @@ class Formula:
     ):
         """Initializes a `Formula` from its root and root operands.
 
+        The formula is fully constructed by `__new__`, which may return an
+        already existing formula, so there is nothing left to initialize here.
+
         Parameters:
             root: the root for the formula tree.
             first: the first operand for the root, if the root is a unary or
@@ -116,23 +308,119 @@ class Formula:
             second: the second operand for the root, if the root is a binary
                 operator.
         """
-        if is_variable(root) or is_constant(root):
-            assert first is None and second is None
-            self.root = root
-        elif is_unary(root):
-            assert first is not None and second is None
-            self.root = root
-            self.first = first if isinstance(first, Formula) else Formula(first)
-        else:
-            assert is_binary(root)
-            assert first is not None and second is not None
-            self.root = root
-            self.first = first if isinstance(first, Formula) else Formula(first)
-            self.second = (
-                second if isinstance(second, Formula) else Formula(second)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Reduces the current formula for pickling and copying, so that the
+        reconstructed formula is looked up in the unique table.
+
+        Returns:
+            The class and construction arguments of the current formula.
+        """
+        return Formula, (self.root, self.first, self.second)
+
+    def postorder(self) -> List[Formula]:
+        """Lists the distinct subformulas of the current formula, each after
+        its operands.
+
+        The traversal uses an explicit stack rather than recursion, so it
+        handles formulas of any depth, and visits each shared subformula once.
+
+        Returns:
+            A list of all distinct subformulas of the current formula,
+            including itself, in post-order: the first operand of each
+            subformula and its subformulas precede the second operand and its
+            subformulas, which precede the subformula itself. The current
+            formula is last.
+        """
+        order: List[Formula] = []
+        visited: Set[int] = set()
+        # Subformulas to visit, where each expanded subformula is followed by a
+        # ``None`` marker, above which its operands are pushed.
+        stack: List[Optional[Formula]] = [self]
+        while stack:
+            formula = stack.pop()
+            if formula is None:
+                order.append(stack.pop())
+                continue
+            if id(formula) in visited:
+                continue
+            visited.add(id(formula))
+            stack.append(formula)
+            stack.append(None)
+            second = formula.second
+            if second is not None and id(second) not in visited:
+                stack.append(second)
+            first = formula.first
+            if first is not None and id(first) not in visited:
+                stack.append(first)
+        return order
+
+    def fold(
+        self, combine: Callable[[Formula, Optional[T], Optional[T]], T]
+    ) -> T:
+        """Computes a value for the current formula bottom-up, from the values
+        computed for its operands.
+
+        Parameters:
+            combine: function that computes the value of a subformula given
+                that subformula and the values computed for its first and
+                second operands, where ``None`` stands for a missing operand.
+                It is called once per distinct subformula, in the order of
+                `postorder`.
+
+        Returns:
+            The value computed for the current formula.
+
+        Examples:
+            >>> Formula.parse('((p&q)|~p)').fold(
+            ...     lambda formula, first, second: 1 + (first or 0)
+            ...     + (second or 0)
+            ... )
+            6
+        """
+        # The values computed so far, keyed by the identities of subformulas.
+        values: Dict[int, T] = {}
+        for formula in self.postorder():
+            values[id(formula)] = combine(
+                formula,
+                values.get(id(formula.first)),
+                values.get(id(formula.second)),
             )
+        return values[id(self)]
+
+    def _write(self, polish: bool) -> str:
+        """Computes a string representation of the current formula without
+        recursion.
+
+        Parameters:
+            polish: whether to compute the polish notation representation
+                rather than the standard one.
+
+        Returns:
+            The requested string representation of the current formula.
+        """
+        parts: List[str] = []
+        # Each entry is either a subformula to write, or a string to output.
+        stack: List[Union[Formula, str]] = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+            elif item.second is not None:
+                if polish:
+                    parts.append(item.root)
+                    stack.append(item.second)
+                else:
+                    parts.append("(")
+                    stack.extend((")", item.second, item.root))
+                stack.append(item.first)
+            else:
+                parts.append(item.root)
+                if item.first is not None:
+                    stack.append(item.first)
+        return "".join(parts)
 
-    @memoized_parameterless_method
+    @memoized_immutable_method
     def __repr__(self) -> str:
         """Computes the string representation of the current formula.
 
@@ -140,20 +428,7 @@ class Formula:
             The standard string representation of the current formula.
         """
         # Task 1.1
-        if is_constant(self.root) or is_variable(self.root):
-            string = self.root
-        elif is_unary(self.root):
-            string = self.root + self.first.__repr__()
-        else:
-            assert is_binary(self.root)
-            string = (
-                "("
-                + self.first.__repr__()
-                + self.root
-                + self.second.__repr__()
-                + ")"
-            )
-        return string
+        return self._write(polish=False)
 
     def __eq__(self, other: object) -> bool:
         """Compares the current formula with the given one.
@@ -165,7 +440,7 @@ class Formula:
             `True` if the given object is a `Formula` object that equals the
             current formula, `False` otherwise.
         """
-        return isinstance(other, Formula) and str(self) == str(other)
+        return self is other
 
     def __ne__(self, other: object) -> bool:
         """Compare the current formula with the given one.
@@ -180,41 +455,24 @@ class Formula:
         return not self == other
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
-    @memoized_parameterless_method
-    def variables(self) -> Set[str]:
+    @memoized_immutable_method
+    def variables(self) -> FrozenSet[str]:
         """Finds all variable names in the current formula.
 
         Returns:
             A set of all variable names used in the current formula.
         """
         # Task 1.2
-        if is_variable(self.root):
-            return {self.root}
-        elif is_unary(self.root):
-            if isinstance(self.first, Formula):
-                first = self.first.variables()
-            elif is_variable(self.first):
-                first = {self.first}
-
-            return first
-        elif is_binary(self.root):
-            if isinstance(self.first, Formula):
-                first = self.first.variables()
-            else:
-                first = {self.first}
-
-            if isinstance(self.second, Formula):
-                second = self.second.variables()
-            else:
-                second = {self.second}
-            return first | second
-        else:
-            return set()
+        return {
+            formula.root
+            for formula in self.postorder()
+            if is_variable(formula.root)
+        }
 
-    @memoized_parameterless_method
-    def operators(self) -> Set[str]:
+    @memoized_immutable_method
+    def operators(self) -> FrozenSet[str]:
         """Finds all operators in the current formula.
 
         Returns:
@@ -222,17 +480,70 @@ class Formula:
             current formula.
         """
         # Task 1.3
-        operators = set()
-        if not is_variable(self.root):
-            operators = operators | {self.root}
+        return {
+            formula.root
+            for formula in self.postorder()
+            if not is_variable(formula.root)
+        }
 
-        if is_unary(self.root):
-            return operators | self.first.operators()
+    @staticmethod
+    def _parse_tokens(
+        tokens: Sequence[str], start: int = 0
+    ) -> Tuple[Optional[Formula], int, str]:
+        """Parses a prefix of the given tokens, starting from the given index,
+        into a formula.
 
-        if is_binary(self.root):
-            return operators | self.first.operators() | self.second.operators()
+        The parsing uses an explicit stack rather than recursion, so it takes
+        time linear in the number of parsed tokens regardless of the nesting
+        depth of the parsed formula.
 
-        return operators
+        Parameters:
+            tokens: tokens of the standard string representation of a formula,
+                as returned by `tokenize`.
+            start: index of the first token to parse.
+
+        Returns:
+            A triplet of the parsed formula, the index of the first unparsed
+            token, and an empty string. If no prefix of the given tokens is a
+            valid standard representation of a formula, then the triplet
+            consists of ``None``, the index of the offending token, and a
+            human-readable error message.
+        """
+        # Pending operators, each either '~', '(' before its first operand, or
+        # a pair of a binary operator and its first operand.
+        stack: List[Any] = []
+        length = len(tokens)
+        position = start
+        while True:
+            token = tokens[position] if position < length else ""
+            if token == "~" or token == "(":
+                stack.append(token)
+                position += 1
+                continue
+            if not token or not (is_variable(token) or is_constant(token)):
+                return None, position, _unexpected(token)
+            formula = Formula(token)
+            position += 1
+            while stack:
+                pending = stack[-1]
+                if pending == "~":
+                    stack.pop()
+                    formula = Formula("~", formula)
+                    continue
+                token = tokens[position] if position < length else ""
+                if pending == "(":
+                    if not is_binary(token):
+                        return None, position, _unexpected(token)
+                    stack[-1] = (token, formula)
+                    position += 1
+                    break
+                if token != ")":
+                    return None, position, _unexpected(token)
+                stack.pop()
+                formula = Formula(pending[0], pending[1], formula)
+                position += 1
+            else:
+                return formula, position, ""
 
     @staticmethod
     def _parse_prefix(string: str) -> Tuple[Optional[Formula], str]:
@@ -252,35 +563,40 @@ class Formula:
             is a string with some human-readable content.
         """
         # Task 1.4
-        prefix, suffix = split_str(string)
-        if prefix and (is_constant(prefix) or is_variable(prefix)):
-            return Formula(prefix), suffix
-        elif is_unary(prefix):
-            root = prefix
-            first, suffix = Formula._parse_prefix(suffix)
-            if first is None:
-                return first, suffix
-            else:
-                return Formula(root, first), suffix
-        elif prefix == "(":
-            first, suffix = Formula._parse_prefix(suffix)
-            if first is None:
-                return first, suffix
+        tokens, offsets = tokenize(string)
+        formula, position, error = Formula._parse_tokens(tokens)
+        if formula is None:
+            return None, str(ParseError(offsets[position], error))
+        return formula, string[offsets[position] :]
+
+    @staticmethod
+    def try_parse(string: str) -> Union[Formula, ParseError]:
+        """Parses the given string into a formula if it is a valid
+        representation of one.
 
-            root, suffix = split_str(suffix)
-            if not is_binary(root):
-                return None, "Unexpected symbol () in ()"
+        Parameters:
+            string: string to parse.
 
-            second, tail = Formula._parse_prefix(suffix)
-            if second is None:
-                return second, tail
+        Returns:
+            A formula whose standard string representation is the given string,
+            or a `ParseError` pointing at the first offending character if the
+            given string is not a valid standard string representation of a
+            formula.
 
-            if not tail.startswith(")"):
-                return None, "Unexpected symbol {} in {}".format(tail[:1], tail)
+        Examples:
+            >>> Formula.try_parse('(p|~q)')
+            (p|~q)
 
-            return Formula(root, first, second), tail[1:]
-        else:
-            return None, "Unexpected input {}".format(string)
+            >>> Formula.try_parse('(p|~q))')
+            Unexpected symbol ')' at offset 6
+        """
+        tokens, offsets = tokenize(string)
+        formula, position, error = Formula._parse_tokens(tokens)
+        if formula is not None and position < len(tokens):
+            error = _unexpected(tokens[position])
+        if error:
+            return ParseError(offsets[position], error)
+        return formula
 
     @staticmethod
     def is_formula(string: str) -> bool:
@@ -294,15 +610,7 @@ class Formula:
             representation of a formula, `False` otherwise.
         """
         # Task 1.5
-        prefix, suffix = Formula._parse_prefix(string)
-        while suffix:
-            try:
-                prefix, suffix = Formula._parse_prefix(suffix)
-            except:
-                return False
-            if suffix.split(" ")[0] == "Unexpected":
-                return False
-        return True
+        return isinstance(Formula.try_parse(string), Formula)
 
     @staticmethod
     def parse(string: str) -> Formula:
@@ -314,9 +622,10 @@ class Formula:
         Returns:
             A formula whose standard string representation is the given string.
         """
-        assert Formula.is_formula(string)
         # Task 1.6
-        return Formula._parse_prefix(string)[0]
+        formula = Formula.try_parse(string)
+        assert isinstance(formula, Formula), str(formula)
+        return formula
 
     def polish(self) -> str:
         """Computes the polish notation representation of the current formula.
@@ -325,24 +634,54 @@ class Formula:
             The polish notation representation of the current formula.
         """
         # Optional Task 1.7
-        if is_unary(self.root):
-            first = self.first
-            if isinstance(first, Formula):
-                first = Formula.polish(first)
-            string = self.root + str(first)
-        elif is_binary(self.root):
-            first = self.first
-            if isinstance(first, Formula):
-                first = Formula.polish(first)
-
-            second = self.second
-            if isinstance(second, Formula):
-                second = Formula.polish(second)
-
-            string = self.root + str(first) + str(second)
-        else:
-            string = self.root
-        return string
+        return self._write(polish=True)
+
+    @staticmethod
+    def _parse_polish_tokens(
+        tokens: Sequence[str], start: int = 0
+    ) -> Tuple[Optional[Formula], int, str]:
+        """Parses a prefix of the given tokens in polish notation, starting from
+        the given index, into a formula.
+
+        Like `_parse_tokens`, the parsing uses an explicit stack rather than
+        recursion.
+
+        Parameters:
+            tokens: tokens of the polish notation representation of a formula,
+                as returned by `tokenize`.
+            start: index of the first token to parse.
+
+        Returns:
+            A triplet of the parsed formula, the index of the first unparsed
+            token, and an empty string. If no prefix of the given tokens is a
+            valid polish notation representation of a formula, then the triplet
+            consists of ``None``, the index of the offending token, and a
+            human-readable error message.
+        """
+        # Pending operators, each a list of the operator followed by the
+        # operands parsed for it so far.
+        stack: List[List[Any]] = []
+        length = len(tokens)
+        position = start
+        while True:
+            token = tokens[position] if position < length else ""
+            if is_unary(token) or is_binary(token):
+                stack.append([token])
+                position += 1
+                continue
+            if not token or not (is_variable(token) or is_constant(token)):
+                return None, position, _unexpected(token)
+            formula = Formula(token)
+            position += 1
+            while stack:
+                pending = stack[-1]
+                pending.append(formula)
+                if len(pending) == 2 and is_binary(pending[0]):
+                    break
+                stack.pop()
+                formula = Formula(*pending)
+            else:
+                return formula, position, ""
 
     @staticmethod
     def _parse_polish_prefix(string: str) -> Tuple[Union[Formula, None], str]:
@@ -353,21 +692,15 @@ class Formula:
 
         Returns:
             A pair containing a formula whose polish notation representation is
-            the given string and the uparsed suffix of the string.
+            the given string and the uparsed suffix of the string. If no prefix
+            of the given string is a valid polish notation representation of a
+            formula, then the pair consists of ``None`` and an error message.
         """
-        prefix, suffix = split_str(string)
-        if is_variable(prefix) or is_constant(prefix):
-            return Formula(prefix), suffix
-        elif suffix:
-            first, suffix = Formula._parse_polish_prefix(suffix)
-
-            if is_unary(prefix):
-                return Formula(prefix, first), suffix
-            elif is_binary(prefix):
-                second, suffix = Formula._parse_polish_prefix(suffix)
-                return Formula(prefix, first, second), suffix
-        else:
-            return prefix, suffix
+        tokens, offsets = tokenize(string)
+        formula, position, error = Formula._parse_polish_tokens(tokens)
+        if formula is None:
+            return None, str(ParseError(offsets[position], error))
+        return formula, string[offsets[position] :]
 
     @staticmethod
     def parse_polish(string: str) -> Formula:
@@ -382,6 +715,45 @@ class Formula:
         # Optional Task 1.8
         return Formula._parse_polish_prefix(string)[0]
 
+    @staticmethod
+    def combine(operator: str, operands: Iterable[Formula]) -> Formula:
+        """Combines the given formulas with the given binary operator into a
+        balanced formula.
+
+        The formula is built bottom-up by pairing adjacent operands, so it
+        takes time linear in the number of operands, and its depth is
+        logarithmic in it rather than linear, as in a left- or right-deep
+        chain.
+
+        Parameters:
+            operator: binary operator to combine with, typically an
+                associative one such as '&' or '|'.
+            operands: nonempty iterable over the formulas to combine.
+
+        Returns:
+            A formula whose operands under the given operator are the given
+            formulas, in order. A single given formula is returned as is.
+
+        Examples:
+            >>> Formula.combine('&', [Formula(v) for v in 'pqrs'])
+            ((p&q)&(r&s))
+
+            >>> Formula.combine('|', [Formula(v) for v in 'pqr'])
+            ((p|q)|r)
+        """
+        assert is_binary(operator)
+        layer = list(operands)
+        assert len(layer) > 0
+        while len(layer) > 1:
+            paired = [
+                Formula(operator, layer[i], layer[i + 1])
+                for i in range(0, len(layer) - 1, 2)
+            ]
+            if len(layer) % 2 == 1:
+                paired.append(layer[-1])
+            layer = paired
+        return layer[0]
+
     def substitute_variables(
         self, substitution_map: Mapping[str, Formula]
     ) -> Formula:
@@ -407,21 +779,23 @@ class Formula:
         """
         for variable in substitution_map:
             assert is_variable(variable)
-            # TODO: Task 3.3
-            if self == Formula(variable):
-                return substitution_map[variable]
-            elif is_unary(self.root):
-                return Formula(
-                    self.root,
-                    Formula.substitute_variables(self.first, substitution_map),
-                )
-            elif is_binary(self.root):
-                return Formula(
-                    self.root,
-                    Formula.substitute_variables(self.first, substitution_map),
-                    Formula.substitute_variables(self.second, substitution_map),
-                )
-        return self
+        # TODO: Task 3.3
+        if not substitution_map:
+            return self
+
+        def substitute(
+            formula: Formula,
+            first: Optional[Formula],
+            second: Optional[Formula],
+        ) -> Formula:
+            if formula.first is None:
+                return substitution_map.get(formula.root, formula)
+            if first is formula.first and second is formula.second:
+                # Nothing was substituted below, so reuse the subformula.
+                return formula
+            return Formula(formula.root, first, second)
+
+        return self.fold(substitute)
 
     def substitute_operators(
         self, substitution_map: Mapping[str, Formula]
@@ -457,52 +831,91 @@ class Formula:
             ), str(operator)
             assert substitution_map[operator].variables().issubset({"p", "q"})
         # TODO: Task 3.4
-        substitution_map = {
-            operator: substitution_map[operator]
-            for operator in substitution_map
-            if operator in Formula.operators(self)
+        templates = {
+            operator: Formula._compile_schema(schema)
+            for operator, schema in substitution_map.items()
         }
-        if substitution_map:
-            if is_constant(str(self)):
-                return substitution_map[str(self)]
+
+        def substitute(
+            formula: Formula,
+            first: Optional[Formula],
+            second: Optional[Formula],
+        ) -> Formula:
+            template = templates.get(formula.root)
+            if template is not None:
+                return Formula._instantiate(template, first, second)
+            if first is formula.first and second is formula.second:
+                # Nothing was substituted below, so reuse the subformula.
+                return formula
+            return Formula(formula.root, first, second)
+
+        return self.fold(substitute)
+
+    @staticmethod
+    def _compile_schema(schema: Formula) -> _Template:
+        """Compiles the given substitution schema of `substitute_operators`
+        into a template that can be instantiated without traversing the
+        schema again.
+
+        Parameters:
+            schema: formula over the variable names 'p' and 'q'.
+
+        Returns:
+            A pair of the construction steps of the schema and the index of the
+            step that builds the schema itself. Each step is a triplet of a
+            root and the indices of the steps that build its first and second
+            operands, or ``-1`` for a missing operand. Indices zero and one
+            stand for the first and second operands that the schema is applied
+            to, and the steps themselves are numbered from two, in post-order.
+        """
+        steps: List[Tuple[str, int, int]] = []
+        indices: Dict[int, int] = {}
+        for formula in schema.postorder():
+            if formula.root == "p":
+                indices[id(formula)] = 0
+            elif formula.root == "q":
+                indices[id(formula)] = 1
             else:
-                if is_unary(self.root):
-                    if self.root in substitution_map:
-                        schema = substitution_map[self.root]
-                        first = Formula.substitute_operators(
-                            self.first, substitution_map
-                        )
-                        self = Formula.substitute_variables(
-                            schema, {"p": first}
-                        )
-                    else:
-                        self = Formula(
-                            self.root,
-                            Formula.substitute_operators(
-                                self.first, substitution_map
-                            ),
-                        )
-
-                if is_binary(self.root):
-                    if self.root in substitution_map:
-                        schema = substitution_map[self.root]
-                        first = Formula.substitute_operators(
-                            self.first, substitution_map
-                        )
-                        second = Formula.substitute_operators(
-                            self.second, substitution_map
-                        )
-                        self = Formula.substitute_variables(
-                            schema, {"p": first, "q": second}
-                        )
-                    else:
-                        self = Formula(
-                            self.root,
-                            Formula.substitute_operators(
-                                self.first, substitution_map
-                            ),
-                            Formula.substitute_operators(
-                                self.second, substitution_map
-                            ),
-                        )
-        return self
+                indices[id(formula)] = len(steps) + 2
+                steps.append(
+                    (
+                        formula.root,
+                        indices.get(id(formula.first), -1),
+                        indices.get(id(formula.second), -1),
+                    )
+                )
+        return steps, indices[id(schema)]
+
+    @staticmethod
+    def _instantiate(
+        template: _Template,
+        first: Optional[Formula],
+        second: Optional[Formula],
+    ) -> Formula:
+        """Applies the given compiled substitution schema to the given
+        operands.
+
+        Parameters:
+            template: schema compiled by `_compile_schema`.
+            first: formula to use for every occurrence of 'p' in the schema, or
+                ``None`` to keep such occurrences.
+            second: formula to use for every occurrence of 'q' in the schema,
+                or ``None`` to keep such occurrences.
+
+        Returns:
+            The schema with its variable names substituted.
+        """
+        steps, result = template
+        built = [
+            Formula("p") if first is None else first,
+            Formula("q") if second is None else second,
+        ]
+        for root, first_index, second_index in steps:
+            built.append(
+                Formula(
+                    root,
+                    None if first_index < 0 else built[first_index],
+                    None if second_index < 0 else built[second_index],
+                )
+            )
+        return built[result]
@@ -1,7 +1,7 @@
 """Python infrastructure for the Mathematical Logic through Programming book."""
 
 from functools import lru_cache, wraps
-from typing import Any, Callable, Dict, Iterator, Set, Type, TypeVar, cast
+from typing import Any, Callable, Dict, Iterator, Type, TypeVar, cast
 
 T = TypeVar("T")
 
@@ -10,6 +10,13 @@ def frozen(cls: Type[T]) -> Type[T]:
     """A class decorator that disallows assignment to instance variables after
     construction.
 
+    The constructors of the given class are expected to initialize instance
+    variables with `object.__setattr__`, which bypasses the check. Classes that
+    also declare ``__slots__`` are thus fully immutable, without a per-instance
+    dictionary and without any bookkeeping of the instances under
+    construction. Unpickling and copying restore instance variables the same
+    way.
+
     Parameters:
         cls: class to modify.
 
@@ -17,46 +24,37 @@ def frozen(cls: Type[T]) -> Type[T]:
         The given class, modified so that assignment to instance variable is
         disallowed after construction.
     """
-    original_init = cls.__init__
-    original_setattr = cls.__setattr__
-    original_delattr = cls.__delattr__
-    mutable_ids: Set[int] = set()
 
-    @wraps(cls.__setattr__)
     def setattr_wrapper(self, name, value):
-        if id(self) in mutable_ids:
-            original_setattr(self, name, value)
-        else:
-            raise Exception(
-                "Cannot assign to field '"
-                + name
-                + "' of immutable class '"
-                + cls.__name__
-                + "'"
-            )
-
-    @wraps(cls.__delattr__)
-    def delattr_wrapper(self, name, value):
-        if id(self) in mutable_ids:
-            original_delattr(self, name, value)
+        raise Exception(
+            "Cannot assign to field '"
+            + name
+            + "' of immutable class '"
+            + cls.__name__
+            + "'"
+        )
+
+    def delattr_wrapper(self, name):
+        raise Exception(
+            "Cannot delete field '"
+            + name
+            + "' of immutable class '"
+            + cls.__name__
+            + "'"
+        )
+
+    def setstate_wrapper(self, state):
+        if isinstance(state, tuple):
+            dict_state, slots_state = state
         else:
-            raise Exception(
-                "Cannot delete to field '"
-                + name
-                + "' of immutable class '"
-                + cls.__name__
-                + "'"
-            )
-
-    @wraps(cls.__init__)
-    def init_wrapper(self, *args, **kwargs):
-        mutable_ids.add(id(self))
-        original_init(self, *args, **kwargs)
-        mutable_ids.remove(id(self))
+            dict_state, slots_state = state, None
+        for variables in (dict_state, slots_state):
+            for name, value in (variables or {}).items():
+                object.__setattr__(self, name, value)
 
     setattr(cls, "__setattr__", setattr_wrapper)
     setattr(cls, "__delattr__", delattr_wrapper)
-    setattr(cls, "__init__", init_wrapper)
+    setattr(cls, "__setstate__", setstate_wrapper)
     return cls
 
 
@@ -79,9 +77,14 @@ class frozendict(Dict[Any, Any]):
 S = TypeVar("S")
 
 
-def memoized_parameterless_method(method: Callable[[T], S]) -> Callable[[T], S]:
-    """A method decorator for parameterclass methods of immutable classes that
-    memoizes the return value to avoid recalculation.
+def memoized_immutable_method(
+    method: Callable[[T], S]
+) -> Callable[[T], S]:
+    """A method decorator for parameterless methods of immutable classes that
+    memoizes the return value to avoid recalculation, without ever copying it.
+
+    The value is stored in the instance variable named by `memo_attribute`,
+    which classes that declare ``__slots__`` should include among them.
 
     Parameters:
         method: method to modify.
@@ -89,26 +92,43 @@ def memoized_parameterless_method(method: Callable[[T], S]) -> Callable[[T], S]:
     Returns:
         The given method, modified so that after its first execution, its
         functionality is replaced with simply returning the value calculated by
-        its first execution. If the value calculated by the given method has a
-        `copy`\ ``()`` method, then instead of returning this value, each
-        execution of the returned method, including the first one, makes a fresh
-        call to this `copy` ``()`` method and returns the result.
+        its first execution. If that value is a `set`, then it is converted
+        once into a `frozenset`, so that the same immutable value can be
+        returned by every execution.
     """
-    methodname = method.__name__
+    attribute = memo_attribute(method.__name__)
 
     @wraps(method)
     def wrapper(obj):
-        value = method(obj)
-        if hasattr(value, "copy"):
-            new_wrapper = lambda: value.copy()
-        else:
-            new_wrapper = lambda: value
-        object.__setattr__(obj, methodname, wraps(method)(new_wrapper))
-        return new_wrapper()
+        try:
+            return getattr(obj, attribute)
+        except AttributeError:
+            value = method(obj)
+            if isinstance(value, set):
+                value = frozenset(value)
+            object.__setattr__(obj, attribute, value)
+            return value
 
     return wrapper
 
 
+def memo_attribute(method_name: str) -> str:
+    """Computes the name of the instance variable in which
+    `memoized_immutable_method` stores the value of the given method.
+
+    Parameters:
+        method_name: name of the memoized method.
+
+    Returns:
+        The name of the instance variable that stores the memoized value.
+
+    Examples:
+        >>> memo_attribute('__repr__')
+        '_memoized_repr'
+    """
+    return "_memoized_" + method_name.strip("_")
+
+
 class __prefix_with_index_sequence_generator:
     """A generator for a sequence of the form 'z1', 'z2', 'z3', ..., where the
     prefix 'z' is customizable."""
@@ -0,0 +1,51 @@
+"""Tests for the propositions.arena module."""
+
+import pickle
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import all_models, evaluate
+from logic.propositions.arena import FormulaArena
+
+ARENA_TESTS = [
+    "x12",
+    "T",
+    "~F",
+    "(p|(q->~p))",
+    "((p&q)|(p&q))",
+    "~((~x17->p)&~~(~F|~q))",
+    "(((p+q)<->(q-&r))-|~(r->T))",
+]
+
+
+def test_from_to_formula(debug=False):
+    for infix in ARENA_TESTS:
+        if debug:
+            print("Testing arena round trip of", infix)
+        formula = Formula.parse(infix)
+        arena = FormulaArena.from_formula(formula)
+        assert arena.to_formula() is formula
+        assert str(arena) == infix
+        assert pickle.loads(pickle.dumps(arena)) == arena
+    arena = FormulaArena.from_formula(Formula.parse("((p&q)|(p&q))"))
+    assert len(arena) == 4
+    assert list(arena.opcodes)[-1] == 5
+
+
+def test_variables(debug=False):
+    for infix in ARENA_TESTS:
+        if debug:
+            print("Testing arena variables of", infix)
+        formula = Formula.parse(infix)
+        assert FormulaArena.from_formula(formula).variables() == set(
+            formula.variables()
+        )
+
+
+def test_evaluate(debug=False):
+    for infix in ARENA_TESTS:
+        formula = Formula.parse(infix)
+        arena = FormulaArena.from_formula(formula)
+        for model in all_models(sorted(formula.variables())):
+            if debug:
+                print("Testing arena evaluation of", infix, "in", model)
+            assert arena.evaluate(model) == evaluate(formula, model)
@@ -0,0 +1,169 @@
+"""Tests for the propositions.bdd module."""
+
+import random
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import (
+    all_models,
+    evaluate,
+    is_contradiction,
+    is_satisfiable,
+    is_tautology,
+    truth_values,
+)
+from logic.propositions.bdd import BDDManager, is_equivalent
+
+
+def random_formula(rng: random.Random) -> Formula:
+    formulas = [Formula("x" + str(i)) for i in range(rng.randint(1, 6))]
+    formulas += [Formula("T"), Formula("F")]
+    for _ in range(rng.randint(0, 12)):
+        if rng.random() < 0.2:
+            formulas.append(Formula("~", rng.choice(formulas)))
+        else:
+            operator = rng.choice(("&", "|", "->", "+", "<->", "-&", "-|"))
+            first, second = rng.choice(formulas), rng.choice(formulas)
+            formulas.append(Formula(operator, first, second))
+    return formulas[-1]
+
+
+def test_from_formula(debug=False):
+    rng = random.Random(0)
+    manager = BDDManager()
+    for _ in range(300):
+        formula = random_formula(rng)
+        if debug:
+            print("Testing from_formula on", formula)
+        diagram = manager.from_formula(formula)
+        variables = sorted(formula.variables())
+        values = list(truth_values(formula, all_models(variables)))
+        assert diagram.support().issubset(variables)
+        assert diagram.count_models(variables) == sum(values)
+        assert diagram.is_tautology() == all(values)
+        assert diagram.is_contradiction() == (not any(values))
+        model = diagram.model()
+        assert (model is None) == diagram.is_contradiction()
+        if model is not None:
+            assert set(model) == set(manager.variables)
+            assert evaluate(formula, model)
+        for check in (is_tautology, is_contradiction, is_satisfiable):
+            assert check(formula, method="bdd") == check(formula)
+
+
+def test_canonicity(debug=False):
+    manager = BDDManager()
+    p, q, r = (manager.variable(name) for name in "pqr")
+    if debug:
+        print("Testing canonicity of", manager)
+    assert p & q == q & p
+    assert ~(p & q) == ~p | ~q
+    assert (p ^ q) ^ r == p ^ (q ^ r)
+    assert ~~p == p
+    assert p | ~p == manager.true
+    assert p & ~p == manager.false
+    assert manager.ite(p, q, r) == (p & q) | (~p & r)
+    assert manager.from_formula(Formula.parse("(p->q)")) == ~p | q
+    assert len(manager.true) == 1
+    assert len(p) == 2
+    assert len(p ^ q) == len(~(p ^ q)) == 3
+    assert is_equivalent(
+        Formula.parse("((p->q)&(q->r))"),
+        Formula.parse("((~p|q)&~(q&~r))"),
+    )
+    assert not is_equivalent(Formula.parse("(p->q)"), Formula.parse("(q->p)"))
+    assert is_equivalent(Formula.parse("(p|~p)"), Formula.parse("T"))
+
+
+def test_many_variables(debug=False):
+    n = 300
+    names = ["x" + str(i) for i in range(n)]
+    parity = Formula.combine("+", map(Formula, names))
+    if debug:
+        print("Testing a parity of", n, "variable names")
+    manager = BDDManager()
+    diagram = manager.from_formula(parity)
+    assert len(diagram) == n + 1
+    assert diagram.count_models() == 2 ** (n - 1)
+    assert diagram.count_models(names + ["y"]) == 2**n
+    assert (~diagram).count_models() == 2 ** (n - 1)
+    assert not diagram.is_tautology() and diagram.is_satisfiable()
+    assert manager.from_formula(Formula("~", parity)) == ~diagram
+    chain = Formula.combine(
+        "&",
+        (
+            Formula("->", Formula(first), Formula(second))
+            for first, second in zip(names, names[1:])
+        ),
+    )
+    # The models of the chain of implications are the n + 1 monotone ones.
+    assert manager.from_formula(chain).count_models(names) == n + 1
+
+
+def test_variable_order(debug=False):
+    n = 8
+    formula = Formula.combine(
+        "|",
+        (
+            Formula("&", Formula("x" + str(i)), Formula("y" + str(i)))
+            for i in range(n)
+        ),
+    )
+    interleaved = BDDManager()
+    good = interleaved.from_formula(formula)
+    assert interleaved.variables[:4] == ("x0", "y0", "x1", "y1")
+    separated = BDDManager(
+        ["x" + str(i) for i in range(n)] + ["y" + str(i) for i in range(n)]
+    )
+    bad = separated.copy(good)
+    if debug:
+        print("Testing reordering from", len(good), "to", len(bad), "nodes")
+    assert bad == separated.from_formula(formula)
+    assert len(good) == 2 * n + 1
+    assert len(bad) > 2**n
+    assert interleaved.copy(bad) == good
+    assert bad.count_models() == good.count_models()
+
+
+def test_collect_garbage(debug=False):
+    rng = random.Random(1)
+    manager = BDDManager()
+    kept = []
+    for _ in range(50):
+        formula = random_formula(rng)
+        diagram = manager.from_formula(formula)
+        models = diagram.count_models(formula.variables())
+        kept.append((formula, diagram, models))
+        for _ in range(5):
+            manager.from_formula(random_formula(rng))
+    before = len(manager)
+    freed = manager.collect_garbage()
+    if debug:
+        print("Collected", freed, "of", before, "nodes")
+    assert freed > 0 and len(manager) == before - freed
+    assert manager.collect_garbage() == 0
+    for formula, diagram, models in kept:
+        assert manager.from_formula(formula) == diagram
+        assert diagram.count_models(formula.variables()) == models
+    del kept, diagram
+    manager.collect_garbage()
+    assert len(manager) == 1
+
+
+def test_collect_garbage_equal_handles(debug=False):
+    formula = Formula.parse("((p&q)|(r+s))")
+    manager = BDDManager()
+    first = manager.from_formula(formula)
+    second = manager.from_formula(formula)
+    assert first == second and first is not second
+    if debug:
+        print("Testing collection after dropping one of two equal handles")
+    del first
+    manager.collect_garbage()
+    assert len(manager) > 1
+    assert second.count_models() == 10
+    for model in all_models(["p", "q", "r", "s"]):
+        conjunction = second
+        for name, value in model.items():
+            literal = manager.variable(name)
+            conjunction &= literal if value else ~literal
+        assert conjunction.is_satisfiable() == evaluate(formula, model)
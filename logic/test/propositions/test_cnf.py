@@ -0,0 +1,98 @@
+"""Tests for the propositions.cnf module."""
+
+import itertools
+import random
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import all_models, evaluate
+from logic.propositions.cnf import ClauseDatabase, tseitin
+
+CNF_TESTS = [
+    "x12",
+    "T",
+    "F",
+    "~T",
+    "(p&~p)",
+    "(p|(q->~p))",
+    "((p&q)|(p&q))",
+    "~((~x17->p)&~~(~F|~q))",
+    "(((p+q)<->(q-&r))-|~(r->T))",
+    "((p|~q)&((q|F)&(r|T)))",
+]
+
+
+def random_formula(rng: random.Random) -> Formula:
+    formulas = [Formula("x" + str(i)) for i in range(rng.randint(1, 4))]
+    formulas += [Formula("T"), Formula("F")]
+    for _ in range(rng.randint(0, 7)):
+        if rng.random() < 0.25:
+            formulas.append(Formula("~", rng.choice(formulas)))
+        else:
+            operator = rng.choice(("&", "|", "->", "+", "<->", "-&", "-|"))
+            first, second = rng.choice(formulas), rng.choice(formulas)
+            formulas.append(Formula(operator, first, second))
+    return formulas[-1]
+
+
+def is_satisfied(database: ClauseDatabase, values) -> bool:
+    return all(
+        any(values[abs(literal) - 1] == (literal > 0) for literal in clause)
+        for clause in database
+    )
+
+
+def test_tseitin(debug=False):
+    rng = random.Random(0)
+    formulas = [Formula.parse(infix) for infix in CNF_TESTS]
+    formulas += [random_formula(rng) for _ in range(300)]
+    for formula in formulas:
+        for polarity_aware in (False, True):
+            if debug:
+                print("Testing tseitin on", formula, polarity_aware)
+            database = tseitin(formula, polarity_aware)
+            assert database.names == sorted(formula.variables())
+            auxiliaries = database.n_variables - len(database.names)
+            for model in all_models(database.names):
+                values = [model[name] for name in database.names]
+                assert evaluate(formula, model) == any(
+                    is_satisfied(database, values + list(extension))
+                    for extension in itertools.product(
+                        (False, True), repeat=auxiliaries
+                    )
+                )
+
+
+def test_linear_size(debug=False):
+    # A chain of equivalences has an exponentially large equivalent CNF.
+    formula = Formula("p0")
+    for i in range(1, 200):
+        formula = Formula("<->", formula, Formula("p" + str(i)))
+    if debug:
+        print("Testing the size of tseitin on a chain of equivalences")
+    full = tseitin(formula)
+    assert full.n_variables == 200 + 199
+    assert len(full) == 4 * 199 + 1
+    assert len(tseitin(formula, polarity_aware=True)) < len(full)
+    conjunction = Formula.combine(
+        "&", [Formula.parse("(p{0}|~q{0})".format(i)) for i in range(100)]
+    )
+    database = tseitin(conjunction, polarity_aware=True)
+    assert database.n_variables == 200 and len(database) == 100
+
+
+def test_clause_database(debug=False):
+    if debug:
+        print("Testing the clause database")
+    database = ClauseDatabase(["p", "q"])
+    assert database.n_variables == 2 and len(database) == 0
+    assert database.new_variable() == 3
+    database.add_clause([1, -3])
+    database.add_clause([])
+    database.add_clause((-2, 3, 1))
+    assert len(database) == 3
+    assert list(database.literals) == [1, -3, -2, 3, 1]
+    assert list(database.offsets) == [0, 2, 2, 5]
+    assert [list(clause) for clause in database] == [[1, -3], [], [-2, 3, 1]]
+    assert list(database[2]) == [-2, 3, 1]
+    assert database.numbers == {"p": 1, "q": 2}
+    assert database.decode([True, False, True]) == {"p": True, "q": False}
@@ -0,0 +1,86 @@
+"""Tests for the propositions.counting module."""
+
+import random
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import all_models, truth_values
+from logic.propositions.reductions import graph3coloring_to_formula
+from logic.propositions.counting import COUNTERS, count_models
+
+
+def random_formula(rng: random.Random) -> Formula:
+    formulas = [Formula("x" + str(i)) for i in range(rng.randint(1, 6))]
+    formulas += [Formula("T"), Formula("F")]
+    for _ in range(rng.randint(0, 12)):
+        if rng.random() < 0.2:
+            formulas.append(Formula("~", rng.choice(formulas)))
+        else:
+            operator = rng.choice(("&", "|", "->", "+", "<->", "-&", "-|"))
+            first, second = rng.choice(formulas), rng.choice(formulas)
+            formulas.append(Formula(operator, first, second))
+    return formulas[-1]
+
+
+def test_count_models(debug=False):
+    rng = random.Random(0)
+    formulas = [Formula.parse(infix) for infix in ("T", "F", "(p|~p)")]
+    formulas += [random_formula(rng) for _ in range(300)]
+    for formula in formulas:
+        if debug:
+            print("Testing count_models on", formula)
+        variables = sorted(formula.variables())
+        models = sum(truth_values(formula, all_models(variables)))
+        assert count_models(formula) == models
+        for method in COUNTERS:
+            assert count_models(formula, method=method) == models
+            assert (
+                count_models(formula, variables + ["y1", "y2"], method)
+                == 4 * models
+            )
+
+
+def test_count_models_many_variables(debug=False):
+    n = 80
+    names = ["x" + str(i) for i in range(n)]
+    # Each of the n / 2 pairs of variable names has 3 models.
+    pairs = Formula.combine(
+        "&",
+        (
+            Formula("|", Formula(names[i]), Formula(names[i + 1]))
+            for i in range(0, n, 2)
+        ),
+    )
+    chain = Formula.combine(
+        "&",
+        (
+            Formula("->", Formula(first), Formula(second))
+            for first, second in zip(names, names[1:])
+        ),
+    )
+    parity = Formula.combine("+", map(Formula, names))
+    first_false = Formula("&", pairs, Formula("~", Formula(names[0])))
+    for formula, models in (
+        (pairs, 3 ** (n // 2)),
+        (chain, n + 1),
+        (parity, 2 ** (n - 1)),
+        (first_false, 3 ** (n // 2 - 1)),
+    ):
+        if debug:
+            print("Testing count_models on a formula of", n, "variable names")
+        assert count_models(formula) == models
+        assert count_models(formula, method="bdd") == models
+
+
+def test_count_models_colorings(debug=False):
+    # A path with 4 vertices has 3 * 2 ** 3 colorings, and a triangle has 3!.
+    for graph, colorings in (
+        ((4, frozenset({(1, 2), (2, 3), (3, 4)})), 24),
+        ((3, frozenset({(1, 2), (2, 3), (1, 3)})), 6),
+        ((6, frozenset()), 3**6),
+        ((4, frozenset({(1, 2), (1, 3), (1, 4), (2, 3), (2, 4), (3, 4)})), 0),
+    ):
+        if debug:
+            print("Testing count_models on the coloring of", graph)
+        formula = graph3coloring_to_formula(graph)
+        for method in COUNTERS:
+            assert count_models(formula, method=method) == colorings
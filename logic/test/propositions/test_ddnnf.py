@@ -0,0 +1,192 @@
+"""Tests for the propositions.ddnnf module."""
+
+import os
+import pickle
+import random
+import tempfile
+from fractions import Fraction
+
+import pytest
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import all_models, evaluate
+from logic.propositions.reductions import graph3coloring_to_formula
+from logic.propositions.ddnnf import (
+    CONJUNCTION,
+    DISJUNCTION,
+    LITERAL,
+    compile_ddnnf,
+    read_nnf,
+    write_nnf,
+)
+
+
+def random_formula(rng: random.Random) -> Formula:
+    formulas = [Formula("x" + str(i)) for i in range(rng.randint(1, 6))]
+    formulas += [Formula("T"), Formula("F")]
+    for _ in range(rng.randint(0, 12)):
+        if rng.random() < 0.2:
+            formulas.append(Formula("~", rng.choice(formulas)))
+        else:
+            operator = rng.choice(("&", "|", "->", "+", "<->", "-&", "-|"))
+            first, second = rng.choice(formulas), rng.choice(formulas)
+            formulas.append(Formula(operator, first, second))
+    return formulas[-1]
+
+
+def test_compile_ddnnf(debug=False):
+    rng = random.Random(0)
+    formulas = [Formula.parse(infix) for infix in ("T", "F", "(p|~p)", "p")]
+    formulas += [random_formula(rng) for _ in range(300)]
+    for formula in formulas:
+        if debug:
+            print("Testing compile_ddnnf on", formula)
+        circuit = compile_ddnnf(formula)
+        variables = sorted(formula.variables())
+        assert circuit.names == tuple(variables)
+        expected = [
+            dict(model)
+            for model in all_models(variables)
+            if evaluate(formula, model)
+        ]
+        models = list(circuit.models())
+        assert sorted(map(sorted, map(dict.items, models))) == sorted(
+            map(sorted, map(dict.items, expected))
+        )
+        assert circuit.count_models() == len(expected)
+        assert circuit.is_satisfiable() == bool(expected)
+        for variable in variables:
+            for value in (False, True):
+                condition = {variable: value}
+                agreeing = [
+                    model for model in expected if model[variable] == value
+                ]
+                assert circuit.count_models(condition) == len(agreeing)
+                assert circuit.is_satisfiable(condition) == bool(agreeing)
+                assert list(circuit.models(condition)) == [
+                    model for model in models if model[variable] == value
+                ]
+
+
+def test_circuit_properties(debug=False):
+    rng = random.Random(1)
+    for _ in range(100):
+        formula = random_formula(rng)
+        circuit = compile_ddnnf(formula)
+        if debug:
+            print("Testing the circuit", circuit, "of", formula)
+        # The variables mentioned by each node.
+        mentioned = []
+        for node, kind in enumerate(circuit.kinds):
+            children = circuit.children[
+                circuit.offsets[node] : circuit.offsets[node + 1]
+            ]
+            assert all(child < node for child in children)
+            if kind == LITERAL:
+                assert not children
+                mentioned.append({abs(circuit.values[node])})
+                continue
+            sets = [mentioned[child] for child in children]
+            union = set().union(*sets)
+            if kind == CONJUNCTION:
+                assert sum(map(len, sets)) == len(union)
+            else:
+                assert kind == DISJUNCTION
+                assert all(child_set == union for child_set in sets)
+            mentioned.append(union)
+        if circuit.is_satisfiable():
+            assert mentioned[-1] == set(range(1, circuit.n_variables + 1))
+
+
+def test_weighted_count(debug=False):
+    formula = graph3coloring_to_formula((4, frozenset({(1, 2), (2, 3)})))
+    circuit = compile_ddnnf(formula)
+    if debug:
+        print("Testing weighted_count on", circuit)
+    assert circuit.count_models() == 3 * 2 * 2 * 3
+    assert circuit.weighted_count({}) == circuit.count_models()
+    half = {name: (Fraction(1, 2), Fraction(1, 2)) for name in circuit.names}
+    assert circuit.weighted_count(half) == Fraction(
+        circuit.count_models(), 2 ** len(circuit.names)
+    )
+    rng = random.Random(2)
+    weights = {name: (rng.randint(1, 5), rng.randint(1, 5)) for name in "pqr"}
+    formula = Formula.parse("((p|q)->~r)")
+    expected = 0
+    for model in all_models(["p", "q", "r"]):
+        if evaluate(formula, model):
+            product = 1
+            for name, value in model.items():
+                product *= weights[name][0 if value else 1]
+            expected += product
+    circuit = compile_ddnnf(formula)
+    assert circuit.weighted_count(weights) == expected
+    assert circuit.weighted_count(weights, {"r": True}) == (
+        weights["r"][0] * weights["p"][1] * weights["q"][1]
+    )
+
+
+def test_serialization(debug=False):
+    formula = graph3coloring_to_formula(
+        (6, frozenset({(1, 2), (2, 3), (3, 4), (4, 5), (5, 6), (1, 6)}))
+    )
+    circuit = compile_ddnnf(formula)
+    if debug:
+        print("Testing serialization of", circuit)
+    assert pickle.loads(pickle.dumps(circuit)) == circuit
+    file = tempfile.NamedTemporaryFile(suffix=".nnf", delete=False)
+    file.close()
+    path = file.name
+    try:
+        write_nnf(path, circuit)
+        with open(path) as file:
+            text = file.read()
+        assert text.startswith("c names 18\nc var 1 x11\n")
+        header = "nnf {} {} {}\n".format(
+            len(circuit), len(circuit.children), circuit.n_variables
+        )
+        assert header in text
+        loaded = read_nnf(path)
+        assert loaded == circuit
+        assert hash(loaded) == hash(circuit)
+        # The 3-colorings of a cycle of 6 vertices number 2 ** 6 + 2.
+        assert loaded.count_models() == 2**6 + 2
+
+        for infix in ("T", "F", "(T|F)"):
+            if debug:
+                print("Testing serialization of the circuit of", infix)
+            constant = compile_ddnnf(Formula.parse(infix))
+            write_nnf(path, constant)
+            loaded = read_nnf(path)
+            assert loaded == constant
+            assert loaded.names == ()
+            assert loaded.count_models() == (infix != "F")
+
+        # A circuit written by another compiler, without variable names.
+        with open(path, "w") as file:
+            file.write(
+                "nnf 7 6 2\nL 1\nL 2\nA 2 0 1\nL -1\nL -2\nA 2 3 4\n"
+                "O 1 2 2 5\n"
+            )
+        loaded = read_nnf(path)
+        assert loaded.names == ("x1", "x2")
+        assert list(loaded.models()) == [
+            {"x1": True, "x2": True},
+            {"x1": False, "x2": False},
+        ]
+        for text in (
+            "",
+            "p cnf 1 1\n",
+            "nnf 1 0 1\nL 2\n",
+            "nnf 1 1 1\nA 1 0\n",
+            "nnf 2 0 1\nL 1\n",
+            "nnf 1 0 1\nX 1\n",
+            "nnf 0 0 0\n",
+            "c names 1\nnnf 1 0 1\nL 1\n",
+        ):
+            with open(path, "w") as file:
+                file.write(text)
+            with pytest.raises(ValueError):
+                read_nnf(path)
+    finally:
+        os.remove(path)
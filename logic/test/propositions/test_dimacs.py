@@ -0,0 +1,147 @@
+"""Tests for the propositions.dimacs module."""
+
+import os
+import tempfile
+
+import pytest
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import evaluate, is_satisfiable
+from logic.propositions.cnf import ClauseDatabase, tseitin
+from logic.propositions.sat import Solver
+from logic.propositions.reductions import graph3coloring_to_formula
+from logic.propositions.dimacs import read_dimacs, write_dimacs
+
+
+def _temporary_path():
+    file = tempfile.NamedTemporaryFile(suffix=".cnf", delete=False)
+    file.close()
+    return file.name
+
+
+def _write_text(text):
+    path = _temporary_path()
+    with open(path, "w") as file:
+        file.write(text)
+    return path
+
+
+def test_round_trip(debug=False):
+    for infix in [
+        "(p|(q->~p))",
+        "~((~x17->p)&~~(~F|~q))",
+        "((p+q)&((q+r)&(r+p)))",
+        "((x1|~x2)&(x2|F))",
+        "T",
+        "F",
+        "(T|F)",
+    ]:
+        formula = Formula.parse(infix)
+        path = _temporary_path()
+        try:
+            for polarity_aware in (False, True):
+                if debug:
+                    print("Testing DIMACS round trip of", formula)
+                database = tseitin(formula, polarity_aware)
+                write_dimacs(path, formula, polarity_aware)
+                read = read_dimacs(path)
+                assert read.names == database.names
+                assert read.n_variables == database.n_variables
+                assert read.literals == database.literals
+                assert read.offsets == database.offsets
+                values = Solver(read.n_variables, read).solve()
+                assert (values is not None) == is_satisfiable(formula)
+                if values is not None:
+                    assert evaluate(formula, read.decode(values))
+        finally:
+            os.remove(path)
+
+
+def test_graph3coloring(debug=False):
+    n_vertices = 50
+    edges = frozenset((i, i % n_vertices + 1) for i in range(1, n_vertices + 1))
+    formula = graph3coloring_to_formula((n_vertices, edges))
+    if debug:
+        print("Testing DIMACS export of a 3-coloring formula")
+    path = _temporary_path()
+    try:
+        write_dimacs(path, formula)
+        with open(path) as file:
+            header = [line for line in file if line.startswith("p")]
+        assert header == ["p cnf 150 350\n"]
+        database = read_dimacs(path)
+        assert database.names == sorted(formula.variables())
+        values = Solver(database.n_variables, database).solve()
+        assert evaluate(formula, database.decode(values))
+    finally:
+        os.remove(path)
+
+
+def test_read_dimacs(debug=False):
+    path = _write_text(
+        "c A standard benchmark.\n"
+        "p cnf 3 4\n"
+        " 1 -2\n"
+        "3 0 -1 0\n"
+        "\n"
+        "2 -3 0 1 2 3\n"
+        "%\n"
+        "0\n"
+    )
+    try:
+        if debug:
+            print("Testing read_dimacs on a file without variable names")
+        database = read_dimacs(path)
+        assert database.names == ["x1", "x2", "x3"]
+        assert [list(clause) for clause in database] == [
+            [1, -2, 3],
+            [-1],
+            [2, -3],
+            [1, 2, 3],
+        ]
+    finally:
+        os.remove(path)
+    path = _write_text("c names 0\np cnf 1 1\n1 0\n")
+    try:
+        if debug:
+            print("Testing read_dimacs on a file with no named variables")
+        database = read_dimacs(path)
+        assert database.names == []
+        assert database.n_variables == 1
+    finally:
+        os.remove(path)
+    for text in [
+        "1 2 0\n",
+        "p cnf 2 1\n1 3 0\n",
+        "p cnf 2 2\n1 2 0\n",
+        "c var 2 p\np cnf 2 1\n1 2 0\n",
+        "c var 1 a\np cnf 2 1\n1 2 0\n",
+        "c names 2\nc var 1 p\np cnf 2 1\n1 2 0\n",
+    ]:
+        if debug:
+            print("Testing read_dimacs on", repr(text))
+        path = _write_text(text)
+        try:
+            with pytest.raises(ValueError):
+                read_dimacs(path)
+        finally:
+            os.remove(path)
+
+
+def test_write_dimacs(debug=False):
+    if debug:
+        print("Testing write_dimacs of a clause database")
+    database = ClauseDatabase(["p", "q"], 3)
+    database.add_clause([1, -3])
+    database.add_clause([])
+    database.add_clause([-2])
+    path = _temporary_path()
+    try:
+        write_dimacs(path, database)
+        with open(path) as file:
+            assert file.read() == (
+                "c names 2\nc var 1 p\nc var 2 q\np cnf 3 3\n1 -3 0\n0\n"
+                "-2 0\n"
+            )
+    finally:
+        os.remove(path)
@@ -0,0 +1,64 @@
+"""Tests for the propositions.loading module."""
+
+import os
+import tempfile
+import weakref
+
+from logic.propositions.loading import iter_formulas, iter_formulas_in_buffer
+
+
+def _write_lines(lines):
+    file = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False)
+    with file:
+        file.write("\n".join(lines))
+    return file.name
+
+
+def test_iter_formulas(debug=False):
+    lines = ["(p|~q)", "(x&&y)", "", "  ~x12\r", "a", "((p|~q)->~x12)"]
+    path = _write_lines(lines)
+    try:
+        if debug:
+            print("Testing iter_formulas on", lines)
+        errors = []
+        formulas = list(
+            iter_formulas(path, on_error=lambda *error: errors.append(error))
+        )
+        assert [(n, str(f)) for n, f in formulas] == [
+            (1, "(p|~q)"),
+            (4, "~x12"),
+            (6, "((p|~q)->~x12)"),
+        ]
+        assert [(n, e.offset) for n, e in errors] == [(2, 3), (5, 0)]
+        assert [str(f) for _, f in iter_formulas(path)] == [
+            "(p|~q)",
+            "~x12",
+            "((p|~q)->~x12)",
+        ]
+    finally:
+        os.remove(path)
+
+
+def test_iter_formulas_empty(debug=False):
+    path = _write_lines([])
+    try:
+        if debug:
+            print("Testing iter_formulas on an empty file")
+        assert list(iter_formulas(path)) == []
+    finally:
+        os.remove(path)
+
+
+def test_iter_formulas_in_buffer_intern(debug=False):
+    buffer = b"((x71&x72)|r)\n~s\n~(x71&x72)\n"
+    for intern in (True, False):
+        if debug:
+            print("Testing iter_formulas_in_buffer with intern =", intern)
+        formulas = iter_formulas_in_buffer(buffer, intern=intern)
+        # No strong reference to the first formula is kept here.
+        first = weakref.ref(next(formulas)[1].first)
+        next(formulas)
+        if intern:
+            assert first() is next(formulas)[1].first
+        else:
+            assert first() is None
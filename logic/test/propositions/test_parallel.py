@@ -0,0 +1,54 @@
+"""Tests for the propositions.parallel module."""
+
+from logic.propositions.syntax import Formula
+from logic.propositions.proofs import InferenceRule
+from logic.propositions.semantics import (
+    ModelSpace,
+    is_contradiction,
+    is_satisfiable,
+    is_sound_inference,
+    is_tautology,
+)
+from logic.propositions.parallel import search_truth_value
+
+#: Variable names of the tested formulas, enough for several shards of whole
+#: chunks of models.
+VARIABLES = ["x" + str(i) for i in range(19)]
+
+
+def test_search_truth_value(debug=False):
+    conjunction = Formula.combine("&", [Formula(v) for v in VARIABLES])
+    excluded_middle = Formula.combine(
+        "&", [Formula.parse("(" + v + "|~" + v + ")") for v in VARIABLES]
+    )
+    for formula, has_true, has_false in [
+        (conjunction, True, True),
+        (excluded_middle, True, False),
+        (Formula("~", excluded_middle), False, True),
+        (Formula.parse("(p->q)"), True, True),
+        (Formula("T"), True, False),
+    ]:
+        if debug:
+            print("Testing parallel search in", formula.variables())
+        assert search_truth_value(formula, True, 3) == has_true
+        assert search_truth_value(formula, False, 3) == has_false
+
+
+def test_workers(debug=False):
+    if debug:
+        print("Testing semantic checks with workers")
+    conjunction = Formula.combine("&", [Formula(v) for v in VARIABLES])
+    assert not is_tautology(conjunction, workers=2)
+    assert is_satisfiable(conjunction, workers=2)
+    assert not is_contradiction(conjunction, workers=2)
+    space = ModelSpace(VARIABLES, 0, 2 ** len(VARIABLES) - 1)
+    assert is_contradiction(conjunction, space, workers=2)
+    assert not is_satisfiable(conjunction, space.shard(1, 2), workers=2)
+    rule = InferenceRule(
+        [Formula(v) for v in VARIABLES], Formula.parse("(x0&x18)")
+    )
+    assert is_sound_inference(rule, workers=2)
+    rule = InferenceRule(
+        [Formula(v) for v in VARIABLES[1:]], Formula.parse("(x0&x18)")
+    )
+    assert not is_sound_inference(rule, workers=2)
@@ -0,0 +1,84 @@
+"""Tests for the propositions.reductions module."""
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import ModelSpace
+from logic.propositions.reductions import (
+    graph3coloring_to_formula,
+    is_valid_3coloring,
+    tricolor_graph,
+)
+
+TEST_GRAPHS = [
+    ((1, frozenset()), True),  # empty graph
+    ((3, frozenset()), True),  # empty graph
+    ((2, frozenset({(1, 2)})), True),  # single edge
+    ((3, frozenset({(1, 2), (1, 3), (2, 3)})), True),  # 3-clique
+    (
+        (4, frozenset({(1, 2), (1, 3), (2, 3), (1, 4), (2, 4), (3, 4)})),
+        False,
+    ),  # 4-clique
+    (
+        (4, frozenset({(1, 2), (1, 3), (2, 3), (1, 4), (2, 4)})),
+        True,
+    ),  # 4-clique - edge
+    (
+        (
+            5,
+            frozenset(
+                {(2, 3), (2, 4), (3, 4), (2, 5), (3, 5), (4, 5), (1, 2), (1, 4)}
+            ),
+        ),
+        False,
+    ),  # 4-clique + edges
+    ((5, frozenset({(1, 2), (2, 3), (3, 4), (4, 5), (5, 1)})), True),  # 5-cycle
+]
+
+
+def test_graph3coloring_to_formula_depth(debug=False):
+    n_vertices = 1000
+    edges = frozenset((i, i % n_vertices + 1) for i in range(1, n_vertices + 1))
+    graph = (n_vertices, edges)
+    if debug:
+        print("Testing the depth of graph3coloring_to_formula on a cycle")
+    formula = graph3coloring_to_formula(graph)
+    assert formula.fold(lambda _, a, b: 1 + max(a or 0, b or 0)) < 20
+
+
+def test_graph3coloring_to_formula_empty(debug=False):
+    if debug:
+        print("Testing graph3coloring_to_formula on a graph without vertices")
+    assert graph3coloring_to_formula((0, frozenset())) == Formula("T")
+
+
+def test_tricolor_graph_shards(debug=False):
+    for graph, satisfiable in TEST_GRAPHS:
+        formula = graph3coloring_to_formula(graph)
+        space = ModelSpace(sorted(formula.variables()))
+        if len(space) > 2**16:
+            continue
+        if debug:
+            print("Testing tricolor_graph over shards on graph", graph)
+        coloring = tricolor_graph(graph)
+        assert (coloring is not None) == satisfiable
+        colorings = [tricolor_graph(graph, space.shard(k, 5)) for k in range(5)]
+        found = [c for c in colorings if c is not None]
+        assert bool(found) == satisfiable
+        if satisfiable:
+            assert found[0] == coloring
+            for c in found:
+                assert is_valid_3coloring(graph, c)
+
+
+def test_tricolor_graph_cdcl(debug=False):
+    for graph, satisfiable in TEST_GRAPHS:
+        if debug:
+            print("Testing tricolor_graph with the solver on graph", graph)
+        coloring = tricolor_graph(graph, method="cdcl")
+        assert (coloring is not None) == satisfiable
+        if satisfiable:
+            assert is_valid_3coloring(graph, coloring)
+    n_vertices = 200
+    edges = frozenset((i, i % n_vertices + 1) for i in range(1, n_vertices + 1))
+    assert is_valid_3coloring(
+        (n_vertices, edges), tricolor_graph((n_vertices, edges), method="cdcl")
+    )
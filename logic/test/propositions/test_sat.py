@@ -0,0 +1,112 @@
+"""Tests for the propositions.sat module."""
+
+import random
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import (
+    evaluate,
+    is_contradiction,
+    is_satisfiable,
+    is_tautology,
+)
+from logic.propositions.sat import Solver, solve
+
+SAT_TESTS = [
+    "x12",
+    "T",
+    "F",
+    "~F",
+    "(p&~p)",
+    "(p|(q->~p))",
+    "((p&q)|(p&q))",
+    "~((~x17->p)&~~(~F|~q))",
+    "(((p+q)<->(q-&r))-|~(r->T))",
+    "((p+q)&((q+r)&(r+p)))",
+    "((p<->q)&((q<->r)&~(r<->p)))",
+    "(~(p-&q)&(p-|~r))",
+]
+
+
+def random_formula(rng: random.Random) -> Formula:
+    formulas = [Formula("x" + str(i)) for i in range(rng.randint(1, 6))]
+    formulas += [Formula("T"), Formula("F")]
+    for _ in range(rng.randint(0, 12)):
+        if rng.random() < 0.2:
+            formulas.append(Formula("~", rng.choice(formulas)))
+        else:
+            operator = rng.choice(("&", "|", "->", "+", "<->", "-&", "-|"))
+            first, second = rng.choice(formulas), rng.choice(formulas)
+            formulas.append(Formula(operator, first, second))
+    return formulas[-1]
+
+
+def test_solve(debug=False):
+    rng = random.Random(0)
+    formulas = [Formula.parse(infix) for infix in SAT_TESTS]
+    formulas += [random_formula(rng) for _ in range(500)]
+    for formula in formulas:
+        if debug:
+            print("Testing solve on", formula)
+        model = solve(formula)
+        assert (model is not None) == is_satisfiable(formula)
+        if model is not None:
+            assert set(model) == formula.variables()
+            assert evaluate(formula, model)
+        for check in (is_tautology, is_contradiction, is_satisfiable):
+            assert check(formula, method="cdcl") == check(formula)
+
+
+def test_solver(debug=False):
+    rng = random.Random(1)
+    for _ in range(200):
+        n_variables = rng.randint(1, 12)
+        clauses = [
+            [rng.choice((1, -1)) * rng.randint(1, n_variables) for _ in "abc"]
+            for _ in range(rng.randint(0, 6 * n_variables))
+        ]
+        if debug:
+            print("Testing the solver on", clauses)
+        satisfiable = any(
+            all(
+                any(
+                    (literal > 0) == (bits >> abs(literal) - 1 & 1 == 1)
+                    for literal in clause
+                )
+                for clause in clauses
+            )
+            for bits in range(1 << n_variables)
+        )
+        values = Solver(n_variables, clauses).solve()
+        assert (values is not None) == satisfiable
+        if values is not None:
+            assert len(values) == n_variables
+            for clause in clauses:
+                assert any(
+                    values[abs(literal) - 1] == (literal > 0)
+                    for literal in clause
+                )
+    assert Solver(1, [[]]).solve() is None
+    assert Solver(2, [[1], [-1, 2]]).solve() == [True, True]
+
+
+def test_pigeonhole(debug=False):
+    # Placing n + 1 pigeons into n holes takes many conflicts to refute.
+    n = 6
+    if debug:
+        print("Testing the solver on the pigeonhole principle for", n)
+
+    def variable(pigeon, hole):
+        return pigeon * n + hole + 1
+
+    clauses = [
+        [variable(pigeon, hole) for hole in range(n)] for pigeon in range(n + 1)
+    ]
+    for hole in range(n):
+        for first in range(n + 1):
+            for second in range(first + 1, n + 1):
+                clauses.append(
+                    [-variable(first, hole), -variable(second, hole)]
+                )
+    solver = Solver((n + 1) * n, clauses)
+    assert solver.solve() is None
+    assert solver.conflicts > 0
@@ -0,0 +1,256 @@
+"""Tests for the propositions.semantics module."""
+
+import pickle
+
+import pytest
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import (
+    BitModel,
+    ModelSpace,
+    COMPILED_ORDERS,
+    all_models,
+    compile_formula,
+    evaluate,
+    evaluate_inference,
+    gray_code_truth_values,
+    is_contradiction,
+    is_satisfiable,
+    is_tautology,
+    iter_models_matrix,
+    iter_truth_table,
+    truth_table,
+    truth_values,
+    truth_values_array,
+)
+from logic.propositions.proofs import InferenceRule
+
+
+def test_evaluate_deep(debug=False):
+    depth = 100000
+    if debug:
+        print("Testing evaluation of a formula nested", depth, "levels deep")
+    formula = Formula("p")
+    for _ in range(depth):
+        formula = Formula("+", Formula("~", formula), Formula("q"))
+    assert evaluate(formula, {"p": True, "q": False})
+    assert evaluate(formula, {"p": True, "q": True})
+    assert evaluate(Formula("~", formula), {"p": False, "q": False})
+
+
+def test_compile_formula(debug=False):
+    for infix in [
+        "T",
+        "~F",
+        "x12",
+        "(p|(q->~p))",
+        "((p&q)|(p&q))",
+        "~((~x17->p)&~~(~F|~q))",
+        "(((p+q)<->(q-&r))-|~(r->T))",
+    ]:
+        if debug:
+            print("Testing compile_formula on", infix)
+        formula = Formula.parse(infix)
+        variables = sorted(formula.variables()) + ["z"]
+        function = compile_formula(formula, variables)
+        assert compile_formula(formula, variables) is function
+        for index, model in enumerate(all_models(variables[::-1])):
+            value = evaluate(formula, model)
+            assert function([model[v] for v in variables]) is value
+            # Bit number i of the index is the value of variables[i], since
+            # all_models varies the last given variable name the fastest.
+            assert function(index) is value
+
+    if debug:
+        print("Testing the bound on the cache of compile_formula")
+    formula = Formula.parse("(p|q)")
+    orders = [["p", "q"] + ["z" + str(i)] for i in range(COMPILED_ORDERS + 1)]
+    functions = [compile_formula(formula, order) for order in orders]
+    assert compile_formula(formula, orders[-1]) is functions[-1]
+    assert compile_formula(formula, orders[0]) is not functions[0]
+
+
+def test_truth_table(debug=False):
+    for infix in [
+        "T",
+        "F",
+        "~x12",
+        "(p|(q->~p))",
+        "((p&q)|(p&q))",
+        "~((~x17->p)&~~(~F|~q))",
+        "(((p+q)<->(q-&r))-|~(r->T))",
+    ]:
+        if debug:
+            print("Testing truth tables of", infix)
+        formula = Formula.parse(infix)
+        variables = ["z"] + sorted(formula.variables())
+        values = list(truth_values(formula, all_models(variables)))
+        table = truth_table(formula, variables)
+        assert [table >> m & 1 == 1 for m in range(len(values))] == values
+        for chunk_variables in range(len(variables) + 2):
+            chunks = list(iter_truth_table(formula, variables, chunk_variables))
+            assert sum(width for width, _ in chunks) == len(values)
+            bits = "".join(
+                bin(table)[2:].zfill(width)[::-1] for width, table in chunks
+            )
+            assert [bit == "1" for bit in bits] == values
+
+
+def test_truth_table_many_variables(debug=False):
+    variables = ["x" + str(i) for i in range(20)]
+    if debug:
+        print("Testing truth tables over", len(variables), "variable names")
+    excluded_middle = Formula.combine(
+        "&", [Formula.parse("(" + v + "|~" + v + ")") for v in variables]
+    )
+    assert is_tautology(excluded_middle)
+    conjunction = Formula.combine("&", [Formula(v) for v in variables])
+    assert is_satisfiable(conjunction)
+    assert not is_tautology(conjunction)
+    contradiction = Formula("&", conjunction, Formula("~", conjunction))
+    assert is_contradiction(contradiction)
+    assert list(iter_truth_table(conjunction, variables, 16))[-1] == (
+        2**16,
+        2**65535,
+    )
+
+
+def test_truth_values_array(debug=False):
+    numpy = pytest.importorskip("numpy")
+    for infix in [
+        "T",
+        "F",
+        "~x12",
+        "(p|(q->~p))",
+        "((p&q)|(p&q))",
+        "~((~x17->p)&~~(~F|~q))",
+        "(((p+q)<->(q-&r))-|~(r->T))",
+    ]:
+        if debug:
+            print("Testing truth_values_array on", infix)
+        formula = Formula.parse(infix)
+        for extra in [[], ["z1", "z2", "z3", "z4"]]:
+            variables = sorted(formula.variables()) + extra
+            table = truth_table(formula, variables)
+            for block_variables in range(len(variables) + 1):
+                packed = truth_values_array(formula, variables, block_variables)
+                assert packed.dtype == numpy.uint8
+                assert int.from_bytes(packed.tobytes(), "little") == table
+
+
+def test_iter_models_matrix(debug=False):
+    numpy = pytest.importorskip("numpy")
+    for variables in [
+        [],
+        ["p"],
+        ["p", "q", "r"],
+        ["x" + str(i) for i in range(6)],
+    ]:
+        if debug:
+            print("Testing iter_models_matrix on", variables)
+        models = list(all_models(variables))
+        for block_variables in range(len(variables) + 1):
+            rows = numpy.concatenate(
+                [
+                    numpy.unpackbits(block, axis=1, bitorder="little")[
+                        :, : 2 ** min(max(block_variables, 3), len(variables))
+                    ]
+                    for block in iter_models_matrix(variables, block_variables)
+                ],
+                axis=1,
+            )
+            assert rows.shape == (len(variables), len(models))
+            assert rows.T.tolist() == [
+                [int(model[v]) for v in variables] for model in models
+            ]
+
+
+def test_gray_code_truth_values(debug=False):
+    for infix in [
+        "T",
+        "~x12",
+        "(p|(q->~p))",
+        "((p&q)|(p&q))",
+        "~((~x17->p)&~~(~F|~q))",
+        "(((p+q)<->(q-&r))-|~(r->T))",
+    ]:
+        if debug:
+            print("Testing gray_code_truth_values on", infix)
+        formula = Formula.parse(infix)
+        variables = sorted(formula.variables()) + ["z"]
+        table = truth_table(formula, variables)
+        pairs = list(gray_code_truth_values(formula, variables))
+        assert sorted(index for index, _ in pairs) == list(
+            range(2 ** len(variables))
+        )
+        for (index, _), (next_index, _) in zip(pairs, pairs[1:]):
+            assert bin(index ^ next_index).count("1") == 1
+        for index, value in pairs:
+            assert value == (table >> index & 1 == 1)
+
+
+def test_bit_model(debug=False):
+    if debug:
+        print("Testing BitModel over ('p', 'q7', 'r')")
+    model = BitModel(("p", "q7", "r"), 0b101)
+    assert model == {"p": True, "q7": False, "r": True}
+    assert model == BitModel(["r", "p", "q7"], 0b110)
+    assert model != BitModel(("p", "q7", "r"), 0b100)
+    assert model != {"p": True, "q7": False}
+    assert list(model) == ["p", "q7", "r"] and len(model) == 3
+    assert "q7" in model and "q" not in model
+    assert str(model) == "{'p': True, 'q7': False, 'r': True}"
+    assert pickle.loads(pickle.dumps(model)) == model
+    models = list(all_models(["p", "q7", "r"]))
+    assert all(type(m) is BitModel for m in models)
+    assert [m.bits for m in models] == list(range(8))
+    for infix in ["~(p&q7)", "((p->q7)+r)", "(T|~r)"]:
+        formula = Formula.parse(infix)
+        if debug:
+            print("Testing evaluation of", formula, "in bit models")
+        for m in models:
+            assert evaluate(formula, m) == evaluate(formula, dict(m))
+    rule = InferenceRule([Formula.parse("(p|q7)"), Formula("r")], Formula("p"))
+    for m in models:
+        assert evaluate_inference(rule, m) == evaluate_inference(rule, dict(m))
+
+
+def test_model_space(debug=False):
+    variables = ["p", "q7", "r", "s"]
+    space = ModelSpace(variables)
+    if debug:
+        print("Testing", space)
+    models = list(all_models(variables))
+    assert len(space) == len(models) and list(space) == models
+    assert [space.model_at(i) for i in range(len(space))] == models
+    assert space == ModelSpace(tuple(variables), 0, 16)
+    assert pickle.loads(pickle.dumps(space)) == space
+    part = space.slice(3, 11)
+    assert len(part) == 8 and list(part) == models[3:11]
+    assert part.model_at(2) == models[5]
+    assert list(part.slice(1, 4)) == models[4:7]
+    for of_n in range(1, 20):
+        shards = [space.shard(k, of_n) for k in range(of_n)]
+        assert [m for shard in shards for m in shard] == models
+        assert max(map(len, shards)) - min(map(len, shards)) <= 1
+    formula = Formula.parse("((p->q7)|(r&~s))")
+    values = list(truth_values(formula, models))
+    for start, stop in [(0, 16), (3, 11), (5, 5), (0, 1), (15, 16), (7, 9)]:
+        for chunk_variables in range(4):
+            chunks = list(
+                iter_truth_table(
+                    formula, variables, chunk_variables, start, stop
+                )
+            )
+            assert sum(width for width, _ in chunks) == stop - start
+            bits = "".join(
+                bin(table)[2:].zfill(width)[::-1] for width, table in chunks
+            )
+            assert [bit == "1" for bit in bits] == values[start:stop]
+        shard = ModelSpace(variables, start, stop)
+        assert is_tautology(formula, shard) == all(values[start:stop])
+        assert is_satisfiable(formula, shard) == any(values[start:stop])
+        assert is_contradiction(formula, shard) == (not any(values[start:stop]))
+    assert not is_tautology(formula)
+    assert all(is_tautology(formula, space.shard(k, 4)) for k in (0, 1, 3))
+    assert not is_tautology(formula, space.shard(2, 4))
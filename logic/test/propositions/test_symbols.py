@@ -0,0 +1,56 @@
+"""Tests for the propositions.symbols module."""
+
+from logic.propositions.syntax import Formula
+from logic.propositions.semantics import evaluate
+from logic.propositions.symbols import OPERATORS, VARIABLE, SymbolTable
+
+SYMBOLS_TESTS = [
+    "x12",
+    "T",
+    "~F",
+    "(p|(q->~p))",
+    "((p&q)|(p&q))",
+    "~((~x17->p)&~~(~F|~q))",
+    "(((p+q)<->(q-&r))-|~(r->T))",
+]
+
+
+def test_opcode(debug=False):
+    for infix in SYMBOLS_TESTS:
+        if debug:
+            print("Testing opcodes of", infix)
+        for node in Formula.parse(infix).postorder():
+            if node.opcode == VARIABLE:
+                assert node.first is None and node.root not in OPERATORS
+            else:
+                assert OPERATORS[node.opcode] == node.root
+
+
+def test_evaluate(debug=False):
+    for infix in SYMBOLS_TESTS:
+        if debug:
+            print("Testing evaluation over encoded models of", infix)
+        formula = Formula.parse(infix)
+        table = SymbolTable(sorted(formula.variables()))
+        models = [
+            {
+                name: bits >> index & 1 == 1
+                for index, name in enumerate(table.names)
+            }
+            for bits in range(2 ** len(table))
+        ]
+        values = list(table.truth_values(formula, range(len(models))))
+        assert values == [evaluate(formula, model) for model in models]
+        for bits, value in enumerate(values):
+            assert table.evaluate(formula, bits) == value
+
+
+def test_many_variables(debug=False):
+    names = ["x" + str(i) for i in range(1000)]
+    if debug:
+        print("Testing a symbol table of", len(names), "variable names")
+    table = SymbolTable(names)
+    formula = Formula.combine("&", [Formula(name) for name in names])
+    assert len(table) == len(names)
+    assert table.evaluate(formula, 2 ** len(names) - 1)
+    assert not table.evaluate(formula, 2 ** len(names) - 2)
@@ -0,0 +1,233 @@
+"""Tests for the propositions.syntax module."""
+
+import copy
+import pickle
+import threading
+
+import pytest
+
+from logic.propositions.syntax import Formula, ParseError, tokenize
+
+
+def test_hash_consing(debug=False):
+    for infix in ["x", "T", "~x12", "(p|(q->~p))", "~((~x17->p)&~~(~F|~q))"]:
+        if debug:
+            print("Testing hash-consing of", infix)
+        f = Formula.parse(infix)
+        assert Formula.parse(infix) is f
+        assert Formula(f.root, f.first, f.second) is f
+        assert hash(Formula.parse(infix)) == hash(f)
+        assert copy.deepcopy(f) is f
+        assert pickle.loads(pickle.dumps(f)) is f
+    f = Formula.parse("((p&q)|(p&q))")
+    assert f.first is f.second
+    assert f != Formula.parse("((p&q)|(q&p))")
+    assert len({f, Formula.parse("((p&q)|(p&q))")}) == 1
+
+
+def test_hash_consing_threads(debug=False):
+    if debug:
+        print("Testing hash-consing of formulas built by several threads")
+    n_threads = 8
+    barrier = threading.Barrier(n_threads)
+    results = [[] for _ in range(n_threads)]
+
+    def build(formulas):
+        barrier.wait()
+        for i in range(2000):
+            formulas.append(
+                Formula("&", Formula("z" + str(i)), Formula("~", Formula("y")))
+            )
+
+    threads = [
+        threading.Thread(target=build, args=(formulas,)) for formulas in results
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for formulas in results[1:]:
+        assert all(a is b for a, b in zip(formulas, results[0]))
+
+
+def test_tokenize(debug=False):
+    for s, tokens in [
+        ("", []),
+        ("x12", ["x12"]),
+        ("(x12->~T)", ["(", "x12", "->", "~", "T", ")"]),
+        (
+            "((p<->q)-&(r-|s))",
+            "( ( p <-> q ) -& ( r -| s ) )".split(),
+        ),
+        ("(a+ x)", ["(", "a", "+", " ", "x", ")"]),
+    ]:
+        if debug:
+            print("Testing tokenizing", s)
+        tt, offsets = tokenize(s)
+        assert tt == tokens
+        assert len(offsets) == len(tokens) + 1
+        assert all(s[o:].startswith(t) for t, o in zip(tt, offsets))
+        assert offsets[-1] == len(s)
+
+
+def test_parse_deep(debug=False):
+    depth = 100000
+    if debug:
+        print("Testing parsing formulas nested", depth, "levels deep")
+    f = Formula.parse("~" * depth + "p")
+    for _ in range(depth):
+        assert f.root == "~"
+        f = f.first
+    assert f == Formula("p")
+    f = Formula.parse(
+        "(" * depth
+        + "x0"
+        + "".join("&x" + str(i) + ")" for i in range(1, depth + 1))
+    )
+    for i in reversed(range(1, depth + 1)):
+        assert f.root == "&" and f.second.root == "x" + str(i)
+        f = f.first
+    assert f.root == "x0"
+    f = Formula.parse_polish("|" * depth + "p" * (depth + 1))
+    for _ in range(depth):
+        assert f.root == "|" and f.second == Formula("p")
+        f = f.first
+
+
+parsing_tests = [
+    ("", None, ""),
+    ("x", "x", ""),
+    ("T", "T", ""),
+    ("a", None, ""),
+    (")", None, ""),
+    ("x&", "x", "&"),
+    ("p3&y", "p3", "&y"),
+    ("F)", "F", ")"),
+    ("~x", "~x", ""),
+    ("x2", "x2", ""),
+    ("x|y", "x", "|y"),
+    ("(p|x13)", "(p|x13)", ""),
+    ("((p|x13))", None, ""),
+    ("x13->x14", "x13", "->x14"),
+    ("(x13->x14)", "(x13->x14)", ""),
+    ("(x&y", None, ""),
+    ("(T)", None, ""),
+    ("(x&&y)", None, ""),
+    ("-|x", None, ""),
+    ("-->", None, ""),
+    ("(q~p)", None, ""),
+    ("(~F)", None, ""),
+    ("(r&(y|(z->w)))", "(r&(y|(z->w)))", ""),
+    ("~~~x~~", "~~~x", "~~"),
+    ("(((~T->s45)&s45)|~y)", "(((~T->s45)&s45)|~y)", ""),
+    ("((p->q)->(~q->~p))->T", "((p->q)->(~q->~p))", "->T"),
+    ("((p->q)->(~q->~p)->T)", None, ""),
+    ("(x|y|z)", None, ""),
+    ("~((~x17->p)&~~(~F|~q))", "~((~x17->p)&~~(~F|~q))", ""),
+]
+
+
+def test_try_parse(debug=False):
+    for s, f, r in parsing_tests:
+        if debug:
+            print("Testing try_parse on", s)
+        result = Formula.try_parse(s)
+        if f is not None and r == "":
+            assert type(result) is Formula
+            assert str(result) == f
+        else:
+            assert type(result) is ParseError
+            assert 0 <= result.offset <= len(s)
+    for s, offset in [
+        ("", 0),
+        ("(p|~q))", 6),
+        ("(x&&y)", 3),
+        ("(p|q", 4),
+        ("((p->q)->(~q->~p)->T)", 17),
+        ("(a|b)", 1),
+    ]:
+        if debug:
+            print("Testing error offset of try_parse on", s)
+        assert Formula.try_parse(s).offset == offset
+
+
+def test_immutable(debug=False):
+    f = Formula.parse("(p|~q)")
+    if debug:
+        print("Testing immutability of", f)
+    assert not hasattr(f, "__dict__")
+    for statement in ["f.root = 'x'", "f.first = None", "del f.second"]:
+        with pytest.raises(Exception, match="of immutable class 'Formula'"):
+            exec(statement)
+    assert str(f) == "(p|~q)"
+
+
+def test_memoized_sets(debug=False):
+    for infix in ["x", "T", "~x12", "(p|(q->~p))", "~((~x17->p)&~~(~F|~q))"]:
+        f = Formula.parse(infix)
+        if debug:
+            print("Testing the memoized variables and operators of", f)
+        assert type(f.variables()) is frozenset
+        assert f.variables() is f.variables()
+        assert type(f.operators()) is frozenset
+        assert f.operators() is f.operators()
+
+
+def test_deep_operations(debug=False):
+    depth = 100000
+    if debug:
+        print("Testing operations on formulas nested", depth, "levels deep")
+    f = Formula("x0")
+    for i in range(1, depth):
+        f = Formula("->", f, Formula("~", Formula("x" + str(i % 10))))
+    infix = str(f)
+    assert infix.startswith("(" * (depth - 1) + "x0->~x1)->~x2)")
+    assert Formula.parse(infix) is f
+    assert f.polish().startswith("->" * (depth - 1) + "x0~x1~x2")
+    assert Formula.parse_polish(f.polish()) is f
+    assert f.variables() == {"x" + str(i) for i in range(10)}
+    assert f.operators() == {"->", "~"}
+    g = f.substitute_variables({"x0": Formula.parse("(p&q)")})
+    assert str(g).startswith("(" * (depth - 1) + "(p&q)->~x1)")
+    g = f.substitute_operators({"->": Formula.parse("(~p|q)")})
+    assert str(g).startswith("(~" * (depth - 1) + "x0|~x1)|~x2)")
+    assert len(f.postorder()) == depth + 19
+
+
+def test_substitute_variables_sharing(debug=False):
+    if debug:
+        print("Testing that substituting variables preserves sharing")
+    f = Formula.parse("((p&(q|r))->(~s|(q|r)))")
+    assert f.substitute_variables({}) is f
+    g = f.substitute_variables({"p": Formula.parse("~x"), "t": Formula("y")})
+    assert str(g) == "((~x&(q|r))->(~s|(q|r)))"
+    assert g.first.second is f.first.second
+    assert g.second is f.second
+    assert f.substitute_variables({"t": Formula("y")}) is f
+
+
+def test_substitute_operators_sharing(debug=False):
+    if debug:
+        print("Testing that substituting operators preserves sharing")
+    f = Formula.parse("((p&(q|r))->~(q|r))")
+    assert f.substitute_operators({}) is f
+    assert f.substitute_operators({"+": Formula.parse("(p&q)")}) is f
+    g = f.substitute_operators({"->": Formula.parse("(~p|q)")})
+    assert str(g) == "(~(p&(q|r))|~(q|r))"
+    assert g.first.first is f.first
+    assert g.second is f.second
+    g = f.substitute_operators({"~": Formula.parse("p"), "|": Formula("T")})
+    assert str(g) == "((p&T)->T)"
+
+
+def test_combine(debug=False):
+    if debug:
+        print("Testing Formula.combine")
+    variables = [Formula("x" + str(i)) for i in range(1000)]
+    assert Formula.combine("|", variables[:1]) is variables[0]
+    assert str(Formula.combine("&", variables[:3])) == "((x0&x1)&x2)"
+    assert str(Formula.combine("->", variables[:4])) == "((x0->x1)->(x2->x3))"
+    f = Formula.combine("&", variables)
+    assert Formula.parse(str(f)) is f
+    assert f.fold(lambda _, a, b: 1 + max(a or 0, b or 0)) == 11
+    assert [g for g in f.postorder() if g.first is None] == variables